@@ -0,0 +1,199 @@
+"""
+Microbenchmarks for LMBench's own hot paths.
+
+Run from the repository root:
+
+    python benchmarks/bench_hotpaths.py            # compare against baselines.json
+    python benchmarks/bench_hotpaths.py --save     # record new baselines
+
+Timings are normalised against a fixed pure-Python calibration loop so that
+baselines recorded on one machine remain meaningful on another.
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import rich
+from rich.console import Console
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines.json"
+
+def _best_of(fn, repeat: int = 5, number: int = 1) -> float:
+    """Best wall time per call of fn over `repeat` batches of `number` calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number): fn()
+        best = min(best, (time.perf_counter() - t0) / number)
+    return best
+
+def calibrate() -> float:
+    def work():
+        d = {}
+        for i in range(200000): d[i % 97] = d.get(i % 97, 0) + i
+        return sorted(d.values())
+    return _best_of(work, repeat=15)
+
+def _ollama_lines(n: int) -> bytes:
+    return b"".join(json.dumps({"model": "bench", "created_at": "2024-01-01T00:00:00Z", "response": f"tok{i} ", "done": False}).encode() + b"\n" for i in range(n))
+
+def _sse_lines(n: int) -> bytes:
+    chunk = lambda i: {"id": "chatcmpl-1", "object": "chat.completion.chunk", "choices": [{"index": 0, "delta": {"content": f"tok{i} "}}]}
+    return b"".join(b"data: " + json.dumps(chunk(i)).encode() + b"\n\n" for i in range(n)) + b"data: [DONE]\n\n"
+
+def _chunked(raw: bytes, size: int = 4096):
+    return [raw[i:i + size] for i in range(0, len(raw), size)]
+
+def bench_ndjson_parse(n: int = 5000) -> float:
+    """Seconds per NDJSON line through the decoder used by OllamaBackend.stream_generate."""
+    from lmbench.backends.decoding import NDJSONDecoder, ollama_event
+    chunks = _chunked(_ollama_lines(n))
+    def parse():
+        decoder = NDJSONDecoder()
+        for data in chunks:
+            for payload in decoder.feed(data): ollama_event(payload)
+    return _best_of(parse) / n
+
+def bench_sse_parse(n: int = 5000) -> float:
+    """Seconds per SSE event through the decoder used by LMStudioBackend.stream_generate."""
+    from lmbench.backends.decoding import SSEDecoder, openai_event
+    chunks = _chunked(_sse_lines(n))
+    def parse():
+        decoder = SSEDecoder()
+        for data in chunks:
+            for payload in decoder.feed(data): openai_event(payload)
+    return _best_of(parse) / n
+
+def bench_dashboard_render() -> float:
+    from lmbench.core.engine import LiveDashboard
+    dash = LiveDashboard("bench", "Burst Generation", "Benchmark.")
+    dash.text_buffer = "lorem ipsum " * 200; dash.tps_history = [float(i % 40) for i in range(500)]
+    dash.raw_events = [f"T{i}: event..." for i in range(50)]; dash.history = [42.0, 51.3, 60.1]
+    return _best_of(dash.generate_renderable, number=200)
+
+def bench_telemetry_poll() -> float:
+    from lmbench.system.probe import Telemetry
+    telemetry = Telemetry(); telemetry.poll()
+    return _best_of(telemetry.poll, number=50)
+
+def bench_engine_per_chunk(short: int = 200, long: int = 1200) -> float:
+    """Marginal engine cost per streamed chunk, from the difference of two stream lengths."""
+    from lmbench.backends.base import BaseBackend
+    from lmbench.core.engine import BenchmarkEngine
+
+    class SyntheticBackend(BaseBackend):
+        def __init__(self, n: int):
+            super().__init__("Synthetic", "memory://"); self.n = n
+        async def get_models(self): return ["bench"]
+        async def get_loaded_models(self): return []
+        async def unload_all(self): return True
+        async def stream_generate(self, model, prompt, options=None):
+            for i in range(self.n): yield {"model": model, "response": f"tok{i} ", "done": False}
+            yield {"model": model, "response": "", "done": True}
+        def is_compatible(self, chunk): return chunk.get("done", False)
+
+    test = {"name": "Bench", "type": "performance", "prompt": "bench"}
+    def timed(n: int) -> float:
+        engine = BenchmarkEngine(SyntheticBackend(n))
+        t0 = time.perf_counter(); asyncio.run(engine.run_benchmark("bench", test)); return time.perf_counter() - t0
+    best_short = min(timed(short) for _ in range(2)); best_long = min(timed(long) for _ in range(2))
+    return max(0.0, best_long - best_short) / (long - short)
+
+def bench_event_per_token(n: int = 20000) -> float:
+    """Seconds to build and emit one Token event through an NDJSON sink (to a null stream) plus the metrics exporter."""
+    from lmbench.core.events import EventBus, NDJSONSink, RoundStart, Token
+    from lmbench.core.metrics import MetricsExporter
+    class NullStream:
+        def write(self, data): pass
+        def flush(self): pass
+    bus = EventBus([NDJSONSink(stream=NullStream()), MetricsExporter()])
+    round_id = bus.new_round_id(); bus.emit(RoundStart(time.perf_counter(), round_id, "bench", "Synthetic", "Bench", None, 1, 1))
+    def emit():
+        for i in range(n):
+            if bus.active: bus.emit(Token(time.perf_counter(), round_id, i, "tok ", 0.01, 50.0))
+    return _best_of(emit) / n
+
+def bench_reporter(n: int = 5000) -> float:
+    from lmbench.core.reporter import Reporter
+    system_info = {"os": "Bench", "arch": "x86_64", "cpu": "Bench CPU", "ram_total_gb": 64, "ram_available_gb": 32, "gpus": []}
+    results = [{"model": f"model-{i % 50}", "test_name": f"Test {i % 4}", "test_type": "performance", "options": {}, "ttft_ms": 100.0 + i % 300,
+                "tps": 10.0 + i % 90, "tps_std": 0.5, "peak_power_w": 0.0, "total_tokens": 512, "quality_pass": True, "status": "Success"} for i in range(n)]
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            def report():
+                reporter = Reporter(system_info); reporter.console = Console(file=io.StringIO())
+                reporter.display_results([dict(r) for r in results]); reporter.save_reports(results, "Bench")
+            return _best_of(report, repeat=3)
+        finally:
+            os.chdir(cwd)
+
+BENCHMARKS = {
+    "engine_per_chunk": bench_engine_per_chunk,
+    "ndjson_parse_per_line": bench_ndjson_parse,
+    "sse_parse_per_event": bench_sse_parse,
+    "dashboard_render": bench_dashboard_render,
+    "telemetry_poll": bench_telemetry_poll,
+    "event_per_token": bench_event_per_token,
+    "reporter_5k_results": bench_reporter,
+}
+
+def _fmt(seconds: float) -> str:
+    if seconds < 1e-3: return f"{seconds * 1e6:.2f} µs"
+    if seconds < 1: return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds:.2f} s"
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="LMBench hot-path microbenchmarks")
+    parser.add_argument("--save", action="store_true", help="Store the results as the new baselines")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--only", nargs="*", help="Run only the named benchmarks")
+    args = parser.parse_args(argv)
+
+    # Keep the engine's live dashboard off the terminal while measuring
+    rich.reconfigure(file=io.StringIO(), force_terminal=True, width=120)
+    console = Console(file=sys.__stdout__)
+
+    calibration = calibrate()
+    timings = {name: fn() for name, fn in BENCHMARKS.items() if not args.only or name in args.only}
+    # Re-check the reference loop in case clocks ramped up while benchmarking
+    calibration = min(calibration, calibrate())
+
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {"results": {}}
+    results, regressions = {}, []
+    for name, seconds in timings.items():
+        normalized = seconds / calibration
+        results[name] = {"seconds": seconds, "normalized": normalized}
+        base = baseline["results"].get(name)
+        status = "[dim]new[/dim]"
+        if base:
+            ratio = normalized / base["normalized"] if base["normalized"] else 1.0
+            status = f"{ratio:.2f}x"
+            if ratio > 1 + args.tolerance:
+                status = f"[bold red]{ratio:.2f}x REGRESSION[/bold red]"; regressions.append(name)
+            elif ratio < 1 - args.tolerance:
+                status = f"[bold green]{ratio:.2f}x[/bold green]"
+        console.print(f"{name:<24} {_fmt(seconds):>12}  {status}")
+
+    if args.save:
+        baseline["calibration_seconds"] = calibration
+        baseline["results"].update(results)
+        BASELINE_PATH.write_text(json.dumps(baseline, indent=2) + "\n")
+        console.print(f"[green]Baselines saved to {BASELINE_PATH}[/green]")
+        return 0
+    if regressions:
+        console.print(f"[bold red]Slower than baseline: {', '.join(regressions)}[/bold red]")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
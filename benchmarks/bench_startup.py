@@ -0,0 +1,45 @@
+"""
+CLI startup-time budget, measured with `python -X importtime`.
+
+    python benchmarks/bench_startup.py
+
+Fails when importing `lmbench.cli` exceeds the budget in baselines.json, or when
+`lmbench version` pulls in any of the heavy subsystems that commands import lazily.
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines.json"
+DEFAULT_BUDGET = {"budget_ms": 150, "forbidden": ["httpx", "pydantic", "cpuinfo", "psutil", "rich.progress", "rich.live", "lmbench.core.engine"]}
+
+def importtime(args):
+    """Run python -X importtime with args; return {module: cumulative_us}."""
+    env = dict(os.environ, PYTHONPATH=str(ROOT / "src") + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    proc = subprocess.run([sys.executable, "-X", "importtime", *args], capture_output=True, text=True, env=env)
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line: continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+def main() -> int:
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    budget = {**DEFAULT_BUDGET, **baseline.get("startup", {})}
+
+    best_ms = min(importtime(["-c", "import lmbench.cli"]).get("lmbench.cli", 0) for _ in range(5)) / 1000
+    loaded = importtime(["-m", "lmbench", "version"])
+    heavy = [m for m in budget["forbidden"] if m in loaded]
+
+    print(f"import lmbench.cli     {best_ms:8.1f} ms  (budget {budget['budget_ms']} ms)")
+    print(f"lmbench version loads  {len(loaded):5d} modules" + (f", including {', '.join(heavy)}" if heavy else ""))
+    failed = best_ms > budget["budget_ms"] or bool(heavy)
+    if failed: print("Startup budget exceeded.")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
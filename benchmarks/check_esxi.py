@@ -0,0 +1,122 @@
+"""
+ESXi SSH layer check against a stand-in host (no paramiko or ESXi needed).
+
+    python benchmarks/check_esxi.py
+
+Injects a fake SSH client through `client_factory` and fails unless `getallvms` output is parsed, several
+reverts run in parallel, a non-zero exit status counts as a failure, a dead pooled transport is reconnected,
+and the clean-state hook skips the model (returns False) instead of raising.
+"""
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from lmbench.core.esxi import CleanStateReverter, ESXiManager, SSHSession
+
+REVERT_S = 0.3
+
+GETALLVMS = """Vmid   Name          File                                    Guest OS        Version   Annotation
+1      bench-vm-1    [datastore1] bench-vm-1/bench-vm-1.vmx    ubuntu64Guest   vmx-19
+2      bench-vm-2    [datastore1] bench-vm-2/bench-vm-2.vmx    ubuntu64Guest   vmx-19
+3      bench vm 3    [datastore1] bench vm 3/bench vm 3.vmx    ubuntu64Guest   vmx-19
+14     bad-vm        [datastore2] bad-vm/bad-vm.vmx            ubuntu64Guest   vmx-19
+"""
+
+SNAPSHOTS = """Get Snapshot:
+|-ROOT
+--Snapshot Name        : base
+--Snapshot Id        : 1
+--|-CHILD
+----Snapshot Name        : clean
+----Snapshot Id        : 7
+"""
+
+class FakeHost:
+    """Answers vim-cmd like an ESXi shell; reverts take REVERT_S and fail for bad-vm."""
+    def __init__(self):
+        self.connects = 0
+        self.reverts = []
+        self.lock = threading.Lock()
+
+    def run(self, command: str):
+        if command == "vim-cmd vmsvc/getallvms": return 0, GETALLVMS
+        if command.startswith("vim-cmd vmsvc/snapshot.get"): return 0, SNAPSHOTS
+        if command.startswith("vim-cmd vmsvc/snapshot.revert"):
+            time.sleep(REVERT_S)
+            with self.lock: self.reverts.append(command)
+            return (1, "") if command.split()[2] == "14" else (0, "")
+        return 127, ""
+
+class _Stdout:
+    def __init__(self, status: int, output: str):
+        self.channel = type("Channel", (), {"recv_exit_status": lambda _: status})()
+        self._output = output
+
+    def read(self) -> bytes:
+        return self._output.encode()
+
+class _Transport:
+    def __init__(self): self.active = True
+    def is_active(self) -> bool: return self.active
+
+class FakeClient:
+    def __init__(self, host: FakeHost):
+        self.host, self.transport = host, None
+
+    def connect(self, hostname, port=22, username=None, password=None):
+        self.host.connects += 1; self.transport = _Transport()
+
+    def get_transport(self):
+        return self.transport
+
+    def exec_command(self, command: str, timeout=None):
+        status, output = self.host.run(command)
+        return None, _Stdout(status, output), None
+
+    def close(self):
+        if self.transport: self.transport.active = False
+
+def check() -> list:
+    failures = []
+    host = FakeHost()
+    manager = ESXiManager("esxi-check-1", "root", "pw", client_factory=lambda: FakeClient(host))
+
+    vms = manager.list_vms(refresh=True)
+    if vms != {"bench-vm-1": "1", "bench-vm-2": "2", "bench vm 3": "3", "bad-vm": "14"}: failures.append(f"getallvms parsed as {vms}")
+    if manager.latest_snapshot("1") != "7": failures.append("latest snapshot is not the last one listed")
+
+    start = time.perf_counter()
+    results = manager.revert_vms(["bench-vm-1", "bench-vm-2", "bench vm 3"])
+    elapsed = time.perf_counter() - start
+    if results != {"bench-vm-1": True, "bench-vm-2": True, "bench vm 3": True}: failures.append(f"parallel reverts returned {results}")
+    if elapsed > 2 * REVERT_S: failures.append(f"3 reverts took {elapsed:.2f}s; they did not run in parallel")
+    if host.connects != 1: failures.append(f"expected one pooled connection, saw {host.connects}")
+
+    if manager.revert_vm("bad-vm") is not False: failures.append("non-zero exit status was not reported as a failure")
+
+    manager.session._client.transport.active = False  # the pooled connection dies
+    if manager.list_vms(refresh=True).get("bench-vm-1") != "1" or host.connects != 2:
+        failures.append(f"dead transport was not reconnected (connects={host.connects})")
+
+    reverter = CleanStateReverter(["esxi-check-2/bench-vm-1", "esxi-check-2/bad-vm"], "root", "pw", client_factory=lambda: FakeClient(FakeHost()))
+    try:
+        if asyncio.run(reverter("mock:latest")) is not False: failures.append("clean-state hook did not skip the model after a failed revert")
+    except Exception as e:
+        failures.append(f"clean-state hook raised {type(e).__name__}: {e}")
+    ok = CleanStateReverter(["esxi-check-3/bench-vm-1"], "root", "pw", client_factory=lambda: FakeClient(FakeHost()))
+    if asyncio.run(ok("mock:latest")) is not True: failures.append("clean-state hook did not succeed for a good VM")
+    SSHSession.close_all()
+    return failures
+
+def main() -> int:
+    failures = check()
+    for f in failures: print(f"FAIL {f}")
+    print("ESXi check " + ("failed." if failures else "passed."))
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+"""
+Fleet end-to-end check: two agents on localhost, each serving the mock backend, driven by one coordinator.
+
+    python benchmarks/check_fleet.py
+
+Fails unless both agents answer, every result comes back tagged with a host fingerprint, a wrong token
+is rejected, and an agent refuses a non-loopback address without a token.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from lmbench.backends.mock import MockBackend
+from lmbench.core.engine import BenchmarkSuite
+from lmbench.core.fleet import AgentServer, Coordinator
+
+TOKEN = "check-fleet"
+
+async def check() -> list:
+    failures = []
+    agents = [AgentServer(MockBackend(models=[f"mock-{i}:latest"], tokens=8, tps=400), port=0, token=TOKEN) for i in range(2)]
+    servers = [await a.start() for a in agents]
+    try:
+        addresses = [f"127.0.0.1:{a.port}" for a in agents]
+        tests = [BenchmarkSuite.get_burst_test()]
+        hosts = await Coordinator(addresses, TOKEN).run(tests, rounds=1)
+        if len(hosts) != 2: failures.append(f"expected 2 hosts, got {len(hosts)}")
+        for i, h in enumerate(hosts):
+            if "error" in h: failures.append(f"{h['agent']}: {h['error']}"); continue
+            models = {r["model"] for r in h["results"]}
+            if models != {f"mock-{i}:latest"}: failures.append(f"{h['agent']} ran {models}")
+            if len(h["results"]) != len(tests): failures.append(f"{h['agent']} returned {len(h['results'])} results")
+            if any(r.get("host_fingerprint") != h["fingerprint"] or r["status"] != "Success" for r in h["results"]):
+                failures.append(f"{h['agent']} returned untagged or failed results")
+        denied = await Coordinator(addresses[:1], "wrong").info()
+        if denied[0].get("error") != "unauthorized": failures.append(f"wrong token was not rejected: {denied[0]}")
+    finally:
+        for s in servers: s.close(); await s.wait_closed()
+    try:
+        AgentServer(MockBackend(), host="0.0.0.0")
+        failures.append("agent accepted 0.0.0.0 without a token")
+    except ValueError:
+        pass
+    return failures
+
+def main() -> int:
+    failures = asyncio.run(check())
+    for f in failures: print(f"FAIL {f}")
+    print("Fleet check " + ("failed." if failures else "passed."))
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,19 @@
+import json
 from abc import ABC, abstractmethod
 from typing import AsyncGenerator, Dict, List, Optional
+from urllib.parse import urlparse
+from .decoding import TokenEvent, sniff_event
 
 class BaseBackend(ABC):
     def __init__(self, name: str, url: str):
         self.name = name
         self.url = url
+        self.discovered_models: List[str] = []
+
+    @property
+    def is_local(self) -> bool:
+        """True when the backend runs on this machine (so its CLI tools are usable)."""
+        return urlparse(self.url).hostname in ("localhost", "127.0.0.1", "::1", None)
 
     @abstractmethod
     async def get_models(self) -> List[str]:
@@ -21,11 +30,57 @@ class BaseBackend(ABC):
         """Eject all loaded models to free up resources."""
         pass
 
+    async def list_model_files(self) -> List[Dict]:
+        """Installed models as {"name", "digest", "size"}: the digest identifies the exact weights (None if unknown), size is in bytes."""
+        return [{"name": m, "digest": None, "size": None} for m in await self.get_models()]
+
+    async def show_model(self, model: str) -> Optional[Dict]:
+        """The model's own metadata, normalized (architecture, parameters, quantization, layers, context_length, ...), or None."""
+        return None
+
+    async def load_model(self, model: str, options: Optional[Dict] = None) -> float:
+        """Make sure a model is resident. Return seconds spent loading (0.0 if already loaded or loaded on demand)."""
+        return 0.0
+
     @abstractmethod
-    async def stream_generate(self, model: str, prompt: str) -> AsyncGenerator[Dict, None]:
+    async def stream_generate(self, model: str, prompt: str, options: Optional[Dict] = None) -> AsyncGenerator[Dict, None]:
         """Stream responses from the backend."""
         pass
 
+    async def embed(self, model: str, inputs: List[str], options: Optional[Dict] = None) -> Dict:
+        """Embed a batch. Returns {"embeddings": count, "dims": vector size, "prompt_tokens": int or None}."""
+        raise NotImplementedError(f"{self.name} does not support embeddings")
+
+    async def stream_chat(self, model: str, messages: List[Dict], options: Optional[Dict] = None) -> AsyncGenerator[Dict, None]:
+        """Stream a reply to a chat history ([{"role", "content"}, ...]) from the backend's chat endpoint."""
+        raise NotImplementedError(f"{self.name} does not support chat")
+        yield
+
+    def to_event(self, chunk: Dict) -> TokenEvent:
+        """Normalize a raw chunk into a TokenEvent."""
+        return sniff_event(chunk)
+
+    async def stream_events(self, model: str, prompt: str, options: Optional[Dict] = None) -> AsyncGenerator[TokenEvent, None]:
+        """Stream normalized token events."""
+        to_event = self.to_event
+        async for chunk in self.stream_generate(model, prompt, options):
+            yield to_event(chunk)
+
+    def tool_messages(self, calls: List[Dict], results: List[str]) -> List[Dict]:
+        """History entries for an assistant tool-call turn and the tools' results (OpenAI format; unparseable arguments become {})."""
+        assistant = {"role": "assistant", "content": None, "tool_calls": [
+            {"id": c["id"] or f"call_{i}", "type": "function",
+             "function": {"name": c["name"], "arguments": json.dumps(c["arguments"] if isinstance(c["arguments"], dict) else {})}}
+            for i, c in enumerate(calls)]}
+        return [assistant] + [{"role": "tool", "tool_call_id": call["id"], "content": r}
+                              for call, r in zip(assistant["tool_calls"], results)]
+
+    async def chat_events(self, model: str, messages: List[Dict], options: Optional[Dict] = None) -> AsyncGenerator[TokenEvent, None]:
+        """Stream normalized token events for a chat turn."""
+        to_event = self.to_event
+        async for chunk in self.stream_chat(model, messages, options):
+            yield to_event(chunk)
+
     @abstractmethod
     def is_compatible(self, chunk: Dict) -> bool:
         """Check if a chunk indicates the end of a stream."""
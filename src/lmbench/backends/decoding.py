@@ -0,0 +1,106 @@
+import json
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+try:
+    import orjson
+    HAS_ORJSON = True
+    loads = orjson.loads
+except ImportError:
+    HAS_ORJSON = False
+    loads = json.loads  # accepts bytes as well
+
+@dataclass(slots=True)
+class TokenEvent:
+    """One normalized streaming event, independent of the backend wire format."""
+    text: str
+    done: bool = False
+    payload: Optional[Dict] = None
+    tool_calls: Optional[List[Dict]] = None  # raw tool-call objects or fragments; see ToolCallAccumulator
+
+class NDJSONDecoder:
+    """Incremental newline-delimited JSON decoder fed with raw response bytes."""
+    def __init__(self):
+        self._buf = b""
+
+    def feed(self, data: bytes) -> List[Dict]:
+        lines = (self._buf + data).split(b"\n")
+        self._buf = lines.pop()
+        return [loads(line) for line in lines if line.strip()]
+
+    def flush(self) -> List[Dict]:
+        line, self._buf = self._buf, b""
+        return [loads(line)] if line.strip() else []
+
+class SSEDecoder:
+    """Incremental decoder for OpenAI-style `data: {...}` server-sent events."""
+    def __init__(self):
+        self._buf = b""
+        self.done = False
+
+    def feed(self, data: bytes) -> List[Dict]:
+        lines = (self._buf + data).split(b"\n")
+        self._buf = lines.pop()
+        out = []
+        for line in lines:
+            if not line.startswith(b"data:"): continue
+            data = line[5:].strip()
+            if data == b"[DONE]":
+                self.done = True; break
+            if data: out.append(loads(data))
+        return out
+
+    def flush(self) -> List[Dict]:
+        if self.done: return []
+        return self.feed(b"\n")
+
+def ollama_event(payload: Dict) -> TokenEvent:
+    text = payload.get("response")
+    if text is None:
+        message = payload.get("message") or {}
+        return TokenEvent(message.get("content", ""), payload.get("done", False), payload, message.get("tool_calls"))
+    return TokenEvent(text, payload.get("done", False), payload)
+
+def openai_event(payload: Dict) -> TokenEvent:
+    choices = payload.get("choices")
+    if not choices: return TokenEvent("", False, payload)
+    choice = choices[0]; delta = choice.get("delta") or {}
+    return TokenEvent(delta.get("content") or "", choice.get("finish_reason") is not None, payload, delta.get("tool_calls"))
+
+def sniff_event(payload: Dict) -> TokenEvent:
+    """Fallback for backends that do not declare their chunk format."""
+    if "choices" in payload: return openai_event(payload)
+    return ollama_event(payload)
+
+class ToolCallAccumulator:
+    """
+    Assembles streamed tool calls. Ollama sends complete calls with object arguments; OpenAI-style streams
+    send fragments keyed by `index` whose `arguments` strings must be concatenated.
+    """
+    def __init__(self):
+        self._calls: Dict[int, Dict] = {}
+
+    def add(self, fragments: List[Dict]):
+        for fragment in fragments:
+            # Complete (Ollama) calls carry no top-level index: each one is a new call
+            index = fragment["index"] if "index" in fragment else len(self._calls)
+            function = fragment.get("function") or {}
+            call = self._calls.setdefault(index, {"id": None, "name": "", "arguments": ""})
+            if fragment.get("id"): call["id"] = fragment["id"]
+            if function.get("name"): call["name"] += function["name"]
+            args = function.get("arguments")
+            if isinstance(args, dict): call["arguments"] = args
+            elif args: call["arguments"] += args
+
+    def calls(self) -> List[Dict]:
+        """[{"id", "name", "arguments"}] where arguments is a dict, or the raw string when it is not valid JSON."""
+        out = []
+        for _, call in sorted(self._calls.items()):
+            args = call["arguments"]
+            if isinstance(args, str):
+                try:
+                    args = json.loads(args) if args.strip() else {}
+                except ValueError:
+                    pass
+            out.append({"id": call["id"], "name": call["name"], "arguments": args})
+        return out
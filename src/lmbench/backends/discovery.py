@@ -1,20 +1,54 @@
-import httpx
 import asyncio
+import json
 import os
 import platform
-import subprocess
-from typing import List, Optional, Union, Tuple
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Union, Tuple
 from rich.console import Console
 from rich.table import Table
 from .ollama import OllamaBackend
 from .lmstudio import LMStudioBackend
 
+# Backend kinds that can be probed, with their default port
+BACKEND_KINDS = {
+    "ollama": ("Ollama", 11434, OllamaBackend),
+    "lmstudio": ("LM Studio", 1234, LMStudioBackend),
+}
+MAX_CONCURRENT_PROBES = 32
+
+def parse_endpoint(spec: str) -> List[Tuple[str, str, type]]:
+    """Parse 'ollama=http://host:port', 'lmstudio=host:port' or a bare URL (probed as every kind)."""
+    kind, _, url = spec.partition("=") if "=" in spec else ("", "", spec)
+    if "://" not in url: url = f"http://{url}"
+    url = url.rstrip("/")
+    kinds = [kind.lower().replace(" ", "")] if kind else list(BACKEND_KINDS)
+    targets = []
+    for k in kinds:
+        if k not in BACKEND_KINDS:
+            raise ValueError(f"Unknown backend kind '{k}' in endpoint '{spec}'")
+        name, _, cls = BACKEND_KINDS[k]
+        targets.append((name, url, cls))
+    return targets
+
 class BackendDiscovery:
-    def __init__(self):
-        self.potential_backends = [
-            ("Ollama", "http://localhost:11434", OllamaBackend),
-            ("LM Studio", "http://localhost:1234", LMStudioBackend)
-        ]
+    def __init__(self, hosts: Optional[List[str]] = None, endpoints: Optional[List[str]] = None, ttl: Optional[int] = None):
+        if hosts is None or endpoints is None or ttl is None:
+            from ..core.config import ConfigManager
+            cfg = ConfigManager().load()
+            hosts = cfg.discovery_hosts if hosts is None else hosts
+            endpoints = cfg.endpoints if endpoints is None else endpoints
+            ttl = cfg.discovery_ttl if ttl is None else ttl
+        self.ttl = ttl
+        self.cache_path = Path.home() / ".lmbench" / "discovery.json"
+        self.potential_backends = []
+        for host in hosts:
+            for name, port, cls in BACKEND_KINDS.values():
+                self.potential_backends.append((name, f"http://{host}:{port}", cls))
+        for spec in endpoints:
+            for target in parse_endpoint(spec):
+                if target not in self.potential_backends: self.potential_backends.append(target)
 
     async def check_backend(self, name: str, url: str, cls) -> Tuple[Optional[Union[OllamaBackend, LMStudioBackend]], bool]:
         """Returns (backend_object, is_running)"""
@@ -23,17 +57,17 @@ class BackendDiscovery:
         if models:
             backend.discovered_models = models
             return backend, True
-        
-        # If not running, check if installed
-        installed = self.is_installed(name)
+
+        # If not running, check if installed (only meaningful for this machine)
+        installed = backend.is_local and self.is_installed(name)
         return backend if installed else None, False
 
     def is_installed(self, name: str) -> bool:
         if name == "Ollama":
-            return subprocess.run("ollama --version", shell=True, capture_output=True).returncode == 0
+            return shutil.which("ollama") is not None
         elif name == "LM Studio":
             # Check for lms CLI
-            if subprocess.run("lms --version", shell=True, capture_output=True).returncode == 0:
+            if shutil.which("lms") is not None:
                 return True
             # Check common install paths
             if platform.system() == "Windows":
@@ -45,19 +79,59 @@ class BackendDiscovery:
                 if os.path.exists("/Applications/LM Studio.app"): return True
         return False
 
-    async def discover(self) -> List[Tuple[Union[OllamaBackend, LMStudioBackend], bool]]:
-        tasks = [self.check_backend(name, url, cls) for name, url, cls in self.potential_backends]
-        results = await asyncio.gather(*tasks)
-        return [r for r in results if r[0] is not None]
+    def _targets(self) -> List[str]:
+        return [f"{name}@{url}" for name, url, _ in self.potential_backends]
+
+    def _load_cache(self) -> Optional[List[Tuple[Union[OllamaBackend, LMStudioBackend], bool]]]:
+        try:
+            data = json.loads(self.cache_path.read_text())
+        except Exception:
+            return None
+        if time.time() - data.get("created", 0) > self.ttl or data.get("targets") != self._targets():
+            return None
+        classes = {name: cls for name, _, cls in BACKEND_KINDS.values()}
+        results = []
+        for entry in data.get("backends", []):
+            backend = classes[entry["name"]](entry["name"], entry["url"])
+            backend.discovered_models = entry.get("models", [])
+            results.append((backend, entry["running"]))
+        return results
 
-def run_discovery():
+    def _save_cache(self, results: List[Tuple[Union[OllamaBackend, LMStudioBackend], bool]]):
+        data = {
+            "created": time.time(),
+            "targets": self._targets(),
+            "backends": [{"name": b.name, "url": b.url, "running": running, "models": b.discovered_models} for b, running in results]
+        }
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            self.cache_path.write_text(json.dumps(data))
+        except OSError:
+            pass
+
+    async def discover(self, use_cache: bool = True) -> List[Tuple[Union[OllamaBackend, LMStudioBackend], bool]]:
+        if use_cache and self.ttl > 0:
+            cached = self._load_cache()
+            if cached is not None: return cached
+        limit = asyncio.Semaphore(MAX_CONCURRENT_PROBES)
+        async def probe(name, url, cls):
+            async with limit:
+                return await self.check_backend(name, url, cls)
+        results = await asyncio.gather(*[probe(name, url, cls) for name, url, cls in self.potential_backends])
+        found = [r for r in results if r[0] is not None]
+        # Running backends first so callers can simply take the head of the list
+        found.sort(key=lambda r: not r[1])
+        self._save_cache(found)
+        return found
+
+def run_discovery(use_cache: bool = True):
     discovery = BackendDiscovery()
-    return asyncio.run(discovery.discover())
+    return asyncio.run(discovery.discover(use_cache))
 
-def print_backend_status():
+def print_backend_status(backends: Optional[List[Tuple[Union[OllamaBackend, LMStudioBackend], bool]]] = None):
     console = Console()
-    backends = run_discovery()
-    
+    if backends is None: backends = run_discovery()
+
     if not backends:
         console.print("[yellow]No local LLM backends detected (Running or Installed).[/yellow]")
         return []
@@ -77,6 +151,6 @@ def print_backend_status():
         table.add_row(b.name, status, model_count, b.url)
         if running:
             valid_backends.append(b)
-    
+
     console.print(table)
     return valid_backends
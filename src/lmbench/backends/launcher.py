@@ -58,7 +58,7 @@ class BackendLauncher:
             while time.time() - start < timeout:
                 # Find the backend in discovery
                 import asyncio
-                res = asyncio.run(discovery.discover())
+                res = asyncio.run(discovery.discover(use_cache=False))
                 for b, running in res:
                     if b.name == name and running:
                         return True
@@ -1,11 +1,29 @@
 import httpx
-import json
-import subprocess
+import time
 import asyncio
-from typing import List, AsyncGenerator, Dict, Optional
+from typing import List, AsyncGenerator, Dict, Optional, Tuple
 from .base import BaseBackend
+from .decoding import SSEDecoder, TokenEvent, openai_event
 
 class LMStudioBackend(BaseBackend):
+    def __init__(self, name: str, url: str):
+        super().__init__(name, url)
+        self._loaded: Dict[str, Optional[str]] = {}  # model -> GPU setting it was loaded with
+        self._load_lock = asyncio.Lock()
+
+    async def _lms(self, *args: str) -> Tuple[int, str]:
+        """Run the `lms` CLI without blocking the event loop. Returns (returncode, stdout)."""
+        try:
+            process = await asyncio.create_subprocess_exec(
+                "lms", *args,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+        except (FileNotFoundError, PermissionError):
+            return 127, ""
+        stdout, _ = await process.communicate()
+        return process.returncode, stdout.decode(errors="replace")
+
     async def get_models(self) -> List[str]:
         # Try API first
         try:
@@ -16,37 +34,78 @@ class LMStudioBackend(BaseBackend):
         except Exception:
             pass
         
-        # Fallback to CLI list
+        # Fallback to CLI list (only describes this machine)
+        if not self.is_local: return []
+        returncode, stdout = await self._lms("ls")
+        if returncode == 0:
+            # Basic parsing of lms ls table
+            return [line.split()[0] for line in stdout.split('\n') if line.strip() and not line.startswith('ID')]
+        return []
+
+    async def _native_models(self) -> List[Dict]:
+        """LM Studio's own REST listing (/api/v0/models), which adds arch, quantization and context length to /v1/models."""
         try:
-            result = subprocess.run("lms ls", shell=True, capture_output=True, text=True)
-            if result.returncode == 0:
-                # Basic parsing of lms ls table
-                return [line.split()[0] for line in result.stdout.split('\n') if line and not line.startswith('ID')]
+            async with httpx.AsyncClient(timeout=5.0) as client:
+                response = await client.get(f"{self.url}/api/v0/models")
+                if response.status_code == 200:
+                    return response.json().get("data", [])
         except Exception:
             pass
         return []
 
+    async def list_model_files(self) -> List[Dict]:
+        # No content digest is exposed; id + format + quantization changes whenever different weights are downloaded
+        return [{"name": m["id"], "digest": f"lmstudio:{m['id']}:{m.get('compatibility_type')}:{m.get('quantization')}", "size": None}
+                for m in await self._native_models()]
+
+    async def show_model(self, model: str) -> Optional[Dict]:
+        m = next((m for m in await self._native_models() if m["id"] == model), None)
+        if m is None: return None
+        kind = m.get("type")
+        return {"architecture": m.get("arch"), "family": m.get("arch"), "parameters": None, "quantization": m.get("quantization"),
+                "layers": None, "context_length": m.get("max_context_length"), "embedding_length": None, "head_count": None,
+                "head_count_kv": None, "capabilities": ["embedding"] if kind == "embeddings" else ["completion", "vision"] if kind == "vlm" else ["completion"]}
+
     async def get_loaded_models(self) -> List[Dict]:
-        try:
-            result = subprocess.run("lms ps", shell=True, capture_output=True, text=True)
-            if result.returncode == 0:
-                # lms ps shows loaded models
-                loaded = []
-                for line in result.stdout.split('\n')[1:]:
-                    if line.strip():
-                        parts = line.split()
-                        loaded.append({"name": parts[0], "size": parts[1] if len(parts)>1 else "Unknown"})
-                return loaded
-        except Exception:
-            pass
+        # `lms` only sees this machine; a remote server reports its loaded models over REST
+        if not self.is_local: return [{"name": m["id"], "size": "Unknown"} for m in await self._native_models() if m.get("state") == "loaded"]
+        returncode, stdout = await self._lms("ps")
+        if returncode == 0:
+            # lms ps shows loaded models
+            loaded = []
+            for line in stdout.split('\n')[1:]:
+                if line.strip():
+                    parts = line.split()
+                    loaded.append({"name": parts[0], "size": parts[1] if len(parts)>1 else "Unknown"})
+            return loaded
         return []
 
     async def unload_all(self) -> bool:
-        try:
-            subprocess.run("lms unload --all", shell=True, check=True, capture_output=True)
-            return True
-        except Exception:
-            return False
+        self._loaded.clear()
+        if not self.is_local: return False  # the REST API has no unload; the server's idle TTL evicts models
+        returncode, _ = await self._lms("unload", "--all")
+        return returncode == 0
+
+    async def load_model(self, model: str, options: Optional[Dict] = None) -> float:
+        """Load via `lms load` unless the cached state says it is already resident with the same GPU setting."""
+        if not self.is_local: return 0.0  # a remote server loads on the first request (just-in-time loading)
+        gpu = str(options["num_gpu"]) if options and "num_gpu" in options else None
+        async with self._load_lock:
+            if model in self._loaded and self._loaded[model] == gpu:
+                return 0.0
+            if model not in self._loaded and gpu is None:
+                # Loaded outside LMBench (or before a restart of the cache): trust `lms ps`
+                if any(m["name"] == model for m in await self.get_loaded_models()):
+                    self._loaded[model] = gpu
+                    return 0.0
+            args = ["load", model] + (["--gpu", gpu] if gpu is not None else [])
+            start = time.perf_counter()
+            returncode, _ = await self._lms(*args)
+            elapsed = time.perf_counter() - start
+            if returncode == 0:
+                self._loaded[model] = gpu
+            # On failure continue and hope the API loads it on demand
+            return elapsed
 
     async def pull_model(self, model_id: str):
         # lms get <model_id>
@@ -61,28 +120,49 @@ class LMStudioBackend(BaseBackend):
             yield {"status": line.decode().strip()}
 
     async def stream_generate(self, model: str, prompt: str, options: Optional[Dict] = None) -> AsyncGenerator[Dict, None]:
-        # Ensure model is loaded first via CLI
-        load_cmd = f"lms load {model}"
-        if options and "num_gpu" in options:
-            load_cmd += f" --gpu {options['num_gpu']}"
-        
-        try:
-            subprocess.run(load_cmd, shell=True, check=True, capture_output=True)
-        except Exception:
-            pass # Continue and hope API handles it
+        images = (options or {}).get("images")
+        content = [{"type": "text", "text": prompt}] + [{"type": "image_url", "image_url": {"url": f"data:image/png;base64,{b64}"}} for b64 in images] if images else prompt
+        async for chunk in self.stream_chat(model, [{"role": "user", "content": content}], options):
+            yield chunk
+
+    async def stream_chat(self, model: str, messages: List[Dict], options: Optional[Dict] = None) -> AsyncGenerator[Dict, None]:
+        # Ensure model is loaded first via CLI (no-op when the cache says it already is)
+        await self.load_model(model, options)
 
         async with httpx.AsyncClient(timeout=None) as client:
             payload = {
                 "model": model,
-                "messages": [{"role": "user", "content": prompt}],
+                "messages": messages,
                 "stream": True
             }
+            # Sampling options use Ollama names elsewhere in LMBench
+            for ours, theirs in (("num_predict", "max_tokens"), ("temperature", "temperature"), ("seed", "seed")):
+                if options and ours in options: payload[theirs] = options[ours]
+            if options and options.get("tools"): payload["tools"] = options["tools"]
+            fmt = (options or {}).get("format")
+            if fmt == "json": payload["response_format"] = {"type": "json_object"}
+            elif fmt: payload["response_format"] = {"type": "json_schema", "json_schema": {"name": "response", "strict": True, "schema": fmt}}
             async with client.stream("POST", f"{self.url}/v1/chat/completions", json=payload) as response:
-                async for line in response.aiter_lines():
-                    if line.startswith("data: "):
-                        data = line[6:]
-                        if data.strip() == "[DONE]": break
-                        yield json.loads(data)
+                decoder = SSEDecoder()
+                async for data in response.aiter_bytes():
+                    for chunk in decoder.feed(data):
+                        yield chunk
+                    if decoder.done: break
+                for chunk in decoder.flush():
+                    yield chunk
+
+    async def embed(self, model: str, inputs: List[str], options: Optional[Dict] = None) -> Dict:
+        await self.load_model(model, options)
+        async with httpx.AsyncClient(timeout=None) as client:
+            response = await client.post(f"{self.url}/v1/embeddings", json={"model": model, "input": inputs})
+            response.raise_for_status()
+            data = response.json()
+        vectors = data.get("data") or []
+        return {"embeddings": len(vectors), "dims": len(vectors[0]["embedding"]) if vectors else 0,
+                "prompt_tokens": (data.get("usage") or {}).get("prompt_tokens")}
+
+    def to_event(self, chunk: Dict) -> TokenEvent:
+        return openai_event(chunk)
 
     def is_compatible(self, chunk: Dict) -> bool:
         return False
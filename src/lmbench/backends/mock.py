@@ -0,0 +1,79 @@
+import asyncio
+import time
+from typing import AsyncGenerator, Dict, List, Optional
+from .base import BaseBackend
+from .decoding import TokenEvent, ollama_event
+
+class MockBackend(BaseBackend):
+    """Synthetic Ollama-shaped backend: deterministic token timing, no server required."""
+    def __init__(self, name: str = "Mock", url: str = "mock://localhost", models: Optional[List[str]] = None,
+                 tps: float = 50.0, ttft_ms: float = 50.0, tokens: int = 64, prefill_tps: float = 2000.0):
+        super().__init__(name, url)
+        self.models = models or ["mock:latest"]
+        self.tps, self.ttft_ms, self.tokens, self.prefill_tps = tps, ttft_ms, tokens, prefill_tps
+        self._cached: List[str] = []  # words of the last chat prompt, standing in for the KV cache
+        self.discovered_models = list(self.models)
+
+    async def get_models(self) -> List[str]:
+        return list(self.models)
+
+    async def get_loaded_models(self) -> List[Dict]:
+        return []
+
+    async def unload_all(self) -> bool:
+        return True
+
+    async def stream_generate(self, model: str, prompt: str, options: Optional[Dict] = None) -> AsyncGenerator[Dict, None]:
+        start = time.perf_counter()
+        images = (options or {}).get("images") or []
+        limit = (options or {}).get("num_predict")
+        tokens = min(self.tokens, limit) if limit and limit > 0 else self.tokens  # like Ollama, -1 means no cap
+        await asyncio.sleep(self.ttft_ms / 1000 + 0.02 * len(images))  # stand-in for image encoding
+        for i in range(tokens):
+            yield {"model": model, "response": f"tok{i} ", "done": False}
+            # Sleep until the next token's scheduled time so the rate does not drift
+            delay = start + self.ttft_ms / 1000 + 0.02 * len(images) + (i + 1) / self.tps - time.perf_counter()
+            if delay > 0: await asyncio.sleep(delay)
+        elapsed_ns = int((time.perf_counter() - start) * 1e9)
+        yield {"model": model, "response": "", "done": True, "eval_count": tokens, "total_duration": elapsed_ns,
+               "prompt_eval_count": len(prompt.split()) + 576 * len(images), "load_duration": 0}
+
+    async def embed(self, model: str, inputs: List[str], options: Optional[Dict] = None) -> Dict:
+        words = sum(len(text.split()) for text in inputs)
+        await asyncio.sleep(self.ttft_ms / 1000 + words / self.prefill_tps)
+        return {"embeddings": len(inputs), "dims": 768, "prompt_tokens": words}
+
+    async def stream_chat(self, model: str, messages: List[Dict], options: Optional[Dict] = None) -> AsyncGenerator[Dict, None]:
+        """
+        Chat with a simulated prefix cache: only words after the prefix shared with the previous request are prefilled.
+        When tools are offered, each one is called once, in order, before the final reply.
+        """
+        tools = (options or {}).get("tools")
+        called = sum(1 for m in messages if m["role"] == "tool")
+        if tools and called < len(tools):
+            # Scripted agent: call each offered tool once, in order, with placeholder arguments
+            function = tools[called]["function"]
+            await asyncio.sleep(self.ttft_ms / 1000)
+            args = {name: "x" for name in function.get("parameters", {}).get("required", [])}
+            yield {"model": model, "message": {"role": "assistant", "content": "", "tool_calls": [{"function": {"name": function["name"], "arguments": args}}]}, "done": False}
+            yield {"model": model, "message": {"role": "assistant", "content": ""}, "done": True, "eval_count": 12}
+            return
+        words = " ".join(m.get("content") or "" for m in messages).split()
+        reused = 0
+        for a, b in zip(words, self._cached):
+            if a != b: break
+            reused += 1
+        await asyncio.sleep((len(words) - reused) / self.prefill_tps)
+        limit = (options or {}).get("num_predict")
+        tokens = min(self.tokens, limit) if limit and limit > 0 else self.tokens  # same cap as stream_generate
+        self._cached = words + [f"tok{i}" for i in range(tokens)]  # set up front: consumers stop at the final chunk
+        async for chunk in MockBackend(model, tps=self.tps, ttft_ms=self.ttft_ms, tokens=tokens).stream_generate(model, "", options):
+            chunk["message"] = {"role": "assistant", "content": chunk.pop("response")}
+            if chunk["done"]: chunk["prompt_eval_count"] = len(words) - reused
+            yield chunk
+
+    def to_event(self, chunk: Dict) -> TokenEvent:
+        return ollama_event(chunk)
+
+    def is_compatible(self, chunk: Dict) -> bool:
+        return chunk.get("done", False)
@@ -2,6 +2,33 @@ import httpx
 import json
 from typing import List, AsyncGenerator, Dict, Optional
 from .base import BaseBackend
+from .decoding import NDJSONDecoder, TokenEvent, ollama_event
+
+def _request(model: str, options: Optional[Dict], **body) -> Dict:
+    """Request body; `format` ("json" or a JSON schema), `tools` and `images` are top-level fields, not model options."""
+    options = dict(options or {})
+    fmt, tools, images = options.pop("format", None), options.pop("tools", None), options.pop("images", None)
+    payload = {"model": model, **body, "stream": True, "options": options}
+    if fmt: payload["format"] = fmt
+    if tools: payload["tools"] = tools
+    if images: payload["images"] = images  # base64 strings; /api/generate only
+    return payload
+
+def _parameter_count(size: Optional[str]) -> Optional[int]:
+    """"8.0B" / "137M" (from `details.parameter_size`) as a count."""
+    try: return int(float(size[:-1]) * {"K": 1e3, "M": 1e6, "B": 1e9, "T": 1e12}[size[-1].upper()])
+    except (TypeError, ValueError, KeyError, IndexError): return None
+
+def model_facts(show: Dict) -> Dict:
+    """Normalize an /api/show response: `details` has the tag-level facts, `model_info` the GGUF metadata keys."""
+    details, info = show.get("details") or {}, show.get("model_info") or {}
+    arch = info.get("general.architecture") or details.get("family")
+    key = lambda k: info.get(f"{arch}.{k}")
+    return {"architecture": arch, "family": details.get("family"),
+            "parameters": info.get("general.parameter_count") or _parameter_count(details.get("parameter_size")),
+            "quantization": details.get("quantization_level"), "layers": key("block_count"), "context_length": key("context_length"),
+            "embedding_length": key("embedding_length"), "head_count": key("attention.head_count"),
+            "head_count_kv": key("attention.head_count_kv"), "capabilities": show.get("capabilities") or []}
 
 class OllamaBackend(BaseBackend):
     async def get_models(self) -> List[str]:
@@ -14,6 +41,26 @@ class OllamaBackend(BaseBackend):
             pass
         return []
 
+    async def list_model_files(self) -> List[Dict]:
+        try:
+            async with httpx.AsyncClient(timeout=5.0) as client:
+                response = await client.get(f"{self.url}/api/tags")
+                if response.status_code == 200:
+                    return [{"name": m["name"], "digest": m.get("digest"), "size": m.get("size")} for m in response.json().get("models", [])]
+        except Exception:
+            pass
+        return []
+
+    async def show_model(self, model: str) -> Optional[Dict]:
+        try:
+            async with httpx.AsyncClient(timeout=10.0) as client:
+                response = await client.post(f"{self.url}/api/show", json={"model": model})
+                if response.status_code == 200:
+                    return model_facts(response.json())
+        except Exception:
+            pass
+        return None
+
     async def get_loaded_models(self) -> List[Dict]:
         try:
             async with httpx.AsyncClient(timeout=2.0) as client:
@@ -44,16 +91,33 @@ class OllamaBackend(BaseBackend):
 
     async def stream_generate(self, model: str, prompt: str, options: Optional[Dict] = None) -> AsyncGenerator[Dict, None]:
         async with httpx.AsyncClient(timeout=None) as client:
-            payload = {
-                "model": model, 
-                "prompt": prompt, 
-                "stream": True,
-                "options": options or {}
-            }
+            payload = _request(model, options, prompt=prompt)
             async with client.stream("POST", f"{self.url}/api/generate", json=payload) as response:
-                async for line in response.aiter_lines():
-                    if line:
-                        yield json.loads(line)
+                decoder = NDJSONDecoder()
+                async for data in response.aiter_bytes():
+                    for chunk in decoder.feed(data):
+                        yield chunk
+                for chunk in decoder.flush():
+                    yield chunk
+
+    async def stream_chat(self, model: str, messages: List[Dict], options: Optional[Dict] = None) -> AsyncGenerator[Dict, None]:
+        async with httpx.AsyncClient(timeout=None) as client:
+            payload = _request(model, options, messages=messages)
+            async with client.stream("POST", f"{self.url}/api/chat", json=payload) as response:
+                decoder = NDJSONDecoder()
+                async for data in response.aiter_bytes():
+                    for chunk in decoder.feed(data):
+                        yield chunk
+                for chunk in decoder.flush():
+                    yield chunk
+
+    async def embed(self, model: str, inputs: List[str], options: Optional[Dict] = None) -> Dict:
+        async with httpx.AsyncClient(timeout=None) as client:
+            response = await client.post(f"{self.url}/api/embed", json={"model": model, "input": inputs, "options": options or {}})
+            response.raise_for_status()
+            data = response.json()
+        vectors = data.get("embeddings") or []
+        return {"embeddings": len(vectors), "dims": len(vectors[0]) if vectors else 0, "prompt_tokens": data.get("prompt_eval_count")}
 
     async def pull_model(self, model: str):
         async with httpx.AsyncClient(timeout=None) as client:
@@ -64,5 +128,14 @@ class OllamaBackend(BaseBackend):
                         status = json.loads(line)
                         yield status
 
+    def tool_messages(self, calls: List[Dict], results: List[str]) -> List[Dict]:
+        # Ollama wants object arguments and matches results to calls by order
+        assistant = {"role": "assistant", "content": "", "tool_calls": [
+            {"function": {"name": c["name"], "arguments": c["arguments"] if isinstance(c["arguments"], dict) else {}}} for c in calls]}
+        return [assistant] + [{"role": "tool", "content": r, "tool_name": c["name"]} for c, r in zip(calls, results)]
+
+    def to_event(self, chunk: Dict) -> TokenEvent:
+        return ollama_event(chunk)
+
     def is_compatible(self, chunk: Dict) -> bool:
         return chunk.get("done", False)
@@ -0,0 +1,189 @@
+import asyncio
+import gzip
+import json
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import AsyncGenerator, Dict, List, Optional, Tuple
+from .base import BaseBackend
+from .decoding import TokenEvent, ollama_event, openai_event, sniff_event
+
+TRACE_FORMAT = "lmbench-trace"
+TRACE_VERSION = 1
+
+def _stream_key(model: str, prompt: str, options: Optional[Dict]) -> Tuple[str, str, str]:
+    return model, prompt, json.dumps(options or {}, sort_keys=True)
+
+def _chat_key(model: str, messages: List[Dict], options: Optional[Dict]) -> Tuple[str, str, str]:
+    return _stream_key(model, "chat:" + json.dumps(messages, sort_keys=True), options)
+
+class TraceWriter:
+    """Append-only gzip NDJSON trace: one header line, then one line per recorded stream."""
+    def __init__(self, path: str, backend: BaseBackend):
+        self.path = path
+        self._fh = gzip.open(path, "wt", encoding="utf-8")
+        from .. import __version__
+        self._write({
+            "format": TRACE_FORMAT, "version": TRACE_VERSION, "lmbench": __version__,
+            "backend": backend.name, "url": backend.url, "created": datetime.now().isoformat()
+        })
+
+    def _write(self, record: Dict):
+        self._fh.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def write_stream(self, model: str, prompt: Optional[str], options: Optional[Dict], chunks: List, messages: Optional[List[Dict]] = None):
+        """A generate stream is keyed by its prompt, a chat stream by its messages."""
+        if self._fh.closed: return
+        request = {"prompt": prompt} if messages is None else {"messages": messages}
+        self._write({"model": model, **request, "options": options or {}, "chunks": chunks})
+
+    def close(self):
+        if not self._fh.closed: self._fh.close()
+
+def load_trace(path: str) -> Tuple[Dict, List[Dict]]:
+    """Return (header, streams) from a trace written by TraceWriter."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("format") != TRACE_FORMAT:
+            raise ValueError(f"{path} is not an LMBench trace")
+        streams = [json.loads(line) for line in f if line.strip()]
+    return header, streams
+
+class RecordingBackend(BaseBackend):
+    """Wraps a live backend and records every stream_generate and stream_chat call with arrival offsets."""
+    def __init__(self, inner: BaseBackend, path: str):
+        super().__init__(inner.name, inner.url)
+        self.inner = inner
+        self.discovered_models = getattr(inner, "discovered_models", [])
+        self.writer = TraceWriter(path, inner)
+
+    async def get_models(self) -> List[str]:
+        return await self.inner.get_models()
+
+    async def get_loaded_models(self) -> List[Dict]:
+        return await self.inner.get_loaded_models()
+
+    async def unload_all(self) -> bool:
+        return await self.inner.unload_all()
+
+    async def load_model(self, model: str, options: Optional[Dict] = None) -> float:
+        return await self.inner.load_model(model, options)
+
+    async def list_model_files(self) -> List[Dict]:
+        return await self.inner.list_model_files()
+
+    async def show_model(self, model: str) -> Optional[Dict]:
+        return await self.inner.show_model(model)
+
+    async def embed(self, model: str, inputs: List[str], options: Optional[Dict] = None) -> Dict:
+        # Not streamed, so there is nothing to record
+        return await self.inner.embed(model, inputs, options)
+
+    async def _record(self, stream: AsyncGenerator[Dict, None], model: str, prompt: Optional[str], options: Optional[Dict],
+                      messages: Optional[List[Dict]] = None) -> AsyncGenerator[Dict, None]:
+        chunks, written = [], False
+        start = time.perf_counter()
+        try:
+            async for chunk in stream:
+                chunks.append([round(time.perf_counter() - start, 6), chunk])
+                # The engine stops iterating on the final chunk, so flush before handing it over
+                if self.inner.is_compatible(chunk):
+                    self.writer.write_stream(model, prompt, options, chunks, messages); written = True
+                yield chunk
+        finally:
+            if not written: self.writer.write_stream(model, prompt, options, chunks, messages)
+
+    async def stream_generate(self, model: str, prompt: str, options: Optional[Dict] = None) -> AsyncGenerator[Dict, None]:
+        async for chunk in self._record(self.inner.stream_generate(model, prompt, options), model, prompt, options):
+            yield chunk
+
+    async def stream_chat(self, model: str, messages: List[Dict], options: Optional[Dict] = None) -> AsyncGenerator[Dict, None]:
+        messages = json.loads(json.dumps(messages))  # callers keep appending to their history; record it as sent
+        async for chunk in self._record(self.inner.stream_chat(model, messages, options), model, None, options, messages):
+            yield chunk
+
+    def tool_messages(self, calls: List[Dict], results: List[str]) -> List[Dict]:
+        return self.inner.tool_messages(calls, results)
+
+    def to_event(self, chunk: Dict) -> TokenEvent:
+        return self.inner.to_event(chunk)
+
+    def is_compatible(self, chunk: Dict) -> bool:
+        return self.inner.is_compatible(chunk)
+
+    def close(self):
+        self.writer.close()
+
+class ReplayBackend(BaseBackend):
+    """Feeds recorded streams back with their original timing (or as fast as possible)."""
+    def __init__(self, path: str, speed: Optional[float] = 1.0):
+        self.header, self.streams = load_trace(path)
+        super().__init__(f"Replay ({self.header.get('backend', 'Unknown')})", path)
+        self.speed = speed  # None replays without delays
+        self._by_key = defaultdict(list); self._by_model = defaultdict(list); self._chat_by_model = defaultdict(list); self._cursor = defaultdict(int)
+        for s in self.streams:
+            if "messages" in s:
+                self._by_key[_chat_key(s["model"], s["messages"], s["options"])].append(s); self._chat_by_model[s["model"]].append(s)
+            else:
+                self._by_key[_stream_key(s["model"], s["prompt"], s["options"])].append(s); self._by_model[s["model"]].append(s)
+        self.discovered_models = list(dict.fromkeys(s["model"] for s in self.streams))
+        recorded = self.header.get("backend")
+        self._to_event = ollama_event if recorded == "Ollama" else openai_event if recorded == "LM Studio" else sniff_event
+
+    def plan(self) -> Tuple[List[str], List[Dict], List[Optional[Dict]], int]:
+        """Reconstruct (models, tests, matrix options, rounds) that reproduce the recorded run's generate streams."""
+        prompts, options = [], []
+        for s in self.streams:
+            if "messages" in s: continue  # chat turns depend on earlier replies; they are served through stream_chat
+            if s["prompt"] not in prompts: prompts.append(s["prompt"])
+            opt = s["options"] or None
+            if opt not in options: options.append(opt)
+        tests = [{"name": f"Replay {i+1}", "type": "performance", "prompt": p} for i, p in enumerate(prompts)]
+        rounds = max((len(v) for k, v in self._by_key.items() if not k[1].startswith("chat:")), default=1)
+        return self.discovered_models, tests, options or [None], rounds
+
+    def _next_stream(self, model: str, prompt: str, options: Optional[Dict], messages: Optional[List[Dict]] = None) -> Dict:
+        key = _stream_key(model, prompt, options) if messages is None else _chat_key(model, messages, options)
+        pool = self._by_key.get(key) or (self._by_model if messages is None else self._chat_by_model).get(model)
+        if not pool:
+            raise ValueError(f"No recorded stream for model '{model}'")
+        idx = self._cursor[key]; self._cursor[key] += 1
+        return pool[idx % len(pool)]
+
+    async def get_models(self) -> List[str]:
+        return self.discovered_models
+
+    async def get_loaded_models(self) -> List[Dict]:
+        return []
+
+    async def unload_all(self) -> bool:
+        return True
+
+    async def stream_generate(self, model: str, prompt: str, options: Optional[Dict] = None) -> AsyncGenerator[Dict, None]:
+        async for chunk in self._replay(self._next_stream(model, prompt, options)):
+            yield chunk
+
+    async def stream_chat(self, model: str, messages: List[Dict], options: Optional[Dict] = None) -> AsyncGenerator[Dict, None]:
+        async for chunk in self._replay(self._next_stream(model, None, options, messages)):
+            yield chunk
+
+    async def _replay(self, stream: Dict) -> AsyncGenerator[Dict, None]:
+        start = time.perf_counter()
+        for offset, chunk in stream["chunks"]:
+            if self.speed:
+                delay = start + offset / self.speed - time.perf_counter()
+                if delay > 0: await asyncio.sleep(delay)
+            yield chunk
+
+    def tool_messages(self, calls: List[Dict], results: List[str]) -> List[Dict]:
+        # Rebuild the history in the recorded backend's format so the next turn's messages match the trace
+        if self.header.get("backend") == "Ollama":
+            from .ollama import OllamaBackend
+            return OllamaBackend.tool_messages(self, calls, results)
+        return super().tool_messages(calls, results)
+
+    def to_event(self, chunk: Dict) -> TokenEvent:
+        return self._to_event(chunk)
+
+    def is_compatible(self, chunk: Dict) -> bool:
+        return chunk.get("done", False)
@@ -1,26 +1,35 @@
 import typer
 import asyncio
 from typing import List, Optional
-from rich.console import Console
-from .system import probe, health, storage
-from .backends import discovery, launcher
-from .core import engine, updater, recommender, config, ai_recommender
-from .core.reporter import Reporter
+
+# Subsystems (httpx, rich, pydantic, cpuinfo, ...) are imported inside each command so that
+# cheap invocations such as `lmbench version` do not pay for them. See benchmarks/bench_startup.py.
 
 app = typer.Typer(
     name="lmbench",
     help="The universal benchmark for local LLMs",
     add_completion=False,
 )
-console = Console()
 
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, DownloadColumn
+class _LazyConsole:
+    """Creates the rich Console on first use."""
+    _console = None
+
+    def __getattr__(self, name):
+        if _LazyConsole._console is None:
+            from rich.console import Console
+            _LazyConsole._console = Console()
+        return getattr(_LazyConsole._console, name)
+
+console = _LazyConsole()
 
 @app.command()
 def init():
     """
     Interactively set up your default benchmarking parameters.
     """
+    from .system import storage
+    from .core import config
     console.print("[bold blue]LMBench Setup[/bold blue]\n")
     sm = storage.StorageManager()
     sm.recommend_storage()
@@ -34,7 +43,9 @@ def init():
     console.print(f"\n[green]✔ Configuration saved to {mgr.config_path}[/green]")
 
 async def _pull_logic(model_name: str):
-    backends = discovery.run_discovery()
+    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, DownloadColumn
+    from .backends import discovery
+    backends = await discovery.BackendDiscovery().discover()
     # Find Ollama in the results
     ollama = next((b for b, running in backends if b.name == "Ollama"), None)
     
@@ -72,6 +83,9 @@ def recommend(
     use_ai: bool = typer.Option(False, "--ai", "-a", help="Use a transient AI model")
 ):
     """Recommend models based on your hardware profile."""
+    from .system import probe
+    from .backends import discovery
+    from .core import recommender, ai_recommender
     system_info = probe.get_system_info()
     if use_ai:
         backends = asyncio.run(discovery.BackendDiscovery().discover())
@@ -86,17 +100,63 @@ def recommend(
             for m in selected: table.add_row(m.get("type"), m.get("id"), f"{m.get('vram_gb')}GB")
             console.print(table)
     else:
-        rec = recommender.Recommender(system_info); rec.print_recommendations(); selected = rec.select_top_10()
+        # Installed models are sized from their own metadata instead of the registry's guesses: the GGUF headers
+        # on disk, or a local backend's API when its model files cannot be read
+        from .core.catalog import ModelCatalog
+        from .system import gguf
+        catalog = ModelCatalog.from_files(gguf.local_inventory())
+        if not catalog.installed():
+            local = next((b for b, running in asyncio.run(discovery.BackendDiscovery().discover()) if running and b.is_local), None)
+            if local: catalog = asyncio.run(ModelCatalog(local).refresh())
+        rec = recommender.Recommender(system_info, catalog=catalog); rec.print_recommendations(); selected = rec.select_top_10() + rec.select_vision_models() + rec.select_embedding_models()
     if pull_needed:
         for m in selected:
             m_id = m.get("id") if isinstance(m, dict) else m
             if typer.confirm(f"Pull {m_id}?"): asyncio.run(_pull_logic(m_id))
 
 @app.command()
-def update(): updater.run_update()
+def inventory(
+    context: Optional[int] = typer.Option(None, "--context", "-c", help="Context length for the memory estimate (default: config)"),
+    rescan: bool = typer.Option(False, "--rescan", help="Re-read every header and rewrite ~/.lmbench/gguf_index.json"),
+):
+    """List the Ollama and LM Studio models on disk from their GGUF headers (no backend needed)."""
+    import time
+    from rich.table import Table
+    from .core import config
+    from .core.catalog import ModelCatalog
+    from .core.recommender import Recommender
+    from .system import gguf, probe
+    start = time.perf_counter(); models = gguf.local_inventory(rescan=rescan); elapsed = (time.perf_counter() - start) * 1000
+    if not models:
+        console.print("[yellow]No GGUF models found in the Ollama or LM Studio model folders.[/yellow]"); return
+    ctx = context or config.ConfigManager().load().context_length
+    catalog = ModelCatalog.from_files(models, ctx); vram = Recommender(probe.get_system_info()).vram
+    table = Table(title=f"Local Models ({len(models)} read in {elapsed:.0f} ms)", box=None)
+    for col in ("Backend", "Model", "Arch", "Params", "Quant", "Layers", "Max Ctx", "Size", f"Memory @{ctx}", "Fits"): table.add_column(col)
+    for m in models:
+        params = m["parameters"]; est = catalog.estimate_gb(m["name"])
+        table.add_row(m["backend"], m["name"], m["architecture"] or "?", f"{params / 1e9:.1f}B" if params >= 1e9 else f"{params / 1e6:.0f}M",
+                      m["quantization"] or "?", str(m["layers"] or "?"), str(m["context_length"] or "?"), f"{m['size'] / 1024**3:.1f}GB",
+                      f"{est:.1f}GB" if est else "?", "[green]✔[/green]" if est and est <= vram else "[yellow]offload[/yellow]")
+    console.print(table)
 
 @app.command()
-def doctor(): health.SystemDoctor().run_check()
+def update():
+    from .core import updater
+    updater.run_update()
+
+@app.command()
+def doctor():
+    from .system import health
+    health.SystemDoctor().run_check()
+
+def _build_tests(deep: bool, suite: bool, prompt: str) -> List[dict]:
+    from .core.engine import BenchmarkSuite
+    if deep:
+        return [BenchmarkSuite.get_burst_test(), BenchmarkSuite.get_context_test(), BenchmarkSuite.get_code_test(), BenchmarkSuite.get_logic_test()]
+    elif suite:
+        return [BenchmarkSuite.get_burst_test(), BenchmarkSuite.get_logic_test()]
+    return [{"name": "Default", "type": "performance", "prompt": prompt}]
 
 @app.command()
 def run(
@@ -111,113 +171,506 @@ def run(
     auto_start: bool = typer.Option(True, "--start"),
     intent: Optional[str] = typer.Option(None, "--intent", "-i", help="Primary goal: [C]ode, [A]gent, [R]oleplay, [G]eneral"),
     yes: bool = typer.Option(False, "--yes", "-y", help="Automatically accept all prompts (like installing Ollama)"),
+    record: Optional[str] = typer.Option(None, "--record", help="Record every raw backend stream to a trace file (.jsonl.gz)"),
+    endpoint: Optional[List[str]] = typer.Option(None, "--endpoint", "-e", help="Extra backend to probe: 'ollama=http://host:11434', 'lmstudio=host:1234' or a bare URL"),
+    refresh: bool = typer.Option(False, "--refresh", help="Ignore the cached backend discovery results"),
+    revert_vm: Optional[List[str]] = typer.Option(None, "--revert-vm", help="Clean-state mode: 'esxi-host/vm-name[=guest-url]' reverted to its latest snapshot before each model (password from LMBENCH_ESXI_PASSWORD)"),
+    metrics_port: Optional[int] = typer.Option(None, "--metrics-port", help="Serve live OpenMetrics/Prometheus metrics on this port"),
+    trace: Optional[str] = typer.Option(None, "--trace", help="Write a Chrome/Perfetto trace-event JSON file per round into this directory"),
+    events: Optional[str] = typer.Option(None, "--events", help="Stream engine events; only 'ndjson' is supported"),
+    events_file: Optional[str] = typer.Option(None, "--events-file", help="Write --events to this file instead of stdout"),
+    embed: bool = typer.Option(False, "--embed", help="Benchmark embeddings (batch size x input length sweep) instead of generation"),
+    vision: bool = typer.Option(False, "--vision", help="Benchmark image input (resolution x image count sweep) instead of text-only generation"),
+    pull_bandwidth: Optional[float] = typer.Option(None, "--pull-bandwidth", help="Cap background model downloads (--top) at this many MB/s"),
 ):
-    mgr = config.ConfigManager(); cfg = mgr.load()
-    user_intent = intent
-    if not user_intent and not (model or all_models or top):
-        console.print("\n[bold cyan]Primary goal?[/bold cyan] [C]ode, [A]gent, [R]oleplay, [G]eneral")
-        user_intent = typer.prompt("Select", default="G").upper()
-    final_rounds = rounds if rounds is not None else cfg.rounds
-    final_deep = deep if deep is not None else cfg.deep
-    final_matrix = matrix if matrix is not None else cfg.matrix
-    console.print("[bold green]LMBench[/bold green] is starting...", style="bold blue")
-    doc = health.SystemDoctor(); issues = doc.diagnose()
-    system_info = probe.print_system_info()
-    # 2. Backend Discovery & Launch
-    disco = discovery.BackendDiscovery()
-    found_backends = asyncio.run(disco.discover())
+    import contextlib
+    import sys
+    if events not in (None, "ndjson"):
+        raise typer.BadParameter("only 'ndjson' is supported", param_hint="--events")
+    event_stream, redirect = None, contextlib.nullcontext()
+    if events and events_file in (None, "-"):
+        # stdout carries the NDJSON stream; everything human-readable goes to stderr
+        event_stream, redirect = sys.stdout, contextlib.redirect_stdout(sys.stderr)
+    with redirect:  # undone when run returns, so callers in the same process get stdout back
+        from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn
+        from .system import probe, health
+        from .backends import discovery, launcher
+        from .core import engine, recommender, config
+        from .core.reporter import Reporter
+        mgr = config.ConfigManager(); cfg = mgr.load()
+        user_intent = intent
+        if not user_intent and not (model or all_models or top or embed or vision):
+            console.print("\n[bold cyan]Primary goal?[/bold cyan] [C]ode, [A]gent, [R]oleplay, [G]eneral")
+            user_intent = typer.prompt("Select", default="G").upper()
+        final_rounds = rounds if rounds is not None else cfg.rounds
+        final_deep = deep if deep is not None else cfg.deep
+        final_matrix = matrix if matrix is not None else cfg.matrix
+        console.print("[bold green]LMBench[/bold green] is starting...", style="bold blue")
+        # 1. Backend Discovery (single pass, shared by the doctor and the status table)
+        disco = discovery.BackendDiscovery(endpoints=cfg.endpoints + list(endpoint or []))
+        found_backends = asyncio.run(disco.discover(use_cache=not refresh))
+        doc = health.SystemDoctor(); issues = doc.diagnose(found_backends)
+        system_info = probe.print_system_info()
+        # 2. Backend Launch
     
-    if not found_backends:
-        console.print("\n[bold red]No local LLM backends found (Ollama or LM Studio).[/bold red]")
-        console.print("[white]➜ Automatically installing Ollama to resolve dependency...[/white]")
+        if not found_backends:
+            console.print("\n[bold red]No local LLM backends found (Ollama or LM Studio).[/bold red]")
+            console.print("[white]➜ Automatically installing Ollama to resolve dependency...[/white]")
         
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            "•",
-            TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-            transient=True
-        ) as progress:
-            task = progress.add_task("Installing Ollama...", total=100)
-            import subprocess
-            # We run it and manually update progress since it's a script
-            progress.update(task, completed=10, description="Downloading installer...")
-            subprocess.run("curl -fsSL https://ollama.com/install.sh -o /tmp/ollama_install.sh", shell=True, capture_output=True)
-            progress.update(task, completed=30, description="Running install script...")
-            subprocess.run("sh /tmp/ollama_install.sh", shell=True, capture_output=True)
-            progress.update(task, completed=100, description="Verification complete")
+            with Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                BarColumn(),
+                "•",
+                TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+                transient=True
+            ) as progress:
+                task = progress.add_task("Installing Ollama...", total=100)
+                import subprocess
+                # We run it and manually update progress since it's a script
+                progress.update(task, completed=10, description="Downloading installer...")
+                subprocess.run("curl -fsSL https://ollama.com/install.sh -o /tmp/ollama_install.sh", shell=True, capture_output=True)
+                progress.update(task, completed=30, description="Running install script...")
+                subprocess.run("sh /tmp/ollama_install.sh", shell=True, capture_output=True)
+                progress.update(task, completed=100, description="Verification complete")
         
-        # Re-discover
-        found_backends = asyncio.run(disco.discover())
-        if not found_backends:
-            console.print("[red]Failed to initialize backend after installation.[/red]")
-            return
+            # Re-discover
+            found_backends = asyncio.run(disco.discover(use_cache=False))
+            if not found_backends:
+                console.print("[red]Failed to initialize backend after installation.[/red]")
+                return
 
-    online_backends = [b for b, running in found_backends if running]
-    if not online_backends and auto_start:
-        target_b, _ = found_backends[0]
-        l = launcher.BackendLauncher()
-        console.print(f"[white]➜ Backend '{target_b.name}' is installed but offline. Attempting to start...[/white]")
-        if l.launch(target_b.name):
-            if l.wait_for_backend(target_b.name):
-                # Refresh
-                res = asyncio.run(disco.discover())
-                online_backends = [b for b, r in res if r]
+        online_backends = [b for b, running in found_backends if running]
+        if not online_backends and auto_start:
+            target_b, _ = found_backends[0]
+            l = launcher.BackendLauncher()
+            console.print(f"[white]➜ Backend '{target_b.name}' is installed but offline. Attempting to start...[/white]")
+            if l.launch(target_b.name):
+                if l.wait_for_backend(target_b.name):
+                    # Refresh
+                    res = asyncio.run(disco.discover(use_cache=False))
+                    online_backends = [b for b, r in res if r]
+                else:
+                    console.print(f"[red]Failed to start {target_b.name}.[/red]")
+                    return
             else:
-                console.print(f"[red]Failed to start {target_b.name}.[/red]")
+                console.print(f"[red]Could not start {target_b.name}. Please start it manually.[/red]")
                 return
-        else:
-            console.print(f"[red]Could not start {target_b.name}. Please start it manually.[/red]")
+        elif not online_backends:
+            discovery.print_backend_status(found_backends)
+            console.print("\n[yellow]No backends are running. Run with --start to auto-launch.[/yellow]")
             return
-    elif not online_backends:
-        discovery.print_backend_status()
-        console.print("\n[yellow]No backends are running. Run with --start to auto-launch.[/yellow]")
-        return
-    else: discovery.print_backend_status()
-    selected_backend = online_backends[0]; models_to_test, reasoning_list = [], []
-    rec_eng = recommender.Recommender(system_info, intent=user_intent)
-    if top:
-        recs = rec_eng.select_top_10(); available_ids = selected_backend.discovered_models
-        rec_ids = [m["id"] for m in recs]; ready = [m for m in recs if m["id"] in available_ids]
-        models_to_test = [m["id"] for m in ready]; reasoning_list = [m.get("reason", "Top tier.") for m in ready]
-        if selected_backend.name == "Ollama":
-            to_pull = [m for m in recs if m["id"] not in available_ids]
-            for m in to_pull:
-                if len(models_to_test) >= top: break
-                if asyncio.run(_pull_logic(m['id'])): models_to_test.append(m['id']); reasoning_list.append(m.get("reason"))
-        if len(models_to_test) < top:
-            for m_id in [i for i in available_ids if i not in models_to_test][:top-len(models_to_test)]:
-                models_to_test.append(m_id); reasoning_list.append("Fallback model.")
-    elif all_models:
-        models_to_test = selected_backend.discovered_models; reasoning_list = ["Full suite." for _ in models_to_test]
-    elif model:
-        models_to_test = model; reasoning_list = ["User choice." for _ in models_to_test]
-    else:
-        recs = rec_eng.select_top_10(); available_ids = selected_backend.discovered_models
-        match = next((m for m in recs if m["id"] in available_ids), None)
-        if match: models_to_test = [match["id"]]; reasoning_list = [match.get("reason")]
-        else: models_to_test = available_ids[:3]; reasoning_list = ["Fallback." for _ in models_to_test]
+        else: discovery.print_backend_status(found_backends)
+        selected_backend = online_backends[0]; models_to_test, reasoning_list = [], []; provisioner = None
+        from .core.catalog import ModelCatalog, OFFLOAD_MATRIX
+        catalog = asyncio.run(ModelCatalog(selected_backend, cfg.context_length).refresh()) if selected_backend.is_local else None
+        rec_eng = recommender.Recommender(system_info, intent=user_intent, catalog=catalog)
+        if top:
+            recs = rec_eng.select_top_10(); available_ids = selected_backend.discovered_models
+            rec_ids = [m["id"] for m in recs]; ready = [m for m in recs if m["id"] in available_ids]
+            models_to_test = [m["id"] for m in ready]; reasoning_list = [m.get("reason", "Top tier.") for m in ready]
+            if selected_backend.name == "Ollama":
+                # Missing models download in the background while the ones already present are benchmarked
+                from .core.provisioning import Provisioner
+                to_pull = [m for m in recs if m["id"] not in available_ids][:max(0, top - len(models_to_test))]
+                bandwidth = pull_bandwidth if pull_bandwidth is not None else cfg.pull_bandwidth_mbps
+                provisioner = Provisioner(selected_backend, [m["id"] for m in to_pull], {m["id"]: m["vram_gb"] for m in to_pull}, bandwidth)
+                for m_id in provisioner.check_disk(): console.print(f"[yellow]Not enough disk space to pull {m_id}; skipping it.[/yellow]")
+                planned = set(provisioner.to_pull)
+                for m in to_pull:
+                    if m["id"] in planned: models_to_test.append(m["id"]); reasoning_list.append(m.get("reason"))
+            if len(models_to_test) < top:
+                for m_id in [i for i in available_ids if i not in models_to_test][:top-len(models_to_test)]:
+                    models_to_test.append(m_id); reasoning_list.append("Fallback model.")
+        elif all_models:
+            models_to_test = selected_backend.discovered_models; reasoning_list = ["Full suite." for _ in models_to_test]
+        elif model:
+            models_to_test = model; reasoning_list = ["User choice." for _ in models_to_test]
+        elif embed or vision:
+            from .core.registry import ModelRegistry
+            matches = ModelRegistry.is_embedding if embed else ModelRegistry.is_vision
+            models_to_test = [m for m in selected_backend.discovered_models if matches(m)][:3]
+            reasoning_list = ["Embedding model." if embed else "Vision model." for _ in models_to_test]
+            if not models_to_test:
+                console.print(f"[yellow]No {'embedding' if embed else 'vision'} models found. Try 'lmbench pull {'nomic-embed-text' if embed else 'llava:7b'}'.[/yellow]"); return
+        else:
+            recs = rec_eng.select_top_10(); available_ids = selected_backend.discovered_models
+            match = next((m for m in recs if m["id"] in available_ids), None)
+            if match: models_to_test = [match["id"]]; reasoning_list = [match.get("reason")]
+            else: models_to_test = available_ids[:3]; reasoning_list = ["Fallback." for _ in models_to_test]
     
-    # Define Tests
-    tests = []
-    if final_deep:
-        tests = [engine.BenchmarkSuite.get_burst_test(), engine.BenchmarkSuite.get_context_test(), engine.BenchmarkSuite.get_code_test(), engine.BenchmarkSuite.get_logic_test()]
-    elif suite:
-        tests = [engine.BenchmarkSuite.get_burst_test(), engine.BenchmarkSuite.get_logic_test()]
+        # Define Tests
+        if embed: tests = engine.BenchmarkSuite.get_embedding_tests()
+        elif vision: tests = engine.BenchmarkSuite.get_vision_tests()
+        else: tests = _build_tests(final_deep, suite, prompt or cfg.default_prompt)
+        if user_intent and user_intent.upper().startswith("A") and not (embed or vision):
+            # Agents depend on tool calls and JSON output: time the tool loop and price constrained decoding
+            tests += [engine.BenchmarkSuite.get_agent_test()] + engine.BenchmarkSuite.get_structured_tests()
+
+        matrix_opts = [None]
+        if final_matrix and selected_backend.name == "Ollama":
+            # GPU layer counts from each model's metadata; the fixed matrix for models the catalog does not know
+            gpu_vram = 0.0 if rec_eng.is_cpu_only else rec_eng.vram
+            matrix_opts = (lambda m: catalog.offload_options(m, gpu_vram)) if catalog else OFFLOAD_MATRIX
+        if record:
+            from .backends.replay import RecordingBackend
+            selected_backend = RecordingBackend(selected_backend, record)
+        reverter = None
+        clean_state_vms = list(revert_vm or []) or cfg.clean_state_vms
+        if clean_state_vms:
+            from .core.esxi import CleanStateReverter
+            reverter = CleanStateReverter(clean_state_vms, cfg.esxi_user)
+        from .core.events import EventBus, NDJSONSink
+        bus = EventBus(); exporter = None
+        final_metrics_port = metrics_port if metrics_port is not None else cfg.metrics_port
+        if final_metrics_port:
+            from .core.metrics import MetricsExporter
+            exporter = bus.subscribe(MetricsExporter(cfg.metrics_host, final_metrics_port).start())
+            console.print(f"[dim]Metrics at http://{cfg.metrics_host}:{final_metrics_port}/metrics[/dim]")
+        if trace:
+            from .core.tracing import TraceSink
+            bus.subscribe(TraceSink(trace))
+        if events: bus.subscribe(NDJSONSink(stream=event_stream, path=events_file))
+        hooks = [h for h in (provisioner.wait if provisioner else None, reverter) if h]
+        async def before_model(m: str):
+            for hook in hooks:
+                if await hook(m) is False: return False
+        async def _suite():
+            if provisioner: provisioner.start()
+            try:
+                return await engine.execute_suite(selected_backend, models_to_test, tests, matrix_opts, final_rounds, reasoning_list, before_model=before_model if hooks else None, bus=bus)
+            finally:
+                if provisioner: await provisioner.close()
+        try:
+            results = asyncio.run(_suite())
+        finally:
+            bus.close()
+            if record: selected_backend.close(); console.print(f"[dim]Trace recorded to {record}[/dim]")
+            if trace: console.print(f"[dim]Perfetto traces written to {trace}/ (open at https://ui.perfetto.dev)[/dim]")
+            if reverter: reverter.close()
+            if exporter: exporter.stop()
+        reporter = Reporter(system_info); reporter.display_results(results); reporter.save_reports(results, selected_backend.name)
+
+@app.command(name="eval")
+def evaluate(
+    dataset: str = typer.Argument(..., help="JSONL file: one {\"prompt\", \"expected\" | \"regex\"} object per line"),
+    model: Optional[List[str]] = typer.Option(None, "--model", "-m", help="Models (or quantization tags) to compare; default: first available"),
+    concurrency: int = typer.Option(4, "--concurrency", "-c", help="Requests in flight per model"),
+    matrix: bool = typer.Option(False, "--matrix", "-x", help="Also sweep GPU offload (Ollama)"),
+    min_accuracy: float = typer.Option(0.8, "--min-accuracy", help="Accuracy a model needs to be recommended (0-1)"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Ignore and do not update the answer cache"),
+    endpoint: Optional[List[str]] = typer.Option(None, "--endpoint", "-e", help="Extra backend to probe (see 'run --endpoint')"),
+):
+    """Score models on a JSONL dataset and compare accuracy against speed."""
+    from .backends import discovery
+    from .core import config
+    from .core.evaluation import AnswerCache, Evaluator
+    from .core.reporter import Reporter
+    from .system import probe
+    cfg = config.ConfigManager().load()
+    found = asyncio.run(discovery.BackendDiscovery(endpoints=cfg.endpoints + list(endpoint or [])).discover())
+    online = [b for b, running in found if running]
+    if not online:
+        console.print("[red]No running backend found.[/red]"); raise typer.Exit(1)
+    backend = online[0]
+    models = list(model or backend.discovered_models[:1])
+    if not models:
+        console.print(f"[red]{backend.name} has no models.[/red]"); raise typer.Exit(1)
+    matrix_opts = lambda m: [None]
+    if matrix and backend.name == "Ollama":
+        from .core.catalog import ModelCatalog, OFFLOAD_MATRIX
+        from .core.recommender import Recommender
+        rec = Recommender(probe.get_system_info())
+        catalog = asyncio.run(ModelCatalog(backend, cfg.context_length).refresh()) if backend.is_local else None
+        matrix_opts = (lambda m: catalog.offload_options(m, 0.0 if rec.is_cpu_only else rec.vram)) if catalog else (lambda m: OFFLOAD_MATRIX)
+    cache = None if no_cache else AnswerCache()
+    evaluator = Evaluator(backend, concurrency, cache)
+    async def _run():
+        summaries = []
+        for m in models:
+            for option in matrix_opts(m):
+                summaries.append(await evaluator.evaluate(m, dataset, option))
+            await backend.unload_all()
+        return summaries
+    try:
+        summaries = asyncio.run(_run())
+    finally:
+        if cache: cache.close()
+    reporter = Reporter(probe.get_system_info())
+    reporter.display_eval_results(summaries, min_accuracy); reporter.save_eval_report(summaries, backend.name, min_accuracy)
+
+@app.command()
+def conversation(
+    model: Optional[List[str]] = typer.Option(None, "--model", "-m", help="Models to test on every backend that has them (default: each backend's first model)"),
+    turns: int = typer.Option(8, "--turns", "-n", help="Turns per session"),
+    reply_tokens: int = typer.Option(128, "--reply-tokens", help="Tokens generated per reply"),
+    context_words: int = typer.Option(1000, "--context-words", help="Size of the document in the system prompt"),
+    endpoint: Optional[List[str]] = typer.Option(None, "--endpoint", "-e", help="Extra backend to probe (see 'run --endpoint')"),
+    mock: bool = typer.Option(False, "--mock", help="Use the synthetic mock backend (for testing)"),
+):
+    """Multi-turn chat benchmark: TTFT per turn with and without prefix (KV cache) reuse, on every running backend."""
+    from .core import config
+    from .core.conversation import ConversationBenchmark
+    from .core.reporter import Reporter
+    from .system import probe
+    if mock:
+        from .backends.mock import MockBackend
+        online = [MockBackend()]
+    else:
+        from .backends import discovery
+        cfg = config.ConfigManager().load()
+        found = asyncio.run(discovery.BackendDiscovery(endpoints=cfg.endpoints + list(endpoint or [])).discover())
+        online = [b for b, running in found if running]
+    if not online:
+        console.print("[red]No running backend found.[/red]"); raise typer.Exit(1)
+    async def _run():
+        runs = []
+        for backend in online:
+            models = [m for m in model if m in backend.discovered_models] if model else backend.discovered_models[:1]
+            if not models:
+                console.print(f"[dim]Skipping {backend.name}: none of the requested models are available.[/dim]"); continue
+            bench = ConversationBenchmark(backend, turns, reply_tokens, context_words)
+            for m in models:
+                try:
+                    runs.append(await bench.run(m))
+                except Exception as e:
+                    console.print(f"[red]{backend.name} / {m}: {e}[/red]")
+            await backend.unload_all()
+        return runs
+    runs = asyncio.run(_run())
+    if not runs: raise typer.Exit(1)
+    reporter = Reporter(probe.get_system_info()); reporter.display_conversation_results(runs); reporter.save_conversation_report(runs)
+
+@app.command()
+def quant(
+    base: str = typer.Argument(..., help="Model without its quantization suffix, e.g. llama3.1:8b-instruct"),
+    quants: Optional[List[str]] = typer.Option(None, "--quant", "-q", help="Quantizations to test, e.g. q4_K_M (default: every local variant)"),
+    pull_missing: bool = typer.Option(False, "--pull", "-p", help="Pull missing variants from Ollama (default ladder: q4_K_M, q5_K_M, q8_0, fp16)"),
+    rounds: int = typer.Option(2, "--rounds", "-r", help="Speed rounds per variant"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Ignore and do not update the answer cache"),
+    endpoint: Optional[List[str]] = typer.Option(None, "--endpoint", "-e", help="Extra backend to probe (see 'run --endpoint')"),
+    mock: bool = typer.Option(False, "--mock", help="Use the synthetic mock backend (for testing)"),
+):
+    """Compare quantizations of one model: speed, memory and quick-eval accuracy, with a pick for your VRAM."""
+    from .core import config, quantization
+    from .core.evaluation import AnswerCache
+    from .core.recommender import Recommender
+    from .core.reporter import Reporter
+    from .system import probe
+    if mock:
+        from .backends.mock import MockBackend
+        online = [MockBackend(models=[f"{base}-{q}" for q in quants or quantization.STANDARD_LADDER])]
     else:
-        p = prompt or cfg.default_prompt
-        tests = [{"name": "Default", "type": "performance", "prompt": p}]
+        from .backends import discovery
+        cfg = config.ConfigManager().load()
+        found = asyncio.run(discovery.BackendDiscovery(endpoints=cfg.endpoints + list(endpoint or [])).discover())
+        online = [b for b, running in found if running]
+    if not online:
+        console.print("[red]No running backend found.[/red]"); raise typer.Exit(1)
+    if pull_missing:
+        ollama = next((b for b in online if b.name == "Ollama"), None)
+        if ollama is None:
+            console.print("[red]--pull needs a running Ollama.[/red]"); raise typer.Exit(1)
+        have = {(quantization.quant_of(m) or "").lower() for m in quantization.find_variants(base, ollama.discovered_models)}
+        for q in quants or quantization.STANDARD_LADDER:
+            if q.lower() not in have: asyncio.run(_pull_logic(f"{base}-{q}"))
+        ollama.discovered_models = asyncio.run(ollama.get_models())
+    wanted = {q.lower() for q in quants or []}
+    # The backend holding the most variants of the base model
+    backend, variants = max(((b, [m for m in quantization.find_variants(base, b.discovered_models)
+                                  if not wanted or (quantization.quant_of(m) or "").lower() in wanted]) for b in online), key=lambda bv: len(bv[1]))
+    if not variants:
+        console.print(f"[red]No quantizations of {base} found. Try --pull.[/red]"); raise typer.Exit(1)
+    console.print(f"[bold white]Quantization ladder[/bold white] {backend.name}: {', '.join(variants)}")
+    system_info = probe.get_system_info()
+    cache = None if no_cache else AnswerCache()
+    try:
+        rows = asyncio.run(quantization.QuantizationSweep(backend, rounds, cache=cache).run(variants))
+    finally:
+        if cache: cache.close()
+    budget = Recommender(system_info).vram
+    reporter = Reporter(system_info); reporter.display_quant_results(base, rows, budget); reporter.save_quant_report(base, rows, budget, backend.name)
+
+@app.command()
+def coresidency(
+    model: Optional[List[str]] = typer.Option(None, "--model", "-m", help="Models to load together (default: the backend's first three)"),
+    max_group: int = typer.Option(3, "--max-group", "-g", help="Largest combination to test"),
+    requests: int = typer.Option(4, "--requests", "-n", help="Requests per model and traffic pattern"),
+    tokens: int = typer.Option(128, "--tokens", help="Tokens generated per request"),
+    endpoint: Optional[List[str]] = typer.Option(None, "--endpoint", "-e", help="Extra backend to probe (see 'run --endpoint')"),
+    mock: bool = typer.Option(False, "--mock", help="Use the synthetic mock backend (for testing)"),
+):
+    """Load several models at once: contention slowdown, eviction/reload churn, and which combinations fit together."""
+    from .core import config
+    from .core.coresidency import CoResidencyBenchmark
+    from .core.recommender import Recommender
+    from .core.reporter import Reporter
+    from .system import probe
+    if mock:
+        from .backends.mock import MockBackend
+        backend = MockBackend(models=["mock:a", "mock:b", "mock:c"])
+    else:
+        from .backends import discovery
+        cfg = config.ConfigManager().load()
+        found = asyncio.run(discovery.BackendDiscovery(endpoints=cfg.endpoints + list(endpoint or [])).discover())
+        backend = next((b for b, running in found if running), None)
+        if backend is None:
+            console.print("[red]No running backend found.[/red]"); raise typer.Exit(1)
+    models = list(model or backend.discovered_models[:3])
+    missing = [m for m in models if m not in backend.discovered_models]
+    if missing:
+        console.print(f"[red]{backend.name} does not have {', '.join(missing)}.[/red]"); raise typer.Exit(1)
+    if len(models) < 2:
+        console.print("[red]Co-residency needs at least two models.[/red]"); raise typer.Exit(1)
+    result = asyncio.run(CoResidencyBenchmark(backend, requests, tokens).run(models, max_group))
+    system_info = probe.get_system_info(); vram = Recommender(system_info).vram
+    reporter = Reporter(system_info); reporter.display_coresidency_results(result, vram); reporter.save_coresidency_report(result, vram)
+
+@app.command()
+def soak(
+    model: Optional[str] = typer.Option(None, "--model", "-m", help="Model to keep under load (default: first available)"),
+    duration: str = typer.Option("1h", "--duration", "-d", help="How long to run, e.g. 30m, 8h, 1h30m"),
+    interval: float = typer.Option(5.0, "--interval", help="Seconds between telemetry samples"),
+    tokens: int = typer.Option(256, "--tokens", help="Tokens generated per request"),
+    endpoint: Optional[List[str]] = typer.Option(None, "--endpoint", "-e", help="Extra backend to probe (see 'run --endpoint')"),
+    mock: bool = typer.Option(False, "--mock", help="Use the synthetic mock backend (for testing)"),
+):
+    """Endurance run: steady load for hours, with trend tests for throughput drift, thermal throttling and memory growth."""
+    from .core import config
+    from .core.reporter import Reporter
+    from .core.soak import SoakTest, parse_duration
+    from .system import probe
+    try:
+        duration_s = parse_duration(duration)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--duration")
+    if mock:
+        from .backends.mock import MockBackend
+        backend = MockBackend()
+    else:
+        from .backends import discovery
+        cfg = config.ConfigManager().load()
+        found = asyncio.run(discovery.BackendDiscovery(endpoints=cfg.endpoints + list(endpoint or [])).discover())
+        backend = next((b for b, running in found if running), None)
+        if backend is None:
+            console.print("[red]No running backend found.[/red]"); raise typer.Exit(1)
+    target = model or next(iter(backend.discovered_models), None)
+    if target is None or target not in backend.discovered_models:
+        console.print(f"[red]{backend.name} does not have {target or 'any models'}.[/red]"); raise typer.Exit(1)
+    test = SoakTest(backend, duration_s, interval, tokens)
+    try:
+        result = asyncio.run(test.run(target))
+    except KeyboardInterrupt:
+        # Python 3.11+ turns Ctrl+C into a cancellation that run() handles itself; 3.10 raises here instead
+        result = test.partial_result()
+        if result is None: raise typer.Exit(130)
+        console.print("[yellow]Interrupted; analyzing what was collected.[/yellow]")
+    reporter = Reporter(probe.get_system_info()); reporter.display_soak_results(result); reporter.save_soak_report(result)
+
+@app.command()
+def cpu(
+    model: Optional[str] = typer.Option(None, "--model", "-m", help="Model to sweep (default: first available)"),
+    threads: Optional[List[int]] = typer.Option(None, "--threads", "-t", help="Thread counts to test (default: 1, 2, 4, ... physical cores)"),
+    rounds: int = typer.Option(1, "--rounds", "-r", help="Rounds per thread count"),
+    tokens: int = typer.Option(128, "--tokens", help="Tokens generated per round"),
+    no_numa: bool = typer.Option(False, "--no-numa", help="Skip the pinned-to-one-NUMA-node comparison"),
+    endpoint: Optional[List[str]] = typer.Option(None, "--endpoint", "-e", help="Extra backend to probe (see 'run --endpoint')"),
+    mock: bool = typer.Option(False, "--mock", help="Use the synthetic mock backend (for testing)"),
+):
+    """CPU inference scaling: sweep num_thread (and NUMA placement), find the knee and save the best setting for this host."""
+    from .core import config
+    from .core.cpu_scaling import CpuScalingSweep, TuningStore
+    from .core.reporter import Reporter
+    from .system import probe
+    if mock:
+        from .backends.mock import MockBackend
+        backend = MockBackend()
+    else:
+        from .backends import discovery
+        cfg = config.ConfigManager().load()
+        found = asyncio.run(discovery.BackendDiscovery(endpoints=cfg.endpoints + list(endpoint or [])).discover())
+        # num_thread is an Ollama runtime option; LM Studio fixes the thread count at load time in its UI
+        backend = next((b for b, running in found if running and b.name == "Ollama"), None)
+        if backend is None:
+            console.print("[red]CPU scaling needs a running Ollama.[/red]"); raise typer.Exit(1)
+    target = model or next(iter(backend.discovered_models), None)
+    if target is None or target not in backend.discovered_models:
+        console.print(f"[red]{backend.name} does not have {target or 'any models'}.[/red]"); raise typer.Exit(1)
+    result = asyncio.run(CpuScalingSweep(backend, rounds, threads, not no_numa, tokens).run(target))
+    system_info = probe.get_system_info()
+    reporter = Reporter(system_info); reporter.display_cpu_scaling(result); reporter.save_cpu_scaling_report(result)
+    if result["best"]:
+        store = TuningStore(); store.put(system_info.get("fingerprint", "unknown"), target, result["best"])
+        console.print(f"[dim]Saved to {store.path}. Apply it with options {{\"num_thread\": {result['best']['num_thread']}}} or 'PARAMETER num_thread {result['best']['num_thread']}' in a Modelfile.[/dim]")
+
+@app.command()
+def replay(
+    trace: str = typer.Argument(..., help="Trace file written by 'lmbench run --record'"),
+    fast: bool = typer.Option(False, "--fast", "-f", help="Replay as fast as possible instead of with original timing"),
+    speed: float = typer.Option(1.0, "--speed", help="Timing multiplier when not using --fast"),
+):
+    """Replay a recorded trace through the benchmark engine."""
+    from .system import probe
+    from .core import engine
+    from .core.reporter import Reporter
+    from .backends.replay import ReplayBackend
+    backend = ReplayBackend(trace, speed=None if fast else speed)
+    models, tests, matrix_opts, rounds = backend.plan()
+    console.print(f"[dim]Trace from LMBench v{backend.header.get('lmbench')} ({len(backend.streams)} streams)[/dim]")
+    results = asyncio.run(engine.execute_suite(backend, models, tests, matrix_opts, rounds, ["Replayed trace." for _ in models]))
+    reporter = Reporter(probe.get_system_info()); reporter.display_results(results); reporter.save_reports(results, backend.name)
 
-    matrix_opts = [None]
-    if final_matrix and selected_backend.name == "Ollama": matrix_opts = [{"num_gpu": 0}, {"num_gpu": 50}, {"num_gpu": 99}]
-    results = asyncio.run(engine.execute_suite(selected_backend, models_to_test, tests, matrix_opts, final_rounds, reasoning_list))
-    reporter = Reporter(system_info); reporter.display_results(results); reporter.save_reports(results, selected_backend.name)
+@app.command()
+def agent(
+    host: str = typer.Option("127.0.0.1", "--host", help="Interface to listen on (anything but loopback requires --token)"),
+    port: int = typer.Option(8765, "--port"),
+    token: Optional[str] = typer.Option(None, "--token", envvar="LMBENCH_AGENT_TOKEN", help="Shared secret required from coordinators"),
+    mock: bool = typer.Option(False, "--mock", help="Serve the synthetic mock backend (for testing)"),
+):
+    """Expose this machine's benchmark engine to a fleet coordinator."""
+    from .core.fleet import AgentServer
+    if mock:
+        from .backends.mock import MockBackend
+        backend = MockBackend()
+    else:
+        from .backends import discovery
+        online = [b for b, running in discovery.run_discovery(use_cache=False) if running]
+        if not online:
+            console.print("[red]No running backend found. Start Ollama/LM Studio or use --mock.[/red]"); raise typer.Exit(1)
+        backend = online[0]
+    try:
+        server = AgentServer(backend, host, port, token)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]"); raise typer.Exit(1)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        console.print("\n[dim]Agent stopped.[/dim]")
+
+@app.command()
+def fleet(
+    agents: List[str] = typer.Argument(..., help="Agent addresses (host or host:port)"),
+    model: Optional[List[str]] = typer.Option(None, "--model", "-m", help="Models to run on every agent (default: each agent's first model)"),
+    suite: bool = typer.Option(False, "--suite", "-s"),
+    deep: bool = typer.Option(False, "--deep", "-d"),
+    rounds: Optional[int] = typer.Option(None, "--rounds", "-r"),
+    prompt: Optional[str] = typer.Option(None, "--prompt", "-p"),
+    token: Optional[str] = typer.Option(None, "--token", envvar="LMBENCH_AGENT_TOKEN"),
+):
+    """Run a suite on many agents in parallel and build one cross-host report."""
+    from .core import config
+    from .core.fleet import Coordinator
+    from .core.reporter import Reporter
+    from .system import probe
+    cfg = config.ConfigManager().load()
+    tests = _build_tests(deep, suite, prompt or cfg.default_prompt)
+    hosts = asyncio.run(Coordinator(agents, token).run(tests, model, None, rounds if rounds is not None else cfg.rounds))
+    reporter = Reporter(probe.get_system_info()); reporter.display_fleet_results(hosts); reporter.save_fleet_report(hosts)
 
 @app.command()
 def version():
     from . import __version__
-    console.print(f"LMBench v{__version__}")
+    typer.echo(f"LMBench v{__version__}")
 
 if __name__ == "__main__":
     app()
@@ -0,0 +1,103 @@
+import json
+import re
+import time
+from typing import Callable, Dict, List, Optional
+from ..backends.base import BaseBackend
+from ..backends.decoding import ToolCallAccumulator
+
+AGENT_TASK = ("Plan a day trip for me. Check the weather in Lisbon on 2025-06-01, find the cheapest flight from Berlin to Lisbon "
+              "on that date, and convert its price to USD. Use the tools for every fact, then give a two-sentence summary.")
+AGENT_SYSTEM = "You are a travel agent. Call the provided tools to look things up; never invent data."
+
+def _tool(name: str, description: str, **params: str) -> Dict:
+    return {"type": "function", "function": {"name": name, "description": description, "parameters": {
+        "type": "object", "properties": {p: {"type": "string", "description": d} for p, d in params.items()}, "required": list(params)}}}
+
+AGENT_TOOLS = [
+    _tool("get_weather", "Weather forecast for a city on a date.", city="City name", date="ISO date"),
+    _tool("search_flights", "Cheapest flight between two cities on a date.", origin="Departure city", destination="Arrival city", date="ISO date"),
+    _tool("convert_currency", "Convert an amount between currencies.", amount="Amount as a number", source="ISO currency code", target="ISO currency code"),
+]
+
+# Stub tools: instant, deterministic answers so only model latency is measured
+STUB_TOOLS: Dict[str, Callable[[Dict], Dict]] = {
+    "get_weather": lambda a: {"city": a.get("city"), "date": a.get("date"), "forecast": "sunny", "high_c": 24, "low_c": 16},
+    "search_flights": lambda a: {"origin": a.get("origin"), "destination": a.get("destination"), "date": a.get("date"),
+                                 "flight": "TP 551", "departs": "07:15", "price": 129.0, "currency": "EUR"},
+    "convert_currency": lambda a: {"amount": a.get("amount"), "source": a.get("source"), "target": a.get("target"), "rate": 1.08,
+                                   "result": round(float(re.sub(r"[^\d.]", "", str(a.get("amount"))) or 0) * 1.08, 2)},
+}
+_JSON_CALL = re.compile(r'\{\s*"(name|function|tool)"\s*:', re.S)
+
+def validate_call(call: Dict) -> Optional[str]:
+    """Reason a tool call is malformed, or None when it names a known tool with object arguments and all required fields."""
+    spec = next((t["function"] for t in AGENT_TOOLS if t["function"]["name"] == call["name"]), None)
+    if spec is None: return f"unknown tool '{call['name']}'"
+    if not isinstance(call["arguments"], dict): return "arguments are not a JSON object"
+    missing = [p for p in spec["parameters"]["required"] if p not in call["arguments"]]
+    return f"missing arguments: {', '.join(missing)}" if missing else None
+
+class AgentLoop:
+    """
+    A scripted tool-calling session: the model calls tools, stub tools answer, the model continues until it
+    answers in plain text (or `max_steps`). Each step is one model turn plus the tool work it triggered.
+    """
+    def __init__(self, backend: BaseBackend, max_steps: int = 8):
+        self.backend = backend
+        self.max_steps = max_steps
+
+    async def run(self, model: str, options: Optional[Dict] = None, on_step: Optional[Callable[[Dict], None]] = None) -> Dict:
+        messages = [{"role": "system", "content": AGENT_SYSTEM}, {"role": "user", "content": AGENT_TASK}]
+        request_options = {**(options or {}), "tools": AGENT_TOOLS}
+        steps, used, answer = [], set(), None
+        start = time.perf_counter()
+        for n in range(1, self.max_steps + 1):
+            step_start = time.perf_counter(); first = None; parts = []; tokens = 0; payload = None
+            calls = ToolCallAccumulator()
+            async for event in self.backend.chat_events(model, messages, request_options):
+                if (event.text or event.tool_calls) and first is None: first = time.perf_counter()
+                if event.text: parts.append(event.text); tokens += 1
+                if event.tool_calls: calls.add(event.tool_calls)
+                if event.done: payload = event.payload; break
+            model_end = time.perf_counter()
+            text, tool_calls = "".join(parts), calls.calls()
+            tokens = (payload or {}).get("eval_count") or tokens
+            step = {"step": n, "ttft_ms": ((first or model_end) - step_start) * 1000, "model_ms": (model_end - step_start) * 1000,
+                    "tokens": tokens, "tool_calls": len(tool_calls), "malformed": 0, "errors": []}
+            if not tool_calls:
+                if _JSON_CALL.search(text):
+                    # A call written into the message text instead of the tool-call channel
+                    step["malformed"] = 1; step["tool_calls"] = 1; step["errors"].append("tool call emitted as text")
+                    messages += [{"role": "assistant", "content": text},
+                                 {"role": "user", "content": "That was not a tool call. Use the provided tools."}]
+                else:
+                    answer = text
+                step["step_ms"] = (time.perf_counter() - step_start) * 1000; steps.append(step)
+                if on_step: on_step(step)
+                if answer is not None: break
+                continue
+            results = []
+            for call in tool_calls:
+                error = validate_call(call)
+                if error:
+                    step["malformed"] += 1; step["errors"].append(error)
+                    results.append(json.dumps({"error": error}))
+                else:
+                    used.add(call["name"]); results.append(json.dumps(STUB_TOOLS[call["name"]](call["arguments"])))
+            messages += self.backend.tool_messages(tool_calls, results)
+            step["step_ms"] = (time.perf_counter() - step_start) * 1000; steps.append(step)
+            if on_step: on_step(step)
+        total_calls = sum(s["tool_calls"] for s in steps)
+        follow_ups = [s["ttft_ms"] for s in steps[1:]]
+        return {
+            "steps": steps, "total_ms": (time.perf_counter() - start) * 1000,
+            "completed": answer is not None and used == set(STUB_TOOLS),
+            "answer": answer or "", "tools_used": sorted(used),
+            "tool_calls": total_calls, "malformed": sum(s["malformed"] for s in steps),
+            "malformed_rate": sum(s["malformed"] for s in steps) / total_calls if total_calls else 0.0,
+            "step_ms": sum(s["step_ms"] for s in steps) / len(steps) if steps else 0.0,
+            "first_ttft_ms": steps[0]["ttft_ms"] if steps else 0.0,
+            "followup_ttft_ms": sum(follow_ups) / len(follow_ups) if follow_ups else 0.0,
+            "tokens": sum(s["tokens"] for s in steps),
+            "model_s": sum(s["model_ms"] for s in steps) / 1000,
+        }
@@ -0,0 +1,96 @@
+import asyncio
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+from ..backends.base import BaseBackend
+
+CATALOG_PATH = Path.home() / ".lmbench" / "catalog.json"
+RUNTIME_OVERHEAD_GB = 0.5  # CUDA/Metal context and compute buffers, on top of weights and KV cache
+OFFLOAD_MATRIX = [{"num_gpu": 0}, {"num_gpu": 50}, {"num_gpu": 99}]  # fallback when a model's layer count is unknown
+
+def tier_of(parameters: Optional[int]) -> str:
+    if not parameters: return "Unknown"
+    return "Edge" if parameters < 5e9 else "Mid" if parameters < 20e9 else "Large"
+
+class ModelCatalog:
+    """
+    Facts about the installed models, read from the backend's own metadata (Ollama /api/show, LM Studio
+    /api/v0/models) instead of guessed from tags. Entries are cached in ~/.lmbench/catalog.json keyed by model
+    digest, so a tag that is pulled again with new weights is re-read and an unchanged one never is.
+    """
+    def __init__(self, backend: Optional[BaseBackend], context: int = 2048, path: Optional[Path] = CATALOG_PATH):
+        self.backend = backend
+        self.context = context
+        self.path = path
+        try:
+            with open(path) as f: self.entries: Dict[str, Dict] = json.load(f)
+        except (OSError, TypeError, ValueError):
+            self.entries = {}
+        self.digests: Dict[str, str] = {}  # installed name -> digest, filled by refresh()
+
+    @classmethod
+    def from_files(cls, inventory: List[Dict], context: int = 2048) -> "ModelCatalog":
+        """A catalog of the models found on disk by system/gguf.py; needs no backend and no cache."""
+        catalog = cls(None, context, path=None)
+        catalog.entries = {m["path"]: m for m in inventory}
+        catalog.digests = {m["name"]: m["path"] for m in inventory}
+        return catalog
+
+    async def refresh(self) -> "ModelCatalog":
+        files = await self.backend.list_model_files()
+        new = [f for f in files if f["digest"] and f["digest"] not in self.entries]
+        facts = await asyncio.gather(*(self.backend.show_model(f["name"]) for f in new))
+        for f, fact in zip(new, facts):
+            if fact is not None: self.entries[f["digest"]] = {**fact, "size": f["size"]}  # failures are retried next time
+        self.digests = {f["name"]: f["digest"] for f in files if f["digest"] in self.entries}
+        if any(f["digest"] in self.entries for f in new):
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "w") as f: json.dump(self.entries, f, indent=2)
+        return self
+
+    def installed(self) -> List[str]:
+        return list(self.digests)
+
+    def get(self, model: str) -> Optional[Dict]:
+        """Facts for an installed model; an untagged name also matches its `:latest` tag."""
+        digest = self.digests.get(model) or self.digests.get(f"{model}:latest")
+        return self.entries.get(digest) if digest else None
+
+    def weights_gb(self, model: str) -> Optional[float]:
+        facts = self.get(model)
+        if not facts: return None
+        if facts.get("size"): return facts["size"] / 1024**3
+        from .quantization import BITS_PER_WEIGHT  # pulls in the engine; only needed without a file size
+        bits = BITS_PER_WEIGHT.get((facts.get("quantization") or "").lower())
+        return facts["parameters"] * bits / 8 / 1024**3 if facts.get("parameters") and bits else None
+
+    def kv_cache_gb(self, model: str, context: Optional[int] = None) -> Optional[float]:
+        """f16 K and V for every layer: 2 x layers x context x (embedding x kv_heads / heads) x 2 bytes."""
+        facts = self.get(model) or {}
+        layers, width, heads, kv_heads = (facts.get(k) for k in ("layers", "embedding_length", "head_count", "head_count_kv"))
+        if not (layers and width and heads): return None
+        context = min(context or self.context, facts.get("context_length") or context or self.context)
+        return 2 * layers * context * width * (kv_heads or heads) / heads * 2 / 1024**3
+
+    def estimate_gb(self, model: str, context: Optional[int] = None) -> Optional[float]:
+        """Memory to run fully on the GPU: weights + KV cache (10% of the weights if the shape is unknown) + runtime buffers."""
+        weights = self.weights_gb(model)
+        if weights is None: return None
+        kv = self.kv_cache_gb(model, context)
+        return weights + (kv if kv is not None else weights * 0.1) + RUNTIME_OVERHEAD_GB
+
+    def gpu_layer_options(self, model: str, vram_gb: float, context: Optional[int] = None) -> Optional[List[Dict]]:
+        """
+        `num_gpu` settings to compare: CPU only, half of the layers that fit, and every layer that fits (all of them,
+        output layer included, when the model fits). Counts past the fit are left out, since they would only OOM or
+        spill. None when the layer count or size is unknown.
+        """
+        facts, weights = self.get(model), self.weights_gb(model)
+        if not facts or not facts.get("layers") or weights is None: return None
+        offloadable = facts["layers"] + 1  # llama.cpp offloads the output layer as one more
+        kv = self.kv_cache_gb(model, context) or weights * 0.1
+        fit = max(0, min(offloadable, int((vram_gb - RUNTIME_OVERHEAD_GB) / ((weights + kv) / offloadable))))
+        return [{"num_gpu": n} for n in sorted({0, fit // 2, fit})]
+
+    def offload_options(self, model: str, vram_gb: float, context: Optional[int] = None) -> List[Dict]:
+        return self.gpu_layer_options(model, vram_gb, context) or OFFLOAD_MATRIX
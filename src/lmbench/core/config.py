@@ -12,6 +12,19 @@ class BenchmarkConfig(BaseModel):
     gpu_offload: Optional[int] = None
     default_prompt: str = "Write a 200-word essay about the future of local AI."
     models_to_pull: List[str] = Field(default_factory=list)
+    # Backend discovery: every host is probed on the default Ollama/LM Studio ports,
+    # endpoints are explicit "ollama=http://10.0.0.5:11434" (or bare URL) entries
+    discovery_hosts: List[str] = Field(default_factory=lambda: ["localhost"])
+    endpoints: List[str] = Field(default_factory=list)
+    discovery_ttl: int = 30
+    # Clean-state mode: "esxi-host[:ssh-port]/vm-name[=http://guest:11434]" entries reverted before each model
+    clean_state_vms: List[str] = Field(default_factory=list)
+    esxi_user: str = "root"
+    # Optional OpenMetrics endpoint (http://metrics_host:metrics_port/metrics) while benchmarks run
+    metrics_port: Optional[int] = None
+    metrics_host: str = "127.0.0.1"
+    # Cap (MB/s) for models pulled in the background while `run --top` benchmarks; None = unlimited
+    pull_bandwidth_mbps: Optional[float] = None
 
 class ConfigManager:
     def __init__(self):
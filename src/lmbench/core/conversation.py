@@ -0,0 +1,87 @@
+import time
+import uuid
+from typing import Dict, List
+from rich.console import Console
+from ..backends.base import BaseBackend
+
+# A coherent support-style session so each turn builds on the history
+USER_TURNS = [
+    "Summarize the key points of the document above in five bullet points.",
+    "Which of those points would matter most to a new employee, and why?",
+    "Rewrite your previous answer for a non-technical audience.",
+    "List three follow-up questions a reader might ask after reading it.",
+    "Answer the second of those questions in detail.",
+    "What assumptions does the document make that might not hold?",
+    "Propose a short title and a one-sentence abstract for the document.",
+    "Draft an email that shares the document with a team, referencing our discussion so far.",
+]
+
+def _context_document(words: int) -> str:
+    sentence = ("The operations handbook describes how incidents are triaged, who is paged at each severity level, "
+                "how status updates are communicated, and how post-incident reviews feed back into planning. ")
+    per = len(sentence.split())
+    return (sentence * (words // per + 1)).strip()
+
+def _fit(xs: List[float], ys: List[float]) -> float:
+    """Least-squares slope of ys over xs (0.0 when undefined)."""
+    n = len(xs)
+    if n < 2: return 0.0
+    mx, my = sum(xs) / n, sum(ys) / n
+    var = sum((x - mx) ** 2 for x in xs)
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / var if var else 0.0
+
+class ConversationBenchmark:
+    """
+    Replays an N-turn chat with growing history twice:
+      warm - the history is resent verbatim, so the backend may reuse its KV cache for the shared prefix
+      cold - the same history behind a fresh nonce in the system prompt, so every turn prefills from scratch
+    Comparing per-turn TTFT shows how much history re-prefill the backend avoids.
+    """
+    def __init__(self, backend: BaseBackend, turns: int = 8, reply_tokens: int = 128, context_words: int = 1000):
+        self.backend = backend
+        self.turns = max(1, turns)
+        self.options = {"num_predict": reply_tokens, "temperature": 0}
+        self.system = "You are a helpful assistant. Refer to this document when answering:\n\n" + _context_document(context_words)
+        self.console = Console()
+
+    async def _turn(self, model: str, messages: List[Dict]) -> Dict:
+        start = time.perf_counter(); first = None; parts = []; payload = None
+        async for event in self.backend.chat_events(model, messages, self.options):
+            if event.text:
+                if first is None: first = time.perf_counter()
+                parts.append(event.text)
+            if event.done: payload = event.payload; break
+        end = time.perf_counter()
+        return {"ttft_ms": ((first or end) - start) * 1000, "reply": "".join(parts),
+                "prompt_eval_count": (payload or {}).get("prompt_eval_count")}
+
+    async def run(self, model: str) -> Dict:
+        self.console.print(f"[bold white]Conversation[/bold white] {self.backend.name} / {model} [dim]({self.turns} turns)[/dim]")
+        await self.backend.unload_all()
+        await self.backend.load_model(model, self.options)
+        history: List[Dict] = [{"role": "system", "content": self.system}]
+        rows = []
+        for i in range(self.turns):
+            history.append({"role": "user", "content": USER_TURNS[i % len(USER_TURNS)]})
+            warm = await self._turn(model, history)
+            history.append({"role": "assistant", "content": warm["reply"]})
+            rows.append({"turn": i + 1, "history_chars": sum(len(m["content"]) for m in history[:-1]),
+                         "warm_ttft_ms": warm["ttft_ms"], "warm_prompt_eval": warm["prompt_eval_count"]})
+        # Cold pass: identical histories (including the warm replies), but a unique prefix defeats prefix caching
+        for i, row in enumerate(rows):
+            messages = [{"role": "system", "content": f"[session {uuid.uuid4().hex}]\n{self.system}"}] + history[1:2 * i + 2]
+            cold = await self._turn(model, messages)
+            row["cold_ttft_ms"], row["cold_prompt_eval"] = cold["ttft_ms"], cold["prompt_eval_count"]
+            row["saved_pct"] = (1 - row["warm_ttft_ms"] / row["cold_ttft_ms"]) * 100 if row["cold_ttft_ms"] else 0.0
+
+        # Turn 1 has no history to reuse, so it is left out of the reuse figures
+        later = rows[1:] or rows
+        warm_total, cold_total = sum(r["warm_ttft_ms"] for r in later), sum(r["cold_ttft_ms"] for r in later)
+        xs = [r["history_chars"] / 1000 for r in later]
+        return {
+            "backend": self.backend.name, "model": model, "turns": rows,
+            "reuse_pct": (1 - warm_total / cold_total) * 100 if cold_total else 0.0,
+            # TTFT growth per 1k characters of history: flat when the prefix is reused, linear when it is re-prefilled
+            "warm_ms_per_kchar": _fit(xs, [r["warm_ttft_ms"] for r in later]),
+            "cold_ms_per_kchar": _fit(xs, [r["cold_ttft_ms"] for r in later]),
+        }
@@ -0,0 +1,117 @@
+import asyncio
+import itertools
+import statistics
+import time
+from typing import Dict, List, Optional, Tuple
+from rich.console import Console
+from ..backends.base import BaseBackend
+
+PROMPT = "Explain in two short paragraphs how a hash map handles collisions."
+# A request counts as a reload when the backend reports this much load time (Ollama load_duration),
+# or, for backends that do not report it, when TTFT exceeds the solo TTFT by this factor plus the slack
+RELOAD_S = 0.5
+RELOAD_TTFT_FACTOR, RELOAD_TTFT_SLACK_MS = 5.0, 500.0
+
+class CoResidencyBenchmark:
+    """
+    Loads groups of models side by side and sends them interleaved (round-robin) and concurrent (one stream per
+    model) traffic. Each model's speed is compared with its solo run. The benchmark counts evictions and reloads,
+    seen through /api/ps and load times, and finds the groups that stay resident together without swapping.
+    """
+    def __init__(self, backend: BaseBackend, requests: int = 4, tokens: int = 128):
+        self.backend = backend
+        self.requests = max(1, requests)
+        self.options = {"num_predict": tokens}
+        self.console = Console()
+
+    async def _request(self, model: str) -> Dict:
+        start = time.perf_counter(); first = None; tokens = 0; payload = None
+        async for event in self.backend.stream_events(model, PROMPT, self.options):
+            if event.text:
+                if first is None: first = time.perf_counter()
+                tokens += 1
+            if event.done: payload = event.payload; break
+        end = time.perf_counter()
+        return {"model": model, "ttft_ms": ((first or end) - start) * 1000, "tokens": tokens,
+                "tps": (tokens - 1) / (end - first) if first and tokens > 1 and end > first else 0.0,
+                "load_s": ((payload or {}).get("load_duration") or 0) / 1e9, "start": start, "end": end}
+
+    async def _resident(self) -> Optional[Dict[str, Dict]]:
+        """Loaded models by name, or None when the backend does not report them."""
+        loaded = await self.backend.get_loaded_models()
+        return {m["name"]: m for m in loaded} if loaded else None
+
+    def _reloaded(self, r: Dict, solo: Dict) -> bool:
+        if r["load_s"] >= RELOAD_S: return True
+        return r["load_s"] == 0 and r["ttft_ms"] > solo["ttft_ms"] * RELOAD_TTFT_FACTOR + RELOAD_TTFT_SLACK_MS
+
+    async def solo(self, model: str) -> Dict:
+        await self.backend.unload_all(); await self.backend.load_model(model, self.options)
+        await self._request(model)  # warm-up: the load is not part of steady-state speed
+        runs = [await self._request(model) for _ in range(self.requests)]
+        resident = await self._resident() or {}
+        size = resident.get(model, {}).get("size")
+        return {"model": model, "tps": statistics.mean(r["tps"] for r in runs), "ttft_ms": statistics.mean(r["ttft_ms"] for r in runs),
+                "seconds": statistics.mean(r["end"] - r["start"] for r in runs), "size_gb": size / (1024**3) if isinstance(size, int) else None}
+
+    async def group(self, models: Tuple[str, ...], solos: Dict[str, Dict]) -> Dict:
+        self.console.print(f"[bold white]Co-residency[/bold white] {' + '.join(models)}")
+        await self.backend.unload_all()
+        for m in models: await self._request(m)  # load every member
+        resident = await self._resident()
+        # Only trust the loaded list when it uses the same model names we request
+        if resident is not None and not any(m in resident for m in models): resident = None
+        loaded_together = None if resident is None else all(m in resident for m in models)
+        evictions = 0; last = set(resident or {})
+
+        async def observe():
+            nonlocal evictions, last
+            now = await self._resident()
+            if now is None: return
+            evictions += len(last - set(now)); last = set(now)
+
+        # Interleaved: A, B, C, A, B, C, ... one request at a time
+        interleaved = []
+        for _ in range(self.requests):
+            for m in models:
+                interleaved.append(await self._request(m)); await observe()
+        # Concurrent: every model streams at once
+        concurrent, walls = [], []
+        for _ in range(self.requests):
+            batch = await asyncio.gather(*[self._request(m) for m in models])
+            concurrent += batch; walls.append(max(r["end"] for r in batch) - min(r["start"] for r in batch)); await observe()
+
+        reloads = sum(self._reloaded(r, solos[r["model"]]) for r in interleaved + concurrent)
+        per_model = []
+        for m in models:
+            inter = [r for r in interleaved if r["model"] == m]; conc = [r for r in concurrent if r["model"] == m]
+            solo = solos[m]
+            per_model.append({"model": m, "solo_tps": solo["tps"], "interleaved_tps": statistics.mean(r["tps"] for r in inter),
+                              "concurrent_tps": statistics.mean(r["tps"] for r in conc), "solo_ttft_ms": solo["ttft_ms"],
+                              "interleaved_ttft_ms": statistics.mean(r["ttft_ms"] for r in inter),
+                              "concurrent_ttft_ms": statistics.mean(r["ttft_ms"] for r in conc)})
+        solo_sum = sum(p["solo_tps"] for p in per_model)
+        sizes = [solos[m]["size_gb"] for m in models]
+        return {
+            "models": list(models), "per_model": per_model, "loaded_together": loaded_together,
+            "evictions": evictions, "reloads": reloads,
+            # Fits: everything stayed loaded and no request paid for a reload; None when the backend cannot tell
+            "fits": False if reloads or evictions or loaded_together is False else (True if resident is not None else None),
+            "size_gb": sum(sizes) if all(s is not None for s in sizes) else None,
+            # Mean per-model slowdown against solo runs, in percent
+            "interleaved_drop_pct": statistics.mean((1 - p["interleaved_tps"] / p["solo_tps"]) * 100 for p in per_model if p["solo_tps"]) if solo_sum else 0.0,
+            "concurrent_drop_pct": statistics.mean((1 - p["concurrent_tps"] / p["solo_tps"]) * 100 for p in per_model if p["solo_tps"]) if solo_sum else 0.0,
+            # Time to serve one request per model back to back when alone, over the time to serve them all at once:
+            # 2.0 for two models means concurrency halves the wall time, below 1.0 means contention makes it a loss
+            "concurrent_speedup": sum(solos[m]["seconds"] for m in models) / statistics.mean(walls),
+        }
+
+    async def run(self, models: List[str], max_group: Optional[int] = None) -> Dict:
+        solos = {}
+        for m in models:
+            self.console.print(f"[bold white]Solo[/bold white] {m}")
+            solos[m] = await self.solo(m)
+        sizes = range(2, min(len(models), max_group or len(models)) + 1)
+        groups = [await self.group(g, solos) for k in sizes for g in itertools.combinations(models, k)]
+        await self.backend.unload_all()
+        return {"backend": self.backend.name, "solo": list(solos.values()), "groups": groups}
@@ -0,0 +1,93 @@
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+from rich.console import Console
+from ..backends.base import BaseBackend
+from ..system import topology
+from .engine import BenchmarkEngine, BenchmarkSuite
+
+TUNING_PATH = Path.home() / ".lmbench" / "tuning.json"
+PLATEAU = 0.95  # a thread count "stops helping" once it reaches 95% of the best TPS
+
+def thread_counts(cores: int) -> List[int]:
+    """1, 2, 4, ... up to the physical core count, which is always included."""
+    counts, n = [], 1
+    while n < cores: counts.append(n); n *= 2
+    return counts + [cores]
+
+def analyze(points: List[Dict]) -> Optional[Dict]:
+    """
+    Adds TPS per thread and parallel efficiency (speed-up over the smallest thread count, divided by the extra
+    threads) to each point, and returns the knee: the fewest threads within PLATEAU of the best TPS.
+    """
+    ok = sorted((p for p in points if p["status"] == "Success" and p["tps"] > 0), key=lambda p: p["threads"])
+    if not ok: return None
+    base = ok[0]
+    for p in ok:
+        p["tps_per_thread"] = p["tps"] / p["threads"]
+        p["efficiency"] = (p["tps"] / base["tps"]) / (p["threads"] / base["threads"])
+    peak = max(p["tps"] for p in ok)
+    return next(p for p in ok if p["tps"] >= PLATEAU * peak)
+
+class TuningStore:
+    """Best CPU settings per host (hardware fingerprint) and model, in ~/.lmbench/tuning.json."""
+    def __init__(self, path: Path = TUNING_PATH):
+        self.path = path
+        try:
+            with open(path) as f: self.data: Dict[str, Dict[str, Dict]] = json.load(f)
+        except (OSError, ValueError):
+            self.data = {}
+
+    def get(self, fingerprint: str, model: str) -> Optional[Dict]:
+        return self.data.get(fingerprint, {}).get(model)
+
+    def put(self, fingerprint: str, model: str, setting: Dict):
+        self.data.setdefault(fingerprint, {})[model] = setting
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w") as f: json.dump(self.data, f, indent=2)
+
+class CpuScalingSweep:
+    """
+    Sweeps Ollama's `num_thread` with the model kept off the GPU (`num_gpu: 0`). With more than one NUMA node and a
+    local backend, the sweep is repeated with the backend pinned to node 0 (threads and first-touch memory on one
+    node) and compared with the default placement spread over all nodes.
+    """
+    def __init__(self, backend: BaseBackend, rounds: int = 1, threads: Optional[List[int]] = None, numa: bool = True, tokens: int = 128):
+        self.backend = backend
+        self.rounds = rounds
+        self.cores = topology.physical_cores()
+        self.threads = sorted(set(threads)) if threads else thread_counts(self.cores)
+        self.nodes = topology.numa_nodes()
+        self.numa = numa and len(self.nodes) > 1 and topology.can_pin() and backend.is_local
+        self.tokens = tokens
+        self.console = Console()
+
+    def placements(self) -> List[Dict]:
+        spread = {"name": "spread", "cpus": None, "threads": self.threads}
+        if not self.numa: return [spread]
+        node, cpus = next(iter(self.nodes.items()))
+        limit = topology.node_physical_cores(cpus)
+        pinned = {"name": f"node{node}", "cpus": cpus, "threads": sorted({min(n, limit) for n in self.threads})}
+        return [spread, pinned]
+
+    async def run(self, model: str) -> Dict:
+        engine = BenchmarkEngine(self.backend); test = BenchmarkSuite.get_burst_test()
+        result = {"backend": self.backend.name, "model": model, "physical_cores": self.cores, "numa_nodes": len(self.nodes), "placements": []}
+        processes = topology.backend_processes() if self.numa else []
+        for placement in self.placements():
+            points = []
+            with topology.CpuPinning(processes, placement["cpus"]):
+                for n in placement["threads"]:
+                    options = {"num_thread": n, "num_gpu": 0, "num_predict": self.tokens}
+                    r = await engine.run_benchmark(model, test, options, self.rounds, f"CPU scaling: {n} threads ({placement['name']})")
+                    points.append({"threads": n, "status": r["status"], "tps": r["tps"], "ttft_ms": r["ttft_ms"], "load_ms": r.get("load_ms", 0.0)})
+                await self.backend.unload_all()  # the next placement must start a fresh runner
+            knee = analyze(points)
+            result["placements"].append({"name": placement["name"], "cpus": placement["cpus"], "points": points,
+                                         "knee": knee["threads"] if knee else None, "peak_tps": max((p["tps"] for p in points), default=0.0)})
+        best = max(result["placements"], key=lambda p: p["peak_tps"])
+        knee = next((p for p in best["points"] if p["threads"] == best["knee"]), None)
+        result["best"] = {"num_thread": knee["threads"], "placement": best["name"], "cpus": best["cpus"], "tps": knee["tps"],
+                          "peak_tps": best["peak_tps"], "measured": datetime.now().isoformat(timespec="seconds")} if knee else None
+        return result
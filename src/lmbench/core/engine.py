@@ -2,11 +2,12 @@ import httpx
 import time
 import json
 import asyncio
+import math
 import re
 import statistics
 import os
 from datetime import datetime
-from typing import Dict, List, Optional, AsyncGenerator
+from typing import Awaitable, Callable, Dict, List, Optional, AsyncGenerator, Union
 from rich.console import Console
 from rich.live import Live
 from rich.panel import Panel
@@ -14,6 +15,8 @@ from rich.layout import Layout
 from rich.text import Text
 from rich.table import Table
 from ..backends.base import BaseBackend
+from .evaluation import has_reference, score_answer
+from .events import EventBus, FirstToken, Phase, RoundEnd, RoundStart, SuiteEnd, TelemetrySample, Token
 
 class BenchmarkSuite:
     @staticmethod
@@ -24,6 +27,31 @@ class BenchmarkSuite:
     def get_code_test(): return {"name": "Code Generation", "type": "code", "prompt": "Write a Python script that calculates the Fibonacci sequence up to N terms using recursion and includes a main block to test it."}
     @staticmethod
     def get_logic_test(): return {"name": "Logic & Reasoning", "type": "quality", "prompt": "Sally has 3 brothers. Each of her brothers has 2 sisters. How many sisters does Sally have?", "expected": "1"}
+    @staticmethod
+    def get_embedding_tests(batch_sizes=(1, 8, 32), input_words=(16, 128, 512), requests: int = 16):
+        """Sweep of batch size x input length; each cell sends `requests` embed calls per round."""
+        return [{"name": f"Embed b{b} x {w}w", "type": "embedding", "batch_size": b, "input_words": w, "requests": requests}
+                for b in batch_sizes for w in input_words]
+    @staticmethod
+    def embedding_inputs(batch_size: int, words: int) -> List[str]:
+        """Deterministic, distinct passages (distinct so no backend can dedupe the batch)."""
+        base = "retrieval augmented generation splits documents into passages that are embedded and indexed for similarity search".split()
+        return [" ".join([f"passage{i}"] + [base[(i + j) % len(base)] for j in range(words - 1)]) for i in range(batch_size)]
+    @staticmethod
+    def get_vision_tests(sizes=(336, 768, 1344), counts=(1, 3)):
+        """Image resolution x images per request; each cell also runs a text-only baseline."""
+        return [{"name": f"Vision {n} x {px}px", "type": "vision", "image_size": px, "images": n, "max_tokens": 128} for px in sizes for n in counts]
+    @staticmethod
+    def get_agent_test(): return {"name": "Agent Loop", "type": "agent", "max_steps": 8}
+    @staticmethod
+    def get_structured_tests():
+        """One prompt three ways: free text, JSON mode and a JSON schema, to price constrained decoding."""
+        prompt = ("Extract the person from this text as a JSON object with the keys name, age, city and skills (a list of strings): "
+                  "\"Maria Lopez, 34, moved to Valencia last year. She writes Rust and Go, and teaches Kubernetes on weekends.\"")
+        schema = {"type": "object", "properties": {"name": {"type": "string"}, "age": {"type": "integer"}, "city": {"type": "string"},
+                  "skills": {"type": "array", "items": {"type": "string"}}}, "required": ["name", "age", "city", "skills"]}
+        return [{"name": f"Structured ({label})", "type": "structured", "variant": variant, "prompt": prompt, "format": fmt, "schema": schema}
+                for label, variant, fmt in (("free", "free", None), ("JSON mode", "json", "json"), ("schema", "schema", schema))]
 
 class LiveDashboard:
     def __init__(self, model: str, test_name: str, reasoning: str = ""):
@@ -71,58 +99,241 @@ class LiveDashboard:
         )
         return layout
 
+class _Round:
+    """One measured round as the run_* bodies see it; the body fills in the RoundEnd fields."""
+    def __init__(self, index: int, start: float, telemetry, dash: "LiveDashboard", bus: EventBus):
+        self.index, self.start, self.telemetry, self.dash, self.bus = index, start, telemetry, dash, bus
+        self.id: Optional[int] = None; self.live: Optional[Live] = None
+        self.first_token: Optional[float] = None; self.tokens = 0; self.ttft_ms = 0.0; self.tps = 0.0; self.load_s = 0.0
+
+    def sample(self):
+        """Poll telemetry and publish the sample on the bus."""
+        self.telemetry.poll()
+        if self.bus.active: sample = self.telemetry.snapshot(); self.bus.emit(TelemetrySample(sample["t"], self.id, sample))
+
 class BenchmarkEngine:
-    def __init__(self, backend: BaseBackend):
-        self.backend = backend; self.session_history = []
+    def __init__(self, backend: BaseBackend, bus: Optional[EventBus] = None):
+        self.backend = backend; self.session_history = []; self.bus = bus or EventBus()
 
-    async def run_benchmark(self, model: str, test: Dict, options: Optional[Dict] = None, rounds: int = 1, reasoning: str = "") -> Dict:
-        from ..system.probe import Telemetry
-        telemetry = Telemetry(); dash = LiveDashboard(model, test["name"], reasoning)
-        dash.history = self.session_history
-        
-        # 1. Eject
+    async def _eject_and_load(self, model: str, options: Optional[Dict], dash: "LiveDashboard", telemetry) -> float:
+        """Unload everything, let memory settle, then load `model`. Returns backend-reported load seconds."""
         dash.ejection_log = "Ejecting models..."
         with Live(dash.generate_renderable(), refresh_per_second=5) as live:
+            eject_start = time.perf_counter()
             await self.backend.unload_all()
             for _ in range(3):
                 telemetry.poll(); dash.vram_used = telemetry.current_vram_gb; live.update(dash.generate_renderable()); await asyncio.sleep(0.5)
-            dash.ejection_log = "Memory Cleaned"
+            dash.ejection_log = "Loading model..."
             live.update(dash.generate_renderable())
+            load_start = time.perf_counter()
+            load_s = await self.backend.load_model(model, options)
+            load_end = time.perf_counter()
+            dash.ejection_log = f"Memory Cleaned, model loaded ({load_s * 1000:.0f}ms)" if load_s else "Memory Cleaned"
+            live.update(dash.generate_renderable())
+        if self.bus.active:
+            self.bus.emit(Phase("eject", eject_start, load_start, model))
+            if load_s: self.bus.emit(Phase("load", load_start, load_end, model))
+        return load_s
 
-        round_results = []
+    async def _rounds(self, model: str, test: Dict, options: Optional[Dict], rounds: int, reasoning: str,
+                      body: Callable[["_Round"], Awaitable], summarize: Callable[[List, object], Dict],
+                      warmup: Optional[Callable[[], Awaitable]] = None, refresh_per_second: int = 10) -> Dict:
+        """
+        Shared scaffolding of the run_* measurements: telemetry and dashboard, eject and load, then `rounds` rounds,
+        each inside a Live view between RoundStart and RoundEnd. `body(rnd)` measures one round, fills in the
+        RoundEnd fields of `rnd` and returns what `summarize(runs, telemetry)` turns into the type-specific result fields.
+        """
+        from ..system.probe import Telemetry
+        telemetry = Telemetry(); dash = LiveDashboard(model, test["name"], reasoning)
+        dash.history = self.session_history; bus = self.bus
+        load_s = await self._eject_and_load(model, options, dash, telemetry)
+        runs = []; peak_power = 0.0; rnd = None
         try:
+            if warmup: await warmup()  # outside the measurement
             for r in range(rounds):
-                metrics = {"ttft_ms": 0.0, "tps": 0.0, "tokens": 0, "power": 0.0, "output": ""}; start_time = time.perf_counter(); first_token_time = None; tokens_received = 0; full_response = []
+                rnd = _Round(r, time.perf_counter(), telemetry, dash, bus)
                 telemetry.start()
-                with Live(dash.generate_renderable(), refresh_per_second=10) as live:
-                    dash.test_name = f"{test['name']} ({r+1}/{rounds})"
-                    async for chunk in self.backend.stream_generate(model, test["prompt"], options):
-                        if first_token_time is None: first_token_time = time.perf_counter(); metrics["ttft_ms"] = (first_token_time - start_time) * 1000; dash.ttft = metrics["ttft_ms"]
-                        if tokens_received % 5 == 0: telemetry.poll()
-                        text = ""
-                        if "response" in chunk: text = chunk["response"]
-                        elif "message" in chunk: text = chunk["message"].get("content", "")
-                        elif "choices" in chunk: text = chunk["choices"][0].get("delta", {}).get("content", "")
-                        if text:
-                            full_response.append(text); tokens_received += 1; dash.text_buffer += text
-                            now = time.perf_counter()
-                            if first_token_time and now > first_token_time:
-                                dash.tps = (tokens_received - 1) / (now - first_token_time); dash.tps_history.append(dash.tps)
-                                dash.gpu_util, dash.power, dash.temp = telemetry.gpu_util, telemetry.peak_power, telemetry.max_temp
-                                dash.vram_used, dash.vram_total = telemetry.current_vram_gb, telemetry.total_vram_gb
-                                if tokens_received % 10 == 0: dash.raw_events.append(f"T{tokens_received}: event...")
-                                live.update(dash.generate_renderable())
-                        if self.backend.is_compatible(chunk): break
-                end_time = time.perf_counter(); telemetry.stop()
-                if first_token_time: metrics["tps"] = (tokens_received - 1) / (end_time - first_token_time)
-                metrics["tokens"] = tokens_received; metrics["power"] = telemetry.peak_power; metrics["output"] = "".join(full_response); round_results.append(metrics)
-            
-            avg_metrics = {"model": model, "test_name": test["name"], "test_type": "performance", "options": options or {}, "ttft_ms": statistics.mean([m["ttft_ms"] for m in round_results]), "tps": statistics.mean([m["tps"] for m in round_results]), "tps_std": statistics.stdev([m["tps"] for m in round_results]) if rounds > 1 else 0.0, "peak_power_w": max([m["power"] for m in round_results]), "total_tokens": round_results[0]["tokens"], "quality_pass": True, "status": "Success"}
-            from .engine import ComparisonEngine
-            self.session_history.append(ComparisonEngine.calculate_score(avg_metrics))
-            return avg_metrics
+                if bus.active:
+                    rnd.id = bus.new_round_id()
+                    bus.emit(RoundStart(rnd.start, rnd.id, model, self.backend.name, test["name"], options, r + 1, rounds))
+                with Live(dash.generate_renderable(), refresh_per_second=refresh_per_second) as live:
+                    dash.test_name = f"{test['name']} ({r+1}/{rounds})"; rnd.live = live
+                    runs.append(await body(rnd))
+                end_time = time.perf_counter(); telemetry.stop(); peak_power = max(peak_power, telemetry.peak_power)
+                # Backends without load_model (Ollama) load on the first request and report it in the stream
+                if r == 0: load_s = max(load_s, rnd.load_s)
+                if bus.active:
+                    bus.emit(RoundEnd(end_time, rnd.id, "success", rnd.start, rnd.first_token, rnd.tokens, rnd.ttft_ms, rnd.tps, rnd.load_s))
+            result = {"model": model, "test_name": test["name"], "test_type": test.get("type", "performance"), "options": options or {},
+                      **summarize(runs, telemetry), "peak_power_w": peak_power, "load_ms": load_s * 1000, "status": "Success"}
+            self.session_history.append(ComparisonEngine.calculate_score(result))
+            return result
         except Exception as e:
-            return {"model": model, "status": f"Error: {e}", "tps": 0, "ttft_ms": 0, "quality_pass": False}
+            if bus.active and rnd is not None and rnd.id is not None:
+                bus.emit(RoundEnd(time.perf_counter(), rnd.id, f"error: {e}", rnd.start, None, 0, 0.0, 0.0))
+            return {"model": model, "test_name": test["name"], "test_type": test.get("type", "performance"), "status": f"Error: {e}", "tps": 0, "ttft_ms": 0, "quality_pass": False}
+
+    async def run_benchmark(self, model: str, test: Dict, options: Optional[Dict] = None, rounds: int = 1, reasoning: str = "") -> Dict:
+        if test.get("type") == "embedding": return await self.run_embedding(model, test, options, rounds, reasoning)
+        if test.get("type") == "agent": return await self.run_agent(model, test, options, rounds, reasoning)
+        if test.get("type") == "vision": return await self.run_vision(model, test, options, rounds, reasoning)
+        # Output constraints travel with the request options; backends turn them into `format` / `response_format`
+        request_options = {**(options or {}), "format": test["format"]} if test.get("format") else options
+        async def body(rnd: _Round) -> Dict:
+            dash, telemetry, bus, live = rnd.dash, rnd.telemetry, rnd.bus, rnd.live
+            first_token_time = None; last_token_time = None; tokens_received = 0; full_response = []; final_payload = None
+            async for event in self.backend.stream_events(model, test["prompt"], request_options):
+                if first_token_time is None:
+                    first_token_time = rnd.first_token = time.perf_counter(); rnd.ttft_ms = (first_token_time - rnd.start) * 1000; dash.ttft = rnd.ttft_ms
+                    if bus.active: bus.emit(FirstToken(first_token_time, rnd.id, first_token_time - rnd.start))
+                if tokens_received % 5 == 0: rnd.sample()
+                text = event.text
+                if text:
+                    full_response.append(text); tokens_received += 1; dash.text_buffer += text
+                    now = time.perf_counter()
+                    if first_token_time and now > first_token_time:
+                        dash.tps = (tokens_received - 1) / (now - first_token_time); dash.tps_history.append(dash.tps)
+                        dash.gpu_util, dash.power, dash.temp = telemetry.gpu_util, telemetry.peak_power, telemetry.max_temp
+                        dash.vram_used, dash.vram_total = telemetry.current_vram_gb, telemetry.total_vram_gb
+                        if tokens_received % 10 == 0: dash.raw_events.append(f"T{tokens_received}: event...")
+                        live.update(dash.generate_renderable())
+                    if bus.active: bus.emit(Token(now, rnd.id, tokens_received, text, now - last_token_time if last_token_time else None, dash.tps))
+                    last_token_time = now
+                if event.done: final_payload = event.payload; break
+            end_time = time.perf_counter()
+            if first_token_time: rnd.tps = (tokens_received - 1) / (end_time - first_token_time)
+            rnd.tokens = tokens_received; rnd.load_s = ((final_payload or {}).get("load_duration") or 0) / 1e9
+            return {"ttft_ms": rnd.ttft_ms, "tps": rnd.tps, "tokens": tokens_received, "output": "".join(full_response)}
+        def summarize(runs: List[Dict], telemetry) -> Dict:
+            return {"ttft_ms": statistics.mean([m["ttft_ms"] for m in runs]), "tps": statistics.mean([m["tps"] for m in runs]),
+                    "tps_std": statistics.stdev([m["tps"] for m in runs]) if rounds > 1 else 0.0, "variant": test.get("variant"),
+                    "total_tokens": runs[0]["tokens"], "quality_pass": all(score_answer(m["output"], test) for m in runs) if has_reference(test) else True}
+        return await self._rounds(model, test, options, rounds, reasoning, body, summarize)
+
+    async def run_embedding(self, model: str, test: Dict, options: Optional[Dict] = None, rounds: int = 1, reasoning: str = "") -> Dict:
+        """Embedding throughput for one (batch size, input length) cell: `requests` sequential calls per round."""
+        inputs = BenchmarkSuite.embedding_inputs(test["batch_size"], test["input_words"])
+        latencies = []; estimated = False
+        async def body(rnd: _Round) -> Dict:
+            nonlocal estimated
+            dash, telemetry = rnd.dash, rnd.telemetry; embedded = tokens = dims = 0
+            for i in range(test["requests"]):
+                t0 = time.perf_counter(); out = await self.backend.embed(model, inputs, options); elapsed = time.perf_counter() - t0
+                latencies.append(elapsed); embedded += out["embeddings"]; dims = out["dims"]
+                # Backends that do not report usage get a words-based estimate (~1.3 tokens per word)
+                n = out.get("prompt_tokens")
+                if n is None: n = int(test["batch_size"] * test["input_words"] * 1.3); estimated = True
+                tokens += n
+                rnd.sample()
+                dash.tps = n / elapsed if elapsed else 0.0; dash.tps_history.append(dash.tps); dash.ttft = elapsed * 1000
+                dash.gpu_util, dash.power, dash.temp = telemetry.gpu_util, telemetry.peak_power, telemetry.max_temp
+                dash.vram_used, dash.vram_total = telemetry.current_vram_gb, telemetry.total_vram_gb
+                dash.text_buffer = f"Request {i + 1}/{test['requests']}: {out['embeddings']} x {dims}-dim vectors in {elapsed * 1000:.0f}ms\n"
+                rnd.live.update(dash.generate_renderable())
+            busy = time.perf_counter() - rnd.start
+            rnd.tokens, rnd.ttft_ms, rnd.tps = tokens, _percentile(latencies, 50) * 1000, tokens / busy
+            return {"busy": busy, "embedded": embedded, "tokens": tokens, "dims": dims}
+        def summarize(runs: List[Dict], telemetry) -> Dict:
+            busy = sum(x["busy"] for x in runs); tokens = sum(x["tokens"] for x in runs); dims = runs[-1]["dims"]
+            p50 = _percentile(latencies, 50) * 1000
+            return {"batch_size": test["batch_size"], "input_words": test["input_words"],
+                    # ttft_ms / tps keep generation semantics for shared columns: time to a full response and input tokens/s
+                    "ttft_ms": p50, "tps": tokens / busy if busy else 0.0, "tps_std": 0.0, "tokens_estimated": estimated,
+                    "embeddings_per_s": sum(x["embedded"] for x in runs) / busy if busy else 0.0, "latency_p50_ms": p50,
+                    "latency_p90_ms": _percentile(latencies, 90) * 1000, "latency_p99_ms": _percentile(latencies, 99) * 1000,
+                    "dims": dims, "total_tokens": tokens, "quality_pass": dims > 0}
+        return await self._rounds(model, test, options, rounds, reasoning, body, summarize,
+                                  warmup=lambda: self.backend.embed(model, inputs[:1], options))
+
+    async def run_agent(self, model: str, test: Dict, options: Optional[Dict] = None, rounds: int = 1, reasoning: str = "") -> Dict:
+        """Scripted tool-calling loop (core/agent.py), `rounds` times: latency per step, follow-up TTFT and malformed-call rate."""
+        from .agent import AgentLoop
+        loop = AgentLoop(self.backend, test.get("max_steps", 8))
+        async def body(rnd: _Round) -> Dict:
+            dash, telemetry = rnd.dash, rnd.telemetry
+            def on_step(step: Dict):
+                rnd.sample()
+                dash.ttft = step["ttft_ms"]; dash.power, dash.gpu_util = telemetry.peak_power, telemetry.gpu_util
+                dash.vram_used, dash.vram_total = telemetry.current_vram_gb, telemetry.total_vram_gb
+                kind = f"{step['tool_calls']} tool call(s)" + (f", {step['malformed']} malformed" if step["malformed"] else "") if step["tool_calls"] else "answer"
+                dash.text_buffer += f"Step {step['step']}: {kind} in {step['step_ms']:.0f}ms (TTFT {step['ttft_ms']:.0f}ms)\n"
+                rnd.live.update(dash.generate_renderable())
+            run = await loop.run(model, options, on_step)
+            rnd.tokens, rnd.ttft_ms, rnd.tps = run["tokens"], run["followup_ttft_ms"], run["tokens"] / run["model_s"] if run["model_s"] else 0.0
+            return run
+        def summarize(runs: List[Dict], telemetry) -> Dict:
+            model_s = sum(x["model_s"] for x in runs); calls = sum(x["tool_calls"] for x in runs)
+            # ttft_ms is the mean TTFT of follow-up turns (after a tool result), the latency an agent user feels
+            return {"ttft_ms": statistics.mean(x["followup_ttft_ms"] for x in runs), "first_ttft_ms": statistics.mean(x["first_ttft_ms"] for x in runs),
+                    "tps": sum(x["tokens"] for x in runs) / model_s if model_s else 0.0, "tps_std": 0.0,
+                    "step_ms": statistics.mean(x["step_ms"] for x in runs), "loop_ms": statistics.mean(x["total_ms"] for x in runs),
+                    "steps": statistics.mean(len(x["steps"]) for x in runs), "tool_calls": calls,
+                    "malformed_rate": sum(x["malformed"] for x in runs) / calls if calls else 0.0,
+                    "completion_rate": sum(1 for x in runs if x["completed"]) / len(runs), "total_tokens": sum(x["tokens"] for x in runs),
+                    "quality_pass": all(x["completed"] for x in runs), "runs": runs}
+        return await self._rounds(model, test, options, rounds, reasoning, body, summarize)
+
+    async def _stream_once(self, model: str, prompt: str, options: Optional[Dict], telemetry) -> Dict:
+        """One generation with VRAM sampled in the background (prefill, e.g. image encoding, emits no tokens to poll on)."""
+        peak = [telemetry.current_vram_gb]
+        async def sample():
+            while True:
+                telemetry.poll(); peak[0] = max(peak[0], telemetry.current_vram_gb); await asyncio.sleep(0.1)
+        sampler = asyncio.create_task(sample())
+        start = time.perf_counter(); first = None; tokens = 0; payload = None
+        try:
+            async for event in self.backend.stream_events(model, prompt, options):
+                if event.text:
+                    if first is None: first = time.perf_counter()
+                    tokens += 1
+                if event.done: payload = event.payload; break
+        finally:
+            sampler.cancel()
+        end = time.perf_counter()
+        return {"ttft_ms": ((first or end) - start) * 1000, "tps": (tokens - 1) / (end - first) if first and tokens > 1 and end > first else 0.0,
+                "tokens": tokens, "peak_vram_gb": peak[0], "prompt_eval_count": (payload or {}).get("prompt_eval_count")}
+
+    async def run_vision(self, model: str, test: Dict, options: Optional[Dict] = None, rounds: int = 1, reasoning: str = "") -> Dict:
+        """
+        Image-input cell (resolution x image count). Each round pairs a text-only request with the same request plus
+        images; the TTFT difference is image encoding, the VRAM difference is the cost of the images.
+        """
+        from .vision import VISION_PROMPT, test_image_b64
+        base_options = {**(options or {}), "num_predict": test.get("max_tokens", 128)}
+        async def body(rnd: _Round) -> tuple:
+            dash, telemetry, live, r = rnd.dash, rnd.telemetry, rnd.live, rnd.index
+            # A fresh nonce and fresh pixels per round keep prompt and image caches from hiding the prefill
+            prompt = f"[{r}-{time.time_ns()}] {VISION_PROMPT}"
+            dash.text_buffer = "Text-only baseline...\n"; live.update(dash.generate_renderable())
+            text = await self._stream_once(model, prompt, base_options, telemetry)
+            images = [test_image_b64(test["image_size"], seed=r * 100 + i) for i in range(test["images"])]
+            dash.text_buffer += f"Sending {len(images)} x {test['image_size']}px image(s)...\n"; live.update(dash.generate_renderable())
+            vision = await self._stream_once(model, prompt, {**base_options, "images": images}, telemetry)
+            dash.ttft, dash.tps = vision["ttft_ms"], vision["tps"]; dash.power, dash.gpu_util = telemetry.peak_power, telemetry.gpu_util
+            dash.vram_used, dash.vram_total = vision["peak_vram_gb"], telemetry.total_vram_gb
+            dash.text_buffer += f"TTFT {text['ttft_ms']:.0f}ms text-only vs {vision['ttft_ms']:.0f}ms with images\n"; live.update(dash.generate_renderable())
+            rnd.sample(); rnd.tokens, rnd.ttft_ms, rnd.tps = vision["tokens"], vision["ttft_ms"], vision["tps"]
+            return text, vision
+        def summarize(pairs: List[tuple], telemetry) -> Dict:
+            n = test["images"]
+            text_ttft = statistics.mean(t["ttft_ms"] for t, _ in pairs); vision_ttft = statistics.mean(v["ttft_ms"] for _, v in pairs)
+            vram_delta = max(v["peak_vram_gb"] for _, v in pairs) - max(t["peak_vram_gb"] for t, _ in pairs)
+            prompt_delta = [v["prompt_eval_count"] - t["prompt_eval_count"] for t, v in pairs if v["prompt_eval_count"] and t["prompt_eval_count"]]
+            return {"image_size": test["image_size"], "images": n,
+                    "ttft_ms": vision_ttft, "text_ttft_ms": text_ttft, "image_encode_ms": max(0.0, vision_ttft - text_ttft),
+                    "encode_ms_per_image": max(0.0, vision_ttft - text_ttft) / n,
+                    "tps": statistics.mean(v["tps"] for _, v in pairs), "tps_std": statistics.stdev([v["tps"] for _, v in pairs]) if rounds > 1 else 0.0,
+                    # None without GPU telemetry
+                    "vram_per_image_gb": vram_delta / n if telemetry.total_vram_gb else None,
+                    "tokens_per_image": statistics.mean(prompt_delta) / n if prompt_delta else None,
+                    "total_tokens": pairs[0][1]["tokens"], "quality_pass": all(v["tokens"] > 0 for _, v in pairs)}
+        return await self._rounds(model, test, options, rounds, reasoning, body, summarize, refresh_per_second=5)
+
+def _percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (0.0 for no values)."""
+    if not values: return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, min(len(ordered), math.ceil(pct / 100 * len(ordered))) - 1)]
 
 class ComparisonEngine:
     @staticmethod
@@ -131,12 +342,17 @@ class ComparisonEngine:
         w_tps, w_ttft = 0.8, 0.2; s_tps = (result["tps"] / 50.0) * 100; s_ttft = max(0, 100 - (result["ttft_ms"] - 100) / 19)
         return round((s_tps * w_tps) + (s_ttft * w_ttft), 1)
 
-async def execute_suite(backend: BaseBackend, models: List[str], tests: List[Dict], matrix_options: Optional[List[Dict]] = None, rounds: int = 1, reasoning_list: List[str] = None):
-    engine = BenchmarkEngine(backend); results = []; matrix = matrix_options or [None]; console = Console()
+async def execute_suite(backend: BaseBackend, models: List[str], tests: List[Dict], matrix_options: Union[List[Dict], Callable[[str], List[Dict]], None] = None, rounds: int = 1, reasoning_list: List[str] = None, before_model: Optional[Callable[[str], Awaitable]] = None, bus: Optional[EventBus] = None):
+    engine = BenchmarkEngine(backend, bus); results = []; console = Console()
     console.print(f"\n[bold white]Benchmarking {backend.name}[/bold white] ([dim white]{backend.url}[/dim white])")
     try:
         for i, model in enumerate(models):
             reasoning = reasoning_list[i] if reasoning_list and i < len(reasoning_list) else "Manual selection."
+            # e.g. clean-state VM revert, or waiting for a background pull; False skips the model
+            if before_model and await before_model(model) is False:
+                console.print(f"[yellow]Skipping {model}.[/yellow]"); continue
+            # Options may depend on the model (e.g. GPU layer counts from its metadata)
+            matrix = (matrix_options(model) if callable(matrix_options) else matrix_options) or [None]
             for option in matrix:
                 for test in tests:
                     res = await engine.run_benchmark(model, test, option, rounds, reasoning)
@@ -148,4 +364,5 @@ async def execute_suite(backend: BaseBackend, models: List[str], tests: List[Dic
         from ..system.probe import Telemetry
         telemetry = Telemetry(); telemetry.poll()
         console.print(f"[dim white]✔ System Cleaned (VRAM: {telemetry.current_vram_gb:.1f}GB).[/dim white]")
+    if engine.bus.active: engine.bus.emit(SuiteEnd(time.perf_counter(), results))
     return results
\ No newline at end of file
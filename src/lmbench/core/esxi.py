@@ -1,56 +1,206 @@
-import paramiko
+import asyncio
+import os
+import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
 from rich.console import Console
 
+try:
+    import paramiko
+    HAS_PARAMIKO = True
+except ImportError:
+    HAS_PARAMIKO = False
+
+_VM_LINE = re.compile(r"^(\d+)\s+(.+?)\s+\[")
+
+def _paramiko_client():
+    if not HAS_PARAMIKO:
+        raise RuntimeError("ESXi support requires paramiko (pip install 'lmbench[esxi]')")
+    client = paramiko.SSHClient()
+    client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    return client
+
+class SSHSession:
+    """
+    A persistent SSH connection to one host, shared by every caller and reconnected on demand.
+    Commands may run concurrently from several threads; each opens its own channel on the transport.
+    """
+    _pool: Dict[Tuple[str, int, str], "SSHSession"] = {}
+    _pool_lock = threading.Lock()
+
+    def __init__(self, host: str, user: str, password: str, port: int = 22, client_factory: Callable = _paramiko_client):
+        self.host, self.user, self.password, self.port = host, user, password, port
+        self.client_factory = client_factory
+        self._client = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get(cls, host: str, user: str, password: str, port: int = 22, client_factory: Callable = _paramiko_client) -> "SSHSession":
+        with cls._pool_lock:
+            key = (host, port, user)
+            if key not in cls._pool:
+                cls._pool[key] = cls(host, user, password, port, client_factory)
+            return cls._pool[key]
+
+    def _connected(self):
+        with self._lock:
+            transport = self._client.get_transport() if self._client else None
+            if transport is None or not transport.is_active():
+                if self._client: self._client.close()
+                self._client = self.client_factory()
+                self._client.connect(self.host, port=self.port, username=self.user, password=self.password)
+            return self._client
+
+    def exec(self, command: str, timeout: float = 120) -> Tuple[int, str]:
+        """Run a command and wait for it. Returns (exit_status, stdout)."""
+        stdin, stdout, stderr = self._connected().exec_command(command, timeout=timeout)
+        output = stdout.read().decode(errors="replace")
+        return stdout.channel.recv_exit_status(), output
+
+    def close(self):
+        with self._lock:
+            if self._client: self._client.close(); self._client = None
+
+    @classmethod
+    def close_all(cls):
+        with cls._pool_lock:
+            for session in cls._pool.values(): session.close()
+            cls._pool.clear()
+
 class ESXiManager:
-    def __init__(self, host, user, password):
+    def __init__(self, host, user, password, port: int = 22, client_factory: Callable = _paramiko_client):
         self.host = host
         self.user = user
         self.password = password
         self.console = Console()
+        self.session = SSHSession.get(host, user, password, port, client_factory)
+        self._vm_ids: Optional[Dict[str, str]] = None
+
+    def list_vms(self, refresh: bool = False) -> Dict[str, str]:
+        """Map VM name -> VMID from a single `getallvms` call (cached until refresh)."""
+        if self._vm_ids is None or refresh:
+            _, output = self.session.exec("vim-cmd vmsvc/getallvms")
+            vm_ids = {}
+            for line in output.splitlines():
+                m = _VM_LINE.match(line.strip())
+                if m: vm_ids[m.group(2)] = m.group(1)
+            self._vm_ids = vm_ids
+        return self._vm_ids
+
+    def find_vmid(self, vm_name: str) -> Optional[str]:
+        vms = self.list_vms()
+        if vm_name in vms: return vms[vm_name]
+        # Same loose matching as before: first VM whose name contains the requested one
+        return next((vmid for name, vmid in vms.items() if vm_name in name), None)
+
+    def latest_snapshot(self, vmid: str) -> Optional[str]:
+        _, output = self.session.exec(f"vim-cmd vmsvc/snapshot.get {vmid}")
+        snap_id = None
+        for line in output.splitlines():
+            if "Snapshot Id" in line:
+                snap_id = line.split()[-1]  # the most recent one is listed last
+        return snap_id
 
     def revert_vm(self, vm_name: str):
         self.console.print(f"[bold yellow]➜ ESXi: Reverting {vm_name} to latest snapshot...[/bold yellow]")
-        client = paramiko.SSHClient()
-        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        
         try:
-            client.connect(self.host, username=self.user, password=self.password)
-            
-            # 1. Get VMID
-            stdin, stdout, stderr = client.exec_command("vim-cmd vmsvc/getallvms")
-            vmid = None
-            for line in stdout:
-                if vm_name in line:
-                    vmid = line.split()[0]
-                    break
-            
+            vmid = self.find_vmid(vm_name)
             if not vmid:
                 self.console.print(f"[red]Error: Could not find VM named {vm_name}[/red]")
                 return False
 
-            # 2. Get Snapshot ID (Current)
-            stdin, stdout, stderr = client.exec_command(f"vim-cmd vmsvc/snapshot.get {vmid}")
-            snap_id = None
-            for line in stdout:
-                if "Snapshot Id" in line:
-                    snap_id = line.split()[-1]
-                    # We usually want the most recent one (last in the list)
-            
+            snap_id = self.latest_snapshot(vmid)
             if not snap_id:
                 self.console.print(f"[red]Error: No snapshots found for {vm_name}[/red]")
                 return False
 
-            # 3. Revert
             # Note: ESXi might require VM to be powered off, but snapshot.revert usually handles this.
             self.console.print(f"[dim]Reverting VMID {vmid} to Snapshot {snap_id}...[/dim]")
-            client.exec_command(f"vim-cmd vmsvc/snapshot.revert {vmid} {snap_id} 0")
-            
+            status, _ = self.session.exec(f"vim-cmd vmsvc/snapshot.revert {vmid} {snap_id} 0")
+            if status != 0:
+                self.console.print(f"[red]ESXi Error: revert of {vm_name} exited with status {status}[/red]")
+                return False
+
             self.console.print(f"[bold green]✔ {vm_name} successfully reverted.[/bold green]")
             return True
 
         except Exception as e:
             self.console.print(f"[red]ESXi Error: {e}[/red]")
             return False
-        finally:
-            client.close()
+
+    def revert_vms(self, vm_names: List[str], max_workers: int = 8) -> Dict[str, bool]:
+        """Revert several VMs in parallel over the pooled session."""
+        self.list_vms(refresh=True)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return dict(zip(vm_names, pool.map(self.revert_vm, vm_names)))
+
+async def wait_until_reachable(urls: List[str], timeout: float = 300, interval: float = 2.0) -> Dict[str, bool]:
+    """Poll each guest backend URL until it answers HTTP (any status) or the timeout expires."""
+    import httpx
+    async def wait(client: httpx.AsyncClient, url: str) -> bool:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            try:
+                await client.get(url); return True
+            except httpx.HTTPError:
+                await asyncio.sleep(interval)
+        return False
+    async with httpx.AsyncClient(timeout=5.0) as client:
+        results = await asyncio.gather(*[wait(client, u) for u in urls])
+    return dict(zip(urls, results))
+
+def parse_vm_spec(spec: str) -> Tuple[str, int, str, Optional[str]]:
+    """'esxi01[:port]/vm-name[=http://guest:11434]' -> (host, ssh_port, vm_name, guest_url)."""
+    target, _, guest_url = spec.partition("=")
+    host, sep, vm_name = target.partition("/")
+    if not sep or not vm_name:
+        raise ValueError(f"Expected 'esxi-host/vm-name[=guest-url]', got '{spec}'")
+    host, _, port = host.partition(":")
+    return host, int(port or 22), vm_name, guest_url or None
+
+class CleanStateReverter:
+    """
+    Suite hook for clean-state mode: before each model, revert every configured VM to its latest
+    snapshot (in parallel, grouped per ESXi host) and wait until each guest's backend answers again.
+    """
+    def __init__(self, specs: List[str], user: str, password: Optional[str] = None, timeout: float = 300,
+                 client_factory: Callable = _paramiko_client):
+        password = password if password is not None else os.getenv("LMBENCH_ESXI_PASSWORD", "")
+        self.timeout = timeout
+        self.console = Console()
+        self.targets: Dict[Tuple[str, int], List[str]] = {}
+        self.guest_urls: List[str] = []
+        self.managers: Dict[Tuple[str, int], ESXiManager] = {}
+        for spec in specs:
+            host, port, vm_name, guest_url = parse_vm_spec(spec)
+            self.targets.setdefault((host, port), []).append(vm_name)
+            if guest_url: self.guest_urls.append(guest_url)
+            if (host, port) not in self.managers:
+                self.managers[(host, port)] = ESXiManager(host, user, password, port, client_factory)
+
+    def revert_all(self) -> Dict[str, bool]:
+        with ThreadPoolExecutor(max_workers=max(1, len(self.managers))) as pool:
+            futures = [pool.submit(self.managers[key].revert_vms, vms) for key, vms in self.targets.items()]
+            results = {}
+            for f in futures: results.update(f.result())
+        return results
+
+    async def __call__(self, model: str) -> bool:
+        """False (the suite skips this model) when a VM could not be reverted or its backend did not come back."""
+        self.console.print(f"\n[bold white]Clean state:[/bold white] reverting {sum(len(v) for v in self.targets.values())} VM(s) before {model}")
+        reverted = await asyncio.to_thread(self.revert_all)
+        failed = [vm for vm, ok in reverted.items() if not ok]
+        if failed:
+            self.console.print(f"[red]✘ Snapshot revert failed for: {', '.join(failed)}[/red]"); return False
+        if self.guest_urls:
+            reachable = await wait_until_reachable(self.guest_urls, self.timeout)
+            down = [u for u, ok in reachable.items() if not ok]
+            if down:
+                self.console.print(f"[red]✘ Guest backend(s) not reachable after revert: {', '.join(down)}[/red]"); return False
+        self.console.print("[dim white]✔ Guests reverted and backends reachable.[/dim white]")
+        return True
+
+    def close(self):
+        for manager in self.managers.values(): manager.session.close()
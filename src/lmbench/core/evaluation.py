@@ -0,0 +1,186 @@
+import asyncio
+import hashlib
+import json
+import re
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+from rich.console import Console
+from ..backends.base import BaseBackend
+
+ANSWER_CACHE_PATH = Path.home() / ".lmbench" / "answers.jsonl"
+_THINK = re.compile(r"<think>.*?</think>", re.S)
+
+def load_dataset(path: str) -> Iterator[Dict]:
+    """
+    Stream items from a JSONL file, one object per line: {"prompt": ..., "expected": ...} or {"prompt": ..., "regex": ...}.
+    `expected` may be a string or a list of accepted answers; an optional `id` names the item in reports.
+    Items with "type": "structured" pass when the answer is valid JSON; `format` ("json" or a schema) constrains decoding.
+    """
+    with open(path, encoding="utf-8") as f:
+        for n, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"): continue
+            item = json.loads(line)
+            if "prompt" not in item:
+                raise ValueError(f"{path}:{n}: item has no 'prompt'")
+            item.setdefault("id", str(n))
+            yield item
+
+_FENCE = re.compile(r"^```(?:json)?\s*(.*?)\s*```$", re.S)
+
+def has_reference(item: Dict) -> bool:
+    return "expected" in item or "regex" in item or item.get("type") == "structured"
+
+def _matches_schema(value, schema: Dict) -> bool:
+    """The JSON-schema subset our tests use: type, properties, required, items, enum."""
+    kind = schema.get("type")
+    types = {"object": dict, "array": list, "string": str, "boolean": bool, "null": type(None)}
+    if kind in ("integer", "number"):
+        if isinstance(value, bool) or not isinstance(value, int if kind == "integer" else (int, float)): return False
+    elif kind in types and not isinstance(value, types[kind]): return False
+    if "enum" in schema and value not in schema["enum"]: return False
+    if isinstance(value, dict):
+        if any(k not in value for k in schema.get("required", [])): return False
+        props = schema.get("properties", {})
+        return all(_matches_schema(v, props[k]) for k, v in value.items() if k in props)
+    if isinstance(value, list) and "items" in schema:
+        return all(_matches_schema(v, schema["items"]) for v in value)
+    return True
+
+def parse_json_answer(output: str):
+    """Parse a JSON answer, tolerating reasoning blocks and a Markdown code fence. Raises ValueError."""
+    answer = _THINK.sub("", output).strip()
+    fenced = _FENCE.match(answer)
+    return json.loads(fenced.group(1) if fenced else answer)
+
+def score_answer(output: str, item: Dict) -> bool:
+    """
+    Structured items pass when the answer parses as JSON (and matches `schema`, if given).
+    `regex` is searched in the whole answer (case-insensitive). `expected` must appear as a whole word on the
+    answer's last non-empty line, where models put their conclusion, so "3 brothers ... 1 sister" is judged on "1".
+    Reasoning blocks (<think>...</think>) are ignored.
+    """
+    if item.get("type") == "structured":
+        try:
+            value = parse_json_answer(output)
+        except ValueError:
+            return False
+        return _matches_schema(value, item["schema"]) if item.get("schema") else True
+    answer = _THINK.sub("", output).strip()
+    if "regex" in item:
+        return re.search(item["regex"], answer, re.I) is not None
+    lines = [l for l in answer.splitlines() if l.strip()]
+    final = lines[-1] if lines else ""
+    expected = item["expected"] if isinstance(item["expected"], list) else [item["expected"]]
+    return any(re.search(rf"(?<!\w){re.escape(str(e).strip())}(?!\w)", final, re.I) for e in expected)
+
+class AnswerCache:
+    """Append-only JSONL of generated answers keyed by (model, prompt, options); reruns only query what is missing."""
+    def __init__(self, path: Path = ANSWER_CACHE_PATH):
+        self.path = path
+        self.entries: Dict[str, Dict] = {}
+        if path.exists():
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line); self.entries[entry["key"]] = entry
+                    except (ValueError, KeyError):
+                        continue  # a torn last line from an interrupted run
+        self._file = None
+
+    @staticmethod
+    def key(model: str, prompt: str, options: Optional[Dict]) -> str:
+        raw = json.dumps([model, prompt, options or {}], sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        return self.entries.get(key)
+
+    def put(self, key: str, entry: Dict):
+        entry = {"key": key, **entry}; self.entries[key] = entry
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(entry) + "\n"); self._file.flush()
+
+    def close(self):
+        if self._file: self._file.close(); self._file = None
+
+class Evaluator:
+    """Runs a dataset against one model with at most `concurrency` requests in flight and scores every answer."""
+    def __init__(self, backend: BaseBackend, concurrency: int = 4, cache: Optional[AnswerCache] = None):
+        self.backend = backend
+        self.concurrency = max(1, concurrency)
+        self.cache = cache
+        self.console = Console()
+
+    async def _generate(self, model: str, prompt: str, options: Optional[Dict]) -> Dict:
+        start = time.perf_counter(); first = None; parts: List[str] = []; tokens = 0; payload = None
+        async for event in self.backend.stream_events(model, prompt, options):
+            if event.text:
+                if first is None: first = time.perf_counter()
+                parts.append(event.text); tokens += 1
+            if event.done: payload = event.payload; break
+        end = time.perf_counter()
+        tokens = (payload or {}).get("eval_count") or tokens
+        return {"output": "".join(parts), "tokens": tokens, "ttft_ms": ((first or end) - start) * 1000, "elapsed_s": end - start}
+
+    async def evaluate(self, model: str, dataset: Union[str, Iterable[Dict]], options: Optional[Dict] = None, name: Optional[str] = None) -> Dict:
+        """`dataset` is a JSONL path or already-loaded items (each with `id` and `prompt`); `name` labels the latter."""
+        name = name or (dataset if isinstance(dataset, str) else "built-in")
+        items = enumerate(load_dataset(dataset) if isinstance(dataset, str) else dataset)  # shared iterator: workers pull the next item as they free up
+        rows: List[Dict] = []; generated_tokens = 0
+
+        async def worker():
+            nonlocal generated_tokens
+            for index, item in items:
+                request_options = {**(options or {}), "format": item["format"]} if item.get("format") else options
+                key = AnswerCache.key(model, item["prompt"], request_options)
+                answer = self.cache.get(key) if self.cache else None
+                cached = answer is not None
+                if not cached:
+                    try:
+                        answer = await self._generate(model, item["prompt"], request_options)
+                    except Exception as e:
+                        rows.append({"index": index, "id": item["id"], "status": f"Error: {e}", "correct": False, "cached": False}); continue
+                    generated_tokens += answer["tokens"]
+                    if self.cache: self.cache.put(key, {"model": model, "options": options or {}, **answer})
+                correct = score_answer(answer["output"], item) if has_reference(item) else None
+                decode_s = answer["elapsed_s"] - answer["ttft_ms"] / 1000
+                rows.append({"index": index, "id": item["id"], "status": "Success", "correct": correct, "cached": cached, "tokens": answer["tokens"],
+                             "ttft_ms": answer["ttft_ms"], "tps": (answer["tokens"] - 1) / decode_s if decode_s > 0 and answer["tokens"] > 1 else 0.0})
+
+        self.console.print(f"[bold white]Evaluating[/bold white] {model} on {name} [dim](concurrency {self.concurrency})[/dim]")
+        await self.backend.load_model(model, options)
+        start = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(self.concurrency)])
+        wall = time.perf_counter() - start
+
+        rows.sort(key=lambda r: r.pop("index"))  # dataset order
+        ok = [r for r in rows if r["status"] == "Success"]
+        scored = [r for r in rows if r["correct"] is not None or r["status"] != "Success"]
+        correct = sum(1 for r in scored if r["correct"])
+        fresh = [r for r in ok if not r["cached"]]
+        return {
+            "model": model, "options": options or {}, "dataset": name,
+            "items": len(rows), "scored": len(scored), "correct": correct,
+            "accuracy": correct / len(scored) if scored else 0.0,
+            "errors": len(rows) - len(ok), "cached": len(ok) - len(fresh),
+            # Per-request decode speed is comparable across runs; aggregate throughput only covers this run's requests
+            "tps": sum(r["tps"] for r in ok) / len(ok) if ok else 0.0,
+            "ttft_ms": sum(r["ttft_ms"] for r in ok) / len(ok) if ok else 0.0,
+            "aggregate_tps": generated_tokens / wall if fresh and wall else 0.0,
+            "wall_s": wall, "results": rows,
+        }
+
+def pareto_front(summaries: List[Dict], maximize: Sequence[str] = ("tps", "accuracy"), minimize: Sequence[str] = ()) -> List[Dict]:
+    """Runs not beaten on every objective (default: speed and accuracy) by any other run."""
+    def key(s: Dict) -> List[float]:
+        return [s[k] for k in maximize] + [-s[k] for k in minimize]
+    points = [(s, key(s)) for s in summaries]
+    return [s for s, p in points if not any(o is not s and q != p and all(a >= b for a, b in zip(q, p)) for o, q in points)]
+
+def fastest_good_enough(summaries: List[Dict], min_accuracy: float) -> Optional[Dict]:
+    good = [s for s in summaries if s["accuracy"] >= min_accuracy and s["errors"] < s["items"]]
+    return max(good, key=lambda s: s["tps"]) if good else None
@@ -0,0 +1,129 @@
+import json
+import sys
+import time
+from dataclasses import dataclass
+from typing import Any, ClassVar, Dict, List, Optional, TextIO
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# All timestamps (`t`, `start`, `end`) are time.perf_counter() seconds; sinks convert as needed.
+
+@dataclass(slots=True)
+class RoundStart:
+    kind: ClassVar[str] = "round_start"
+    t: float
+    round_id: int
+    model: str
+    backend: str
+    test: str
+    options: Optional[Dict]
+    round: int
+    rounds: int
+
+@dataclass(slots=True)
+class Phase:
+    """A timed step outside token streaming (eject, load) that precedes the next round."""
+    kind: ClassVar[str] = "phase"
+    name: str
+    start: float
+    end: float
+    model: str
+
+@dataclass(slots=True)
+class FirstToken:
+    kind: ClassVar[str] = "first_token"
+    t: float
+    round_id: int
+    ttft_s: float
+
+@dataclass(slots=True)
+class Token:
+    kind: ClassVar[str] = "token"
+    t: float
+    round_id: int
+    index: int
+    text: str
+    itl_s: Optional[float]
+    tps: float
+
+@dataclass(slots=True)
+class TelemetrySample:
+    kind: ClassVar[str] = "telemetry_sample"
+    t: float
+    round_id: Optional[int]
+    sample: Dict[str, Any]
+
+@dataclass(slots=True)
+class RoundEnd:
+    kind: ClassVar[str] = "round_end"
+    t: float
+    round_id: int
+    status: str
+    start: float
+    first_token: Optional[float]
+    tokens: int
+    ttft_ms: float
+    tps: float
+    backend_load_s: float = 0.0  # load time reported inside the stream (Ollama load_duration)
+
+@dataclass(slots=True)
+class SuiteEnd:
+    kind: ClassVar[str] = "suite_end"
+    t: float
+    results: List[Dict]
+
+def event_to_dict(event) -> Dict:
+    data = {"event": event.kind}
+    for name in event.__slots__: data[name] = getattr(event, name)
+    return data
+
+class EventBus:
+    """
+    Fan-out of engine events to pluggable sinks (objects with `handle(event)` and optional `close()`).
+    Emitters check `bus.active` before building per-token events, so an idle bus costs one attribute read.
+    """
+    def __init__(self, sinks: Optional[List] = None):
+        self.sinks = list(sinks or [])
+        self.active = bool(self.sinks)
+        self._next_round_id = 0
+
+    def subscribe(self, sink):
+        self.sinks.append(sink); self.active = True
+        return sink
+
+    def new_round_id(self) -> int:
+        self._next_round_id += 1
+        return self._next_round_id
+
+    def emit(self, event):
+        for sink in self.sinks: sink.handle(event)
+
+    def close(self):
+        for sink in self.sinks:
+            close = getattr(sink, "close", None)
+            if close: close()
+
+class NDJSONSink:
+    """One JSON object per line; perf_counter timestamps become Unix epoch seconds."""
+    def __init__(self, stream: Optional[TextIO] = None, path: Optional[str] = None, tokens: bool = True):
+        self._owned = path is not None and path != "-"
+        self.stream = open(path, "w", encoding="utf-8") if self._owned else (stream or sys.stdout)
+        self.tokens = tokens
+        self._offset = time.time() - time.perf_counter()
+
+    def handle(self, event):
+        if not self.tokens and event.kind == "token": return
+        data = event_to_dict(event)
+        for key in ("t", "start", "end", "first_token"):
+            if data.get(key) is not None: data[key] = round(data[key] + self._offset, 6)
+        line = orjson.dumps(data, default=str).decode() if HAS_ORJSON else json.dumps(data, default=str, separators=(",", ":"))
+        self.stream.write(line + "\n")
+        if event.kind != "token": self.stream.flush()
+
+    def close(self):
+        if self._owned: self.stream.close()
+        else: self.stream.flush()
@@ -0,0 +1,142 @@
+import asyncio
+import hmac
+import ipaddress
+import json
+from typing import Dict, List, Optional, Tuple
+import httpx
+from rich.console import Console
+from ..backends.base import BaseBackend
+
+DEFAULT_AGENT_PORT = 8765
+MAX_BODY_BYTES = 16 * 1024 * 1024
+
+class AgentServer:
+    """
+    Exposes the local benchmark engine over a small JSON-over-HTTP API:
+      GET  /info  -> version, hardware fingerprint, system profile and backend models
+      POST /run   -> {"models", "tests", "matrix", "rounds"} -> benchmark results
+    Runs are serialised: a host only ever benchmarks one suite at a time. Anything but loopback needs a token,
+    since /run starts work on this machine.
+    """
+    def __init__(self, backend: BaseBackend, host: str = "127.0.0.1", port: int = DEFAULT_AGENT_PORT, token: Optional[str] = None):
+        if not token and not _is_loopback(host):
+            raise ValueError(f"Refusing to listen on {host} without a token; pass --token or use --host 127.0.0.1")
+        self.backend, self.host, self.port, self.token = backend, host, port, token
+        self.console = Console()
+        self._run_lock = asyncio.Lock()
+        from ..system.probe import get_system_info
+        self.system_info = get_system_info()
+
+    def info(self) -> Dict:
+        from .. import __version__
+        return {
+            "version": __version__,
+            "fingerprint": self.system_info["fingerprint"],
+            "system": self.system_info,
+            "backend": {"name": self.backend.name, "url": self.backend.url, "models": self.backend.discovered_models},
+        }
+
+    async def run(self, request: Dict) -> Dict:
+        from .engine import execute_suite
+        models = request.get("models") or self.backend.discovered_models[:1]
+        tests = request.get("tests") or []
+        if not models or not tests:
+            raise ValueError("'tests' is required and the agent backend has no models")
+        async with self._run_lock:
+            results = await execute_suite(self.backend, models, tests, request.get("matrix") or [None], int(request.get("rounds", 1)),
+                                          ["Fleet run." for _ in models])
+        for r in results: r["host_fingerprint"] = self.system_info["fingerprint"]
+        return {**self.info(), "results": results}
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        status, payload = 200, None
+        try:
+            method, path, headers, body = await _read_request(reader)
+            if self.token and not hmac.compare_digest(headers.get("authorization", "").encode(), f"Bearer {self.token}".encode()):
+                status, payload = 401, {"error": "unauthorized"}
+            elif method == "GET" and path == "/info":
+                payload = self.info()
+            elif method == "POST" and path == "/run":
+                payload = await self.run(json.loads(body or b"{}"))
+            else:
+                status, payload = 404, {"error": f"no route for {method} {path}"}
+        except ValueError as e:
+            status, payload = 400, {"error": str(e)}
+        except Exception as e:
+            status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+        try:
+            data = json.dumps(payload).encode()
+            writer.write(f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\nContent-Type: application/json\r\n"
+                         f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode() + data)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def start(self) -> asyncio.AbstractServer:
+        """Bind and accept connections in the background; with port 0, `self.port` becomes the one the OS picked."""
+        server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = server.sockets[0].getsockname()[1]
+        return server
+
+    async def serve_forever(self):
+        server = await self.start()
+        self.console.print(f"[bold green]LMBench agent[/bold green] listening on {self.host}:{self.port} "
+                           f"([dim]{self.backend.name}, host {self.system_info['fingerprint']}[/dim])")
+        async with server:
+            await server.serve_forever()
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost": return True
+    try: return ipaddress.ip_address(host).is_loopback
+    except ValueError: return False
+
+async def _read_request(reader: asyncio.StreamReader) -> Tuple[str, str, Dict[str, str], bytes]:
+    request_line = (await reader.readline()).decode("latin-1").strip()
+    parts = request_line.split()
+    if len(parts) < 2: raise ValueError("malformed request line")
+    headers = {}
+    while True:
+        line = (await reader.readline()).decode("latin-1").strip()
+        if not line: break
+        key, _, value = line.partition(":")
+        headers[key.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    if length > MAX_BODY_BYTES: raise ValueError("request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return parts[0].upper(), parts[1], headers, body
+
+def _agent_url(agent: str) -> str:
+    if "://" not in agent: agent = f"http://{agent}"
+    if agent.count(":") < 2: agent = f"{agent}:{DEFAULT_AGENT_PORT}"
+    return agent.rstrip("/")
+
+class Coordinator:
+    """Fans a suite out to many agents in parallel and gathers their results."""
+    def __init__(self, agents: List[str], token: Optional[str] = None):
+        self.agents = [_agent_url(a) for a in agents]
+        self.headers = {"Authorization": f"Bearer {token}"} if token else {}
+        self.console = Console()
+
+    async def _call(self, client: httpx.AsyncClient, agent: str, method: str, path: str, body: Optional[Dict] = None) -> Dict:
+        try:
+            response = await client.request(method, f"{agent}{path}", json=body, headers=self.headers)
+            data = response.json()
+            if response.status_code != 200:
+                return {"agent": agent, "error": data.get("error", f"HTTP {response.status_code}")}
+            return {"agent": agent, **data}
+        except Exception as e:
+            return {"agent": agent, "error": f"{type(e).__name__}: {e}"}
+
+    async def info(self) -> List[Dict]:
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            return await asyncio.gather(*[self._call(client, a, "GET", "/info") for a in self.agents])
+
+    async def run(self, tests: List[Dict], models: Optional[List[str]] = None, matrix: Optional[List[Dict]] = None, rounds: int = 1) -> List[Dict]:
+        body = {"models": models, "tests": tests, "matrix": matrix, "rounds": rounds}
+        self.console.print(f"[bold white]Dispatching suite to {len(self.agents)} agent(s)...[/bold white]")
+        async with httpx.AsyncClient(timeout=None) as client:
+            hosts = await asyncio.gather(*[self._call(client, a, "POST", "/run", body) for a in self.agents])
+        for h in hosts:
+            if "error" in h: self.console.print(f"[red]✘ {h['agent']}: {h['error']}[/red]")
+            else: self.console.print(f"[green]✔ {h['agent']}[/green] [dim]({h['fingerprint']}, {len(h['results'])} results)[/dim]")
+        return hosts
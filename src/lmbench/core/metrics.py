@@ -0,0 +1,146 @@
+import json
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+TTFT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+ITL_BUCKETS = (0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.25, 0.5, 1.0)
+LABEL_NAMES = ("model", "backend", "test", "option")
+
+def metric_labels(model: str, backend: str, test: str, options: Optional[Dict]) -> Tuple[str, ...]:
+    """Label values in LABEL_NAMES order; options are rendered as compact JSON ("default" when empty)."""
+    option = json.dumps(options, sort_keys=True, separators=(",", ":")) if options else "default"
+    return model, backend, test, option
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _fmt_labels(names, values, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra: parts.append(extra)
+    return "{" + ",".join(parts) + "}"
+
+class _Histogram:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds; self.counts = [0] * (len(bounds) + 1); self.sum = 0.0; self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1; self.sum += value; self.count += 1
+
+class MetricsExporter:
+    """
+    Live benchmark metrics in OpenMetrics text format on http://host:port/metrics.
+    Subscribes to the engine's EventBus; Prometheus (and Grafana on top) scrapes it while a suite runs.
+    """
+    def __init__(self, host: str = "127.0.0.1", port: int = 9464):
+        self.host, self.port = host, port
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self.tps: Dict[Tuple, float] = {}
+        self.tokens: Dict[Tuple, int] = {}
+        self.ttft: Dict[Tuple, _Histogram] = {}
+        self.itl: Dict[Tuple, _Histogram] = {}
+        self.running: Dict[Tuple, int] = {}
+        self.rounds: Dict[Tuple, int] = {}  # labels + (status,)
+        self.gpu: Dict[Tuple, Dict[str, float]] = {}
+        self._labels: Dict[int, Tuple] = {}  # round_id -> labels
+
+    # --- event sink ---------------------------------------------------------
+    def handle(self, event):
+        kind = event.kind
+        if kind == "round_start":
+            labels = self._labels[event.round_id] = metric_labels(event.model, event.backend, event.test, event.options)
+            self.round_start(labels); return
+        labels = self._labels.get(getattr(event, "round_id", None))
+        if labels is None: return
+        if kind == "token": self.token(labels, event.itl_s, event.tps)
+        elif kind == "first_token": self.first_token(labels, event.ttft_s)
+        elif kind == "telemetry_sample": self.telemetry(labels, event.sample)
+        elif kind == "round_end":
+            self.round_end(labels, event.tps, "success" if event.status == "success" else "error")
+            del self._labels[event.round_id]
+
+    # --- metric updates -------------------------------------------------------
+    def round_start(self, labels: Tuple):
+        with self._lock:
+            self.running[labels] = 1; self.tps[labels] = 0.0
+            self.tokens.setdefault(labels, 0)
+
+    def first_token(self, labels: Tuple, ttft_s: float):
+        with self._lock:
+            hist = self.ttft.get(labels)
+            if hist is None: hist = self.ttft[labels] = _Histogram(TTFT_BUCKETS)
+            hist.observe(ttft_s)
+
+    def token(self, labels: Tuple, itl_s: Optional[float], tps: float):
+        with self._lock:
+            self.tokens[labels] = self.tokens.get(labels, 0) + 1; self.tps[labels] = tps
+            if itl_s is not None:
+                hist = self.itl.get(labels)
+                if hist is None: hist = self.itl[labels] = _Histogram(ITL_BUCKETS)
+                hist.observe(itl_s)
+
+    def telemetry(self, labels: Tuple, sample: Dict):
+        with self._lock:
+            self.gpu[labels] = {"power_watts": sample["power"], "temperature_celsius": float(sample["temp"]),
+                                "utilization_percent": float(sample["gpu_util"]), "vram_used_bytes": sample["vram_gb"] * 1024**3}
+
+    def round_end(self, labels: Tuple, tps: float, status: str):
+        with self._lock:
+            self.running[labels] = 0; self.tps[labels] = tps
+            key = labels + (status,)
+            self.rounds[key] = self.rounds.get(key, 0) + 1
+
+    # --- exposition ---------------------------------------------------------
+    def render(self) -> str:
+        out: List[str] = []
+        with self._lock:
+            out += ["# TYPE lmbench_tokens_per_second gauge", "# HELP lmbench_tokens_per_second Decode throughput of the current or last round."]
+            out += [f"lmbench_tokens_per_second{_fmt_labels(LABEL_NAMES, k)} {v}" for k, v in self.tps.items()]
+            out += ["# TYPE lmbench_tokens_generated counter", "# HELP lmbench_tokens_generated Tokens streamed since the exporter started."]
+            out += [f"lmbench_tokens_generated_total{_fmt_labels(LABEL_NAMES, k)} {v}" for k, v in self.tokens.items()]
+            for name, help_text, series in (("lmbench_ttft_seconds", "Time to first token.", self.ttft),
+                                            ("lmbench_inter_token_latency_seconds", "Gap between consecutive tokens.", self.itl)):
+                out += [f"# TYPE {name} histogram", f"# HELP {name} {help_text}"]
+                for k, h in series.items():
+                    cumulative = 0
+                    for bound, count in zip(h.bounds + (float("inf"),), h.counts):
+                        cumulative += count
+                        le = 'le="+Inf"' if bound == float("inf") else f'le="{bound}"'
+                        out.append(f"{name}_bucket{_fmt_labels(LABEL_NAMES, k, le)} {cumulative}")
+                    out.append(f"{name}_count{_fmt_labels(LABEL_NAMES, k)} {h.count}")
+                    out.append(f"{name}_sum{_fmt_labels(LABEL_NAMES, k)} {h.sum}")
+            out += ["# TYPE lmbench_round_running gauge", "# HELP lmbench_round_running 1 while a benchmark round is streaming."]
+            out += [f"lmbench_round_running{_fmt_labels(LABEL_NAMES, k)} {v}" for k, v in self.running.items()]
+            out += ["# TYPE lmbench_rounds counter", "# HELP lmbench_rounds Completed benchmark rounds by status."]
+            out += [f"lmbench_rounds_total{_fmt_labels(LABEL_NAMES + ('status',), k)} {v}" for k, v in self.rounds.items()]
+            for key in ("power_watts", "temperature_celsius", "utilization_percent", "vram_used_bytes"):
+                out.append(f"# TYPE lmbench_gpu_{key} gauge")
+                out += [f"lmbench_gpu_{key}{_fmt_labels(LABEL_NAMES, k)} {v[key]}" for k, v in self.gpu.items()]
+        out.append("# EOF")
+        return "\n".join(out) + "\n"
+
+    def start(self):
+        exporter = self
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_response(404); self.end_headers(); return
+                body = exporter.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers(); self.wfile.write(body)
+            def log_message(self, *args): pass
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="lmbench-metrics", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown(); self._server.server_close(); self._server = None
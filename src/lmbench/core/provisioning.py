@@ -0,0 +1,113 @@
+import asyncio
+import time
+from typing import Dict, List, Optional
+from rich.console import Console
+from ..backends.base import BaseBackend
+from ..system.storage import StorageManager, ollama_models_dir
+
+DISK_HEADROOM_GB = 5.0  # left free after all planned downloads
+
+class BandwidthGovernor:
+    """
+    Caps the average download rate. Ollama's pull API has no rate limit, so the cap is enforced by pausing:
+    once the bytes received run more than a second ahead of `limit x elapsed`, the pull is stopped for that long
+    and then resumed (Ollama keeps partial blobs).
+    """
+    def __init__(self, limit_mbps: float):
+        self.rate = limit_mbps * 1024**2
+        self.start: Optional[float] = None
+        self.bytes = 0
+
+    def add(self, n: int) -> float:
+        """Record `n` downloaded bytes; returns the seconds to pause (0.0 when under the cap)."""
+        now = time.perf_counter()
+        if self.start is None: self.start = now
+        self.bytes += n
+        ahead = self.bytes / self.rate - (now - self.start)
+        return ahead if ahead > 1.0 else 0.0
+
+class Provisioner:
+    """
+    Producer side of `run --top`: pulls missing models one after another in the background, in benchmark order,
+    while the engine benchmarks the models that are already there. `wait(model)` is the consumer's
+    `before_model` hook: it returns once that model is available, or False when it could not be pulled.
+    """
+    def __init__(self, backend: BaseBackend, models: List[str], sizes_gb: Optional[Dict[str, float]] = None,
+                 bandwidth_mbps: Optional[float] = None, retries: int = 3):
+        self.backend = backend
+        self.sizes_gb = sizes_gb or {}
+        self.bandwidth_mbps = bandwidth_mbps
+        self.retries = retries
+        self.to_pull = [m for m in models if m not in backend.discovered_models]
+        self.console = Console()
+        self._ready: Dict[str, asyncio.Future] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def check_disk(self) -> List[str]:
+        """Drop planned pulls that would not fit on the local model disk (keeping benchmark order); returns the dropped ones."""
+        if not self.backend.is_local: return []
+        free = StorageManager.free_gb(ollama_models_dir()) - DISK_HEADROOM_GB
+        kept, dropped = [], []
+        for m in self.to_pull:
+            size = self.sizes_gb.get(m, 0.0)
+            if size <= free: kept.append(m); free -= size
+            else: dropped.append(m)
+        self.to_pull = kept
+        return dropped
+
+    def start(self):
+        loop = asyncio.get_running_loop()
+        self._ready = {m: loop.create_future() for m in self.to_pull}
+        if self.to_pull: self._task = asyncio.create_task(self._produce())
+
+    async def _produce(self):
+        for model in self.to_pull:
+            start = time.perf_counter()
+            ok = await self._pull(model)
+            if ok:
+                self.backend.discovered_models.append(model)
+                self.console.print(f"[green]✔ Pulled {model} in {time.perf_counter() - start:.0f}s[/green]")
+            self._ready[model].set_result(ok)
+
+    async def _pull(self, model: str) -> bool:
+        governor = BandwidthGovernor(self.bandwidth_mbps) if self.bandwidth_mbps else None
+        seen: Dict[str, int] = {}  # bytes completed per layer digest, carried across resumes
+        failures = 0
+        while True:
+            pause = 0.0; error = None; stream = self.backend.pull_model(model)
+            try:
+                async for status in stream:
+                    if "error" in status: raise RuntimeError(status["error"])
+                    if status.get("status") == "success": return True
+                    digest, completed = status.get("digest"), status.get("completed")
+                    if governor and digest and completed is not None:
+                        pause = governor.add(max(0, completed - seen.get(digest, completed)))  # a layer's first report is the baseline
+                        seen[digest] = completed
+                        if pause: break  # closing the stream stops the download; the next request resumes it
+                else:
+                    error = RuntimeError("pull stream ended before success")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error = e
+            finally:
+                await stream.aclose()  # release the connection now, not when the generator is collected
+            if error is None:
+                await asyncio.sleep(pause); continue
+            failures += 1
+            if failures > self.retries:
+                self.console.print(f"[red]✘ Could not pull {model}: {error}[/red]"); return False
+            self.console.print(f"[yellow]Pull of {model} failed ({error}); retry {failures}/{self.retries}[/yellow]")
+            await asyncio.sleep(2 ** failures)
+
+    async def wait(self, model: str) -> bool:
+        future = self._ready.get(model)
+        if future is None: return True
+        if not future.done(): self.console.print(f"[dim]Waiting for {model} to finish downloading...[/dim]")
+        return await future
+
+    async def close(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try: await self._task
+            except asyncio.CancelledError: pass
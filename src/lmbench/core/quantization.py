@@ -0,0 +1,113 @@
+import re
+from typing import Dict, List, Optional
+from rich.console import Console
+from ..backends.base import BaseBackend
+from .engine import BenchmarkEngine, BenchmarkSuite
+from .evaluation import AnswerCache, Evaluator, pareto_front
+
+# Tags pulled by `lmbench quant --pull` when no --quant is given: the usual quality/size ladder
+STANDARD_LADDER = ["q4_K_M", "q5_K_M", "q8_0", "fp16"]
+
+# Approximate bits per weight of llama.cpp / GGUF quantization types (lower-cased)
+BITS_PER_WEIGHT = {
+    "q2_k": 2.63, "q3_k_s": 3.5, "q3_k_m": 3.91, "q3_k_l": 4.27, "iq4_xs": 4.25, "q4_0": 4.55, "q4_1": 5.0,
+    "q4_k_s": 4.58, "q4_k_m": 4.85, "q5_0": 5.54, "q5_1": 6.0, "q5_k_s": 5.54, "q5_k_m": 5.69, "q6_k": 6.59,
+    "q8_0": 8.5, "f16": 16.0, "fp16": 16.0, "bf16": 16.0, "f32": 32.0, "fp32": 32.0,
+}
+_QUANT = re.compile(r"(?i)(?<![a-z0-9])(i?q[1-8](?:_[0-9a-z]+)*|b?fp?16|fp?32)(?![a-z0-9])")
+_PARAMS = re.compile(r"(?i)(?<![a-z0-9.])(\d+(?:\.\d+)?)b(?![a-z0-9])")
+
+# A quick sanity set: arithmetic, reasoning, facts, language and code, each with a checkable answer
+QUICK_EVAL = [
+    {"id": "multiply", "prompt": "What is 17 * 23? Answer with the number only.", "expected": "391"},
+    {"id": "capital", "prompt": "What is the capital of Australia?", "regex": r"canberra"},
+    {"id": "sisters", "prompt": "Sally has 3 brothers. Each of her brothers has 2 sisters. How many sisters does Sally have? End with the number alone on the last line.", "expected": "1"},
+    {"id": "speed", "prompt": "A train travels 60 km in 45 minutes. What is its average speed in km/h? Answer with the number only.", "expected": "80"},
+    {"id": "feathers", "prompt": "Which is heavier: a kilogram of feathers or a kilogram of steel? Answer in one sentence.", "regex": r"\b(same|equal|neither|both)\b"},
+    {"id": "backwards", "prompt": "Spell the word 'necessary' backwards.", "regex": r"yrassecen"},
+    {"id": "sequence", "prompt": "What is the next number in the sequence 2, 6, 12, 20, 30? Answer with the number only.", "expected": "42"},
+    {"id": "translate", "prompt": "Translate 'thank you very much' into Spanish.", "regex": r"muchas gracias"},
+    {"id": "leap", "prompt": "How many days are there in a leap year? Answer with the number only.", "expected": "366"},
+    {"id": "reverse", "prompt": "Write a Python expression that reverses the string s.", "regex": r"\[\s*::\s*-1\s*\]|reversed\("},
+    {"id": "gold", "prompt": "What is the chemical symbol for gold?", "regex": r"\bAu\b"},
+    {"id": "ball", "prompt": "A bat and a ball cost $1.10 in total. The bat costs $1.00 more than the ball. How much does the ball cost, in cents? Answer with the number only.", "expected": "5"},
+]
+QUICK_EVAL_OPTIONS = {"temperature": 0, "num_predict": 256}
+
+def quant_of(model: str) -> Optional[str]:
+    """The quantization named in a model tag or file name ("llama3.1:8b-instruct-q4_K_M" -> "q4_K_M")."""
+    m = _QUANT.search(model)
+    return m.group(1) if m else None
+
+def base_of(model: str) -> str:
+    """The model name without its quantization, lower-cased, so all variants of one model compare equal."""
+    m = _QUANT.search(model)
+    name = model[:m.start()].rstrip("-_.@:") + model[m.end():] if m else model
+    return re.sub(r"\.gguf$", "", name, flags=re.I).lower()
+
+def find_variants(base: str, models: List[str]) -> List[str]:
+    """Available models that are quantizations of `base` (plus `base` itself), lowest precision first."""
+    key = base_of(base)
+    found = [m for m in models if base_of(m) == key and (quant_of(m) or m == base)]
+    return sorted(found, key=lambda m: BITS_PER_WEIGHT.get((quant_of(m) or "").lower(), 99.0))
+
+def estimate_gb(model: str) -> Optional[float]:
+    """Weights (parameters x bits per weight) plus ~15% for KV cache and runtime buffers; None when the tag does not say."""
+    params, quant = _PARAMS.search(model), quant_of(model)
+    bits = BITS_PER_WEIGHT.get(quant.lower()) if quant else None
+    if not params or bits is None: return None
+    return float(params.group(1)) * bits / 8 * 1.15
+
+def recommend(rows: List[Dict], budget_gb: float, tolerance: float) -> Optional[Dict]:
+    """
+    The most accurate variant that fits the memory budget without CPU offload; variants within `tolerance`
+    of that accuracy count as equally good, and the fastest of those wins.
+    """
+    fits = [r for r in rows if r["status"] == "Success" and not r["offloaded"] and r["mem_gb"] is not None and r["mem_gb"] <= budget_gb]
+    if not fits: return None
+    best = max(r["accuracy"] for r in fits)
+    return max((r for r in fits if r["accuracy"] >= best - tolerance), key=lambda r: r["tps"])
+
+def frontier(rows: List[Dict]) -> List[Dict]:
+    """Variants not beaten on speed, memory and accuracy at once by another variant."""
+    ok = [r for r in rows if r["status"] == "Success" and r["mem_gb"] is not None]
+    return pareto_front(ok, maximize=("tps", "accuracy"), minimize=("mem_gb",))
+
+class QuantizationSweep:
+    """
+    Benchmarks every quantization of one model: decode speed, TTFT and load time from the engine, resident size
+    from the backend's loaded-model list (or an estimate from the tag), and accuracy on QUICK_EVAL.
+    """
+    def __init__(self, backend: BaseBackend, rounds: int = 2, concurrency: int = 4, cache: Optional[AnswerCache] = None):
+        self.backend = backend
+        self.rounds = rounds
+        self.evaluator = Evaluator(backend, concurrency, cache)
+        self.console = Console()
+
+    async def _resident(self, model: str) -> Optional[Dict]:
+        """Ollama's /api/ps entry for the model: `size` bytes in memory, `size_vram` of them on the GPU."""
+        for entry in await self.backend.get_loaded_models():
+            if entry.get("name") == model and isinstance(entry.get("size"), int): return entry
+        return None
+
+    async def run(self, variants: List[str]) -> List[Dict]:
+        engine = BenchmarkEngine(self.backend); rows = []
+        for model in variants:
+            quant = quant_of(model) or "default"
+            result = await engine.run_benchmark(model, BenchmarkSuite.get_burst_test(), None, self.rounds, f"Quantization ladder: {quant}")
+            row = {"model": model, "quant": quant, "bits": BITS_PER_WEIGHT.get(quant.lower()), "status": result["status"],
+                   "tps": result["tps"], "ttft_ms": result["ttft_ms"], "load_ms": result.get("load_ms", 0.0),
+                   "mem_gb": None, "mem_measured": False, "offloaded": False, "accuracy": 0.0, "correct": 0, "scored": 0}
+            if result["status"] != "Success":
+                rows.append(row); continue
+            resident = await self._resident(model)
+            if resident:
+                row["mem_gb"], row["mem_measured"] = resident["size"] / (1024**3), True
+                row["offloaded"] = 0 < resident.get("size_vram", resident["size"]) < resident["size"]  # partly in system RAM
+            else:
+                row["mem_gb"] = estimate_gb(model)
+            summary = await self.evaluator.evaluate(model, QUICK_EVAL, QUICK_EVAL_OPTIONS, name="quick eval")
+            row.update(accuracy=summary["accuracy"], correct=summary["correct"], scored=summary["scored"])
+            rows.append(row)
+        await self.backend.unload_all()
+        return rows
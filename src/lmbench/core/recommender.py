@@ -1,11 +1,13 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 from rich.console import Console
 from rich.table import Table
+from .catalog import ModelCatalog, tier_of
 from .registry import ModelRegistry
 
 class Recommender:
-    def __init__(self, system_info: Dict, intent: str = "G"):
+    def __init__(self, system_info: Dict, intent: str = "G", catalog: Optional[ModelCatalog] = None):
         self.info = system_info
+        self.catalog = catalog # real sizes for installed models
         self.console = Console()
         self.intent = intent # C, A, R, G
         
@@ -29,12 +31,38 @@ class Recommender:
         if self.is_cpu_only:
             self.vram = self.info.get("ram_total_gb", 8) * 0.5
 
+    def _sized(self, candidates: List[Dict]) -> List[Dict]:
+        """Replace the registry's guessed sizes with the catalog's estimate for models that are installed."""
+        if not self.catalog: return candidates
+        sized = []
+        for m in candidates:
+            gb = self.catalog.estimate_gb(m["id"])
+            sized.append({**m, "vram_gb": round(gb, 1), "measured": True} if gb is not None else m)
+        return sized
+
+    def _installed_extras(self) -> List[Dict]:
+        """Installed text models the registry does not list, sized and tiered from their own metadata."""
+        if not self.catalog: return []
+        known = {m["id"] for m in ModelRegistry.CANDIDATES} | {f"{m['id']}:latest" for m in ModelRegistry.CANDIDATES}
+        extras = []
+        for name in self.catalog.installed():
+            facts, gb = self.catalog.get(name), self.catalog.estimate_gb(name)
+            if name in known or gb is None or {"embedding", "vision"} & set(facts.get("capabilities") or []): continue
+            if ModelRegistry.is_embedding(name) or ModelRegistry.is_vision(name): continue
+            extras.append({"id": name, "name": name, "vram_gb": round(gb, 1), "type": "General", "tier": tier_of(facts.get("parameters")),
+                           "reason": "Installed; sized from its own metadata.", "measured": True})
+        return extras
+
+    def _fits(self, m: Dict, headroom: float = 1.2) -> bool:
+        # Registry sizes are rough (allow 20% overhead for quantization); catalog estimates already include the KV cache
+        return m["vram_gb"] <= self.vram * (1.0 if m.get("measured") else headroom)
+
     def select_top_10(self) -> List[Dict]:
-        candidates = ModelRegistry.get_candidates()
+        candidates = self._sized(ModelRegistry.get_candidates()) + self._installed_extras()
         selected = []
         
-        # Filter runnable (allow 20% overhead for quantization)
-        runnable = [m for m in candidates if m["vram_gb"] <= (self.vram * 1.2)]
+        # Filter runnable
+        runnable = [m for m in candidates if self._fits(m)]
         
         # Selection priority based on intent
         primary_type = self.intent_map.get(self.intent, "General")
@@ -63,6 +91,17 @@ class Recommender:
                 
         return selected[:10]
 
+    def select_embedding_models(self, n: int = 3) -> List[Dict]:
+        """Smallest-first embedding models that fit; on CPU-only systems prefer the lightest ones."""
+        runnable = [m for m in self._sized(ModelRegistry.get_embedding_candidates()) if self._fits(m, 1.0)]
+        if self.is_cpu_only: runnable.sort(key=lambda m: m["vram_gb"])
+        return runnable[:n]
+
+    def select_vision_models(self, n: int = 3) -> List[Dict]:
+        """Largest vision models that fit (image encoders need headroom, so only 100% of VRAM, not 120%)."""
+        runnable = [m for m in self._sized(ModelRegistry.get_vision_candidates()) if self._fits(m, 1.0)]
+        return sorted(runnable, key=lambda m: m["vram_gb"], reverse=True)[:n]
+
     def print_recommendations(self):
         selected = self.select_top_10()
         
@@ -87,4 +126,16 @@ class Recommender:
             )
             
         self.console.print(table)
+
+        for title, models in (("Vision Models (image input)", self.select_vision_models()), ("Embedding Models (for retrieval)", self.select_embedding_models())):
+            if not models: continue
+            table = Table(title=title, box=None)
+            table.add_column("Model ID", style="bold green")
+            table.add_column("Tier", style="dim")
+            table.add_column("Min VRAM", justify="right")
+            table.add_column("Why", style="white")
+            for m in models:
+                table.add_row(m["id"], m["tier"], f"{m['vram_gb']}GB", m["reason"])
+            self.console.print("\n")
+            self.console.print(table)
         self.console.print(f"\n[dim]Note: Run 'lmbench pull <id>' to fetch any of these models.[/dim]")
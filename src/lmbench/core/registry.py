@@ -23,9 +23,48 @@ class ModelRegistry:
         {"id": "llama3:70b", "name": "Llama 3 (70B)", "vram_gb": 40, "type": "Reasoning", "tier": "Large", "reason": "State-of-the-art open reasoning for high-end GPUs."},
         {"id": "mixtral:8x7b", "name": "Mixtral (8x7B)", "vram_gb": 24, "type": "General", "tier": "Large", "reason": "High-throughput Mixture of Experts (MoE)."},
         {"id": "codestral", "name": "Codestral (22B)", "vram_gb": 18, "type": "Code", "tier": "Large", "reason": "Dense model optimized for advanced programming tasks."},
-        {"id": "command-r", "name": "Command R (35B)", "vram_gb": 24, "type": "Tool Use", "tier": "Large", "reason": "Optimized for tool calling and RAG workflows."}
+        {"id": "command-r", "name": "Command R (35B)", "vram_gb": 24, "type": "Tool Use", "tier": "Large", "reason": "Optimized for tool calling and RAG workflows."},
+
+        # Vision models (image input); benchmarked with `lmbench run --vision`
+        {"id": "moondream", "name": "Moondream 2 (1.8B)", "vram_gb": 2, "type": "Vision", "tier": "Edge", "reason": "Tiny vision-language model for captioning on small GPUs."},
+        {"id": "gemma3:4b", "name": "Gemma 3 (4B)", "vram_gb": 5, "type": "Vision", "tier": "Edge", "reason": "Compact multimodal model with a strong image encoder."},
+        {"id": "llava:7b", "name": "LLaVA 1.6 (7B)", "vram_gb": 6, "type": "Vision", "tier": "Mid", "reason": "The reference open vision-language model."},
+        {"id": "minicpm-v", "name": "MiniCPM-V 2.6 (8B)", "vram_gb": 7, "type": "Vision", "tier": "Mid", "reason": "High-resolution image understanding and OCR."},
+        {"id": "qwen2.5vl:7b", "name": "Qwen 2.5 VL (7B)", "vram_gb": 8, "type": "Vision", "tier": "Mid", "reason": "Strong document, chart and OCR understanding."},
+        {"id": "llama3.2-vision:11b", "name": "Llama 3.2 Vision (11B)", "vram_gb": 12, "type": "Vision", "tier": "Mid", "reason": "Meta's multimodal Llama for image reasoning."},
+
+        # Embedding models (retrieval); benchmarked with `lmbench run --embed`
+        {"id": "all-minilm", "name": "all-MiniLM (23M)", "vram_gb": 1, "type": "Embedding", "tier": "Edge", "reason": "Tiny, very fast sentence embeddings for CPU-only retrieval."},
+        {"id": "nomic-embed-text", "name": "Nomic Embed Text (137M)", "vram_gb": 1, "type": "Embedding", "tier": "Edge", "reason": "Long-context (8k) embeddings with strong retrieval quality."},
+        {"id": "snowflake-arctic-embed:335m", "name": "Snowflake Arctic Embed (335M)", "vram_gb": 1, "type": "Embedding", "tier": "Mid", "reason": "Retrieval-tuned embeddings with a good speed/quality balance."},
+        {"id": "mxbai-embed-large", "name": "mxbai Embed Large (335M)", "vram_gb": 2, "type": "Embedding", "tier": "Mid", "reason": "High-accuracy English embeddings for RAG."},
+        {"id": "bge-m3", "name": "BGE-M3 (567M)", "vram_gb": 2, "type": "Embedding", "tier": "Mid", "reason": "Multilingual, multi-granularity embeddings up to 8k tokens."}
     ]
 
     @classmethod
     def get_candidates(cls) -> List[Dict]:
-        return cls.CANDIDATES
+        """Text-generation candidates."""
+        return [m for m in cls.CANDIDATES if m["type"] not in ("Embedding", "Vision")]
+
+    @classmethod
+    def get_vision_candidates(cls) -> List[Dict]:
+        return [m for m in cls.CANDIDATES if m["type"] == "Vision"]
+
+    @classmethod
+    def is_vision(cls, model_id: str) -> bool:
+        """Registry vision models (same family and size) and anything named like one."""
+        name = model_id.lower().split("/")[-1]
+        if any(k in name for k in ("llava", "vision", "-vl", "vl:", "moondream", "bakllava")): return True
+        family, _, tag = name.partition(":")
+        return any(family == m["id"].split(":")[0] and (":" not in m["id"] or tag.startswith(m["id"].split(":")[1]))
+                   for m in cls.get_vision_candidates())
+
+    @classmethod
+    def get_embedding_candidates(cls) -> List[Dict]:
+        return [m for m in cls.CANDIDATES if m["type"] == "Embedding"]
+
+    @classmethod
+    def is_embedding(cls, model_id: str) -> bool:
+        """Registry embedding models (any tag) and anything named like one."""
+        base = model_id.split(":")[0].split("/")[-1].lower()
+        return "embed" in base or any(base == m["id"].split(":")[0] for m in cls.get_embedding_candidates())
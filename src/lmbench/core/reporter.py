@@ -1,10 +1,14 @@
 import json
 import os
+import re
 from datetime import datetime
-from typing import List, Dict
+from typing import Callable, Dict, List, Optional, TextIO
 from rich.console import Console
 from rich.table import Table
 
+def _pct(value) -> str:
+    return "-" if value is None else f"{value:+.1f}%"
+
 class Reporter:
     def __init__(self, system_info: Dict):
         self.system_info = system_info
@@ -20,7 +24,8 @@ class Reporter:
         for r in results:
             r["score"] = ComparisonEngine.calculate_score(r)
         
-        sorted_results = sorted(results, key=lambda x: x["score"], reverse=True)
+        # Embedding, agent-loop and vision runs get their own tables; generation scores do not apply to them
+        sorted_results = sorted([r for r in results if r.get("test_type") not in ("embedding", "agent", "vision")], key=lambda x: x["score"], reverse=True)
 
         table = Table(title="LMBench Rankings", box=None)
         table.add_column("Rank", justify="center")
@@ -53,17 +58,111 @@ class Reporter:
                 q_val
             )
         
-        self.console.print("\n")
-        self.console.print(table)
+        if sorted_results:
+            self.console.print("\n")
+            self.console.print(table)
+
+        embedding = [r for r in results if r.get("test_type") == "embedding"]
+        if embedding:
+            table = Table(title="Embedding Throughput", box=None)
+            table.add_column("Model", style="bold cyan")
+            table.add_column("Batch", justify="right")
+            table.add_column("Words/input", justify="right")
+            table.add_column("Embeddings/s", style="magenta", justify="right")
+            table.add_column("Tokens/s", justify="right")
+            table.add_column("p50 (ms)", justify="right")
+            table.add_column("p90 (ms)", justify="right")
+            table.add_column("p99 (ms)", justify="right")
+            for r in embedding:
+                if r.get("status") != "Success":
+                    table.add_row(r["model"], "-", "-", f"[red]{r.get('status')}[/red]", "-", "-", "-", "-"); continue
+                table.add_row(r["model"], str(r["batch_size"]), str(r["input_words"]), f"{r['embeddings_per_s']:.1f}",
+                              f"{r['tps']:.0f}" + ("*" if r.get("tokens_estimated") else ""),
+                              f"{r['latency_p50_ms']:.1f}", f"{r['latency_p90_ms']:.1f}", f"{r['latency_p99_ms']:.1f}")
+            self.console.print("\n")
+            self.console.print(table)
+            if any(r.get("tokens_estimated") for r in embedding):
+                self.console.print("[dim]* backend did not report token usage; estimated from word count[/dim]")
+
+        vision = [r for r in results if r.get("test_type") == "vision"]
+        if vision:
+            table = Table(title="Vision Prefill", box=None)
+            table.add_column("Model", style="bold cyan")
+            table.add_column("Images", justify="right")
+            table.add_column("TTFT (ms)", style="bold", justify="right")
+            table.add_column("Text TTFT", justify="right")
+            table.add_column("Encode / image", style="magenta", justify="right")
+            table.add_column("Tokens / image", justify="right")
+            table.add_column("Decode TPS", justify="right")
+            table.add_column("VRAM / image", justify="right")
+            for r in vision:
+                if r.get("status") != "Success":
+                    table.add_row(r["model"], "-", "-", "-", "-", "-", "-", f"[red]{r.get('status')}[/red]"); continue
+                table.add_row(r["model"], f"{r['images']} x {r['image_size']}px", f"{r['ttft_ms']:.0f}", f"{r['text_ttft_ms']:.0f}",
+                              f"{r['encode_ms_per_image']:.0f} ms", f"{r['tokens_per_image']:.0f}" if r["tokens_per_image"] is not None else "-",
+                              f"{r['tps']:.1f}", f"{r['vram_per_image_gb'] * 1024:.0f} MB" if r["vram_per_image_gb"] is not None else "-")
+            self.console.print("\n")
+            self.console.print(table)
+
+        agent = [r for r in results if r.get("test_type") == "agent"]
+        if agent:
+            table = Table(title="Agent Loop Latency", box=None)
+            table.add_column("Model", style="bold cyan")
+            table.add_column("Steps", justify="right")
+            table.add_column("Per step (ms)", style="magenta", justify="right")
+            table.add_column("Follow-up TTFT (ms)", style="bold", justify="right")
+            table.add_column("First TTFT (ms)", justify="right")
+            table.add_column("Loop (s)", justify="right")
+            table.add_column("Malformed", justify="right")
+            table.add_column("Completed", justify="right")
+            for r in sorted(agent, key=lambda r: r.get("loop_ms", float("inf"))):
+                if r.get("status") != "Success":
+                    table.add_row(r["model"], "-", "-", "-", "-", "-", "-", f"[red]{r.get('status')}[/red]"); continue
+                table.add_row(r["model"], f"{r['steps']:.1f}", f"{r['step_ms']:.0f}", f"{r['ttft_ms']:.0f}", f"{r['first_ttft_ms']:.0f}",
+                              f"{r['loop_ms'] / 1000:.1f}", f"{r['malformed_rate'] * 100:.0f}%", f"{r['completion_rate'] * 100:.0f}%")
+            self.console.print("\n")
+            self.console.print(table)
+
+        structured = self._structured_overhead(results)
+        if structured:
+            table = Table(title="Structured Output Overhead (vs. free text)", box=None)
+            table.add_column("Model", style="bold cyan")
+            table.add_column("Mode", style="yellow")
+            table.add_column("TPS", style="magenta", justify="right")
+            table.add_column("Δ TPS", justify="right")
+            table.add_column("TTFT (ms)", justify="right")
+            table.add_column("Δ TTFT", justify="right")
+            table.add_column("Valid JSON", justify="center")
+            for r in structured:
+                table.add_row(r["model"], r["variant"], f"{r['tps']:.1f}", _pct(r["tps_overhead"]), f"{r['ttft_ms']:.0f}", _pct(r["ttft_overhead"]),
+                              "✔" if r["quality_pass"] else "✘")
+            self.console.print("\n")
+            self.console.print(table)
+
+    @staticmethod
+    def _structured_overhead(results: List[Dict]) -> List[Dict]:
+        """Structured-output results with TPS/TTFT change relative to the free-text variant of the same model and options."""
+        ok = [r for r in results if r.get("test_type") == "structured" and r.get("status") == "Success"]
+        free = {(r["model"], json.dumps(r.get("options"), sort_keys=True)): r for r in ok if r.get("variant") == "free"}
+        rows = []
+        for r in ok:
+            base = free.get((r["model"], json.dumps(r.get("options"), sort_keys=True)))
+            rows.append({**r, "tps_overhead": (r["tps"] / base["tps"] - 1) * 100 if base and base["tps"] else None,
+                         "ttft_overhead": (r["ttft_ms"] / base["ttft_ms"] - 1) * 100 if base and base["ttft_ms"] else None})
+        return rows
 
     def save_reports(self, results: List[Dict], backend_name: str):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        base_name = f"benchmark_{backend_name.lower().replace(' ', '_')}_{timestamp}"
+        fingerprint = self.system_info.get("fingerprint", "unknown")
+        base_name = f"benchmark_{backend_name.lower().replace(' ', '_')}_{fingerprint[:8]}_{timestamp}"
+        # Tag every result with the hardware it ran on so merged reports never mix machines
+        for r in results: r.setdefault("host_fingerprint", fingerprint)
         
         # JSON Export
         json_path = os.path.join(self.output_dir, f"{base_name}.json")
         report_data = {
             "timestamp": datetime.now().isoformat(),
+            "fingerprint": fingerprint,
             "system": self.system_info,
             "backend": backend_name,
             "results": results
@@ -80,13 +179,367 @@ class Reporter:
             f.write(f"- **OS:** {self.system_info['os']}\n")
             f.write(f"- **CPU:** {self.system_info['cpu']}\n")
             f.write(f"- **RAM:** {self.system_info['ram_total_gb']} GB\n")
+            f.write(f"- **Hardware ID:** {fingerprint}\n")
             for i, gpu in enumerate(self.system_info.get('gpus', [])):
                 f.write(f"- **GPU {i+1}:** {gpu['name']} ({gpu['vram_total_gb']} GB)\n")
             
             f.write("\n## Results\n\n")
-            f.write("| Model | Test | TTFT (ms) | TPS | Tokens | Status |\n")
-            f.write("| :--- | :--- | ---: | ---: | ---: | :--- |\n")
+            f.write("| Model | Test | Load (ms) | TTFT (ms) | TPS | Tokens | Status |\n")
+            f.write("| :--- | :--- | ---: | ---: | ---: | ---: | :--- |\n")
             for r in results:
-                f.write(f"| {r['model']} | {r.get('test_name', 'Default')} | {r['ttft_ms']:.2f} | {r['tps']:.2f} | {r['total_tokens']} | {r['status']} |\n")
+                f.write(f"| {r['model']} | {r.get('test_name', 'Default')} | {r.get('load_ms', 0.0):.0f} | {r['ttft_ms']:.2f} | {r['tps']:.2f} | {r.get('total_tokens', 0)} | {r['status']} |\n")
+
+            embedding = [r for r in results if r.get("test_type") == "embedding" and r.get("status") == "Success"]
+            if embedding:
+                f.write("\n## Embedding Throughput\n\n")
+                f.write("| Model | Batch | Words/input | Embeddings/s | Tokens/s | p50 (ms) | p90 (ms) | p99 (ms) | Dims |\n")
+                f.write("| :--- | ---: | ---: | ---: | ---: | ---: | ---: | ---: | ---: |\n")
+                for r in embedding:
+                    tokens = f"{r['tps']:.0f}" + (" (est.)" if r.get("tokens_estimated") else "")
+                    f.write(f"| {r['model']} | {r['batch_size']} | {r['input_words']} | {r['embeddings_per_s']:.1f} | {tokens} | {r['latency_p50_ms']:.1f} | {r['latency_p90_ms']:.1f} | {r['latency_p99_ms']:.1f} | {r['dims']} |\n")
+
+            vision = [r for r in results if r.get("test_type") == "vision" and r.get("status") == "Success"]
+            if vision:
+                f.write("\n## Vision Prefill\n\n")
+                f.write("| Model | Images | Resolution | TTFT (ms) | Text TTFT (ms) | Encode / image (ms) | Tokens / image | Decode TPS | VRAM / image (MB) |\n")
+                f.write("| :--- | ---: | ---: | ---: | ---: | ---: | ---: | ---: | ---: |\n")
+                for r in vision:
+                    tokens = f"{r['tokens_per_image']:.0f}" if r["tokens_per_image"] is not None else "-"
+                    vram = f"{r['vram_per_image_gb'] * 1024:.0f}" if r["vram_per_image_gb"] is not None else "-"
+                    f.write(f"| {r['model']} | {r['images']} | {r['image_size']}px | {r['ttft_ms']:.0f} | {r['text_ttft_ms']:.0f} | {r['encode_ms_per_image']:.0f} | {tokens} | {r['tps']:.2f} | {vram} |\n")
+
+            agent = [r for r in results if r.get("test_type") == "agent" and r.get("status") == "Success"]
+            if agent:
+                f.write("\n## Agent Loop Latency\n\n")
+                f.write("| Model | Steps | Per step (ms) | Follow-up TTFT (ms) | First TTFT (ms) | Loop (s) | Malformed calls | Completed |\n")
+                f.write("| :--- | ---: | ---: | ---: | ---: | ---: | ---: | ---: |\n")
+                for r in agent:
+                    f.write(f"| {r['model']} | {r['steps']:.1f} | {r['step_ms']:.0f} | {r['ttft_ms']:.0f} | {r['first_ttft_ms']:.0f} | {r['loop_ms'] / 1000:.2f} | {r['malformed_rate'] * 100:.0f}% | {r['completion_rate'] * 100:.0f}% |\n")
+
+            structured = self._structured_overhead(results)
+            if structured:
+                f.write("\n## Structured Output Overhead\n\n")
+                f.write("| Model | Mode | TPS | Δ TPS | TTFT (ms) | Δ TTFT | Valid JSON |\n")
+                f.write("| :--- | :--- | ---: | ---: | ---: | ---: | :---: |\n")
+                for r in structured:
+                    f.write(f"| {r['model']} | {r['variant']} | {r['tps']:.2f} | {_pct(r['tps_overhead'])} | {r['ttft_ms']:.2f} | {_pct(r['ttft_overhead'])} | {'✔' if r['quality_pass'] else '✘'} |\n")
 
         self.console.print(f"\n[green]Reports saved to:[/green]\n - {json_path}\n - {md_path}")
+
+    def _write_report(self, kind: str, title: str, data: Dict, render_md: Callable[[TextIO], None],
+                      render_csv: Optional[Callable[[TextIO], None]] = None, id_label: str = "Hardware ID") -> List[str]:
+        """
+        Save `data` as <kind>_<fingerprint>_<timestamp>.json (with the timestamp and system profile added) and a Markdown
+        report: `title`, date and hardware ID, then whatever `render_md` writes; `render_csv` adds a CSV next to them.
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        fingerprint = self.system_info.get("fingerprint", "unknown")
+        base_path = os.path.join(self.output_dir, f"{kind}_{fingerprint[:8]}_{timestamp}")
+        os.makedirs(self.output_dir, exist_ok=True)
+        paths = [f"{base_path}.json", f"{base_path}.md"]
+        with open(paths[0], "w") as f:
+            json.dump({"timestamp": datetime.now().isoformat(), "fingerprint": fingerprint, "system": self.system_info, **data}, f, indent=2)
+        with open(paths[1], "w") as f:
+            f.write(f"# {title}\n\n")
+            f.write(f"**Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+            f.write(f"**{id_label}:** {fingerprint}\n\n")
+            render_md(f)
+        if render_csv:
+            paths.append(f"{base_path}.csv")
+            with open(paths[2], "w") as f: render_csv(f)
+        self.console.print("\n[green]Reports saved to:[/green]\n" + "\n".join(f" - {p}" for p in paths))
+        return paths
+
+    def display_fleet_results(self, hosts: List[Dict]):
+        table = Table(title="LMBench Fleet Results", box=None)
+        table.add_column("Host", style="bold cyan")
+        table.add_column("Hardware ID", style="dim")
+        table.add_column("GPU", style="white")
+        table.add_column("Model", style="bold cyan")
+        table.add_column("Test", style="yellow")
+        table.add_column("TTFT (ms)", justify="right")
+        table.add_column("TPS", style="magenta", justify="right")
+        for h in hosts:
+            if "error" in h:
+                table.add_row(h["agent"], "-", "-", "-", "-", "-", f"[red]{h['error']}[/red]")
+                continue
+            gpus = ", ".join(g["name"] for g in h["system"].get("gpus", [])) or "CPU only"
+            for r in h["results"]:
+                table.add_row(h["agent"], h["fingerprint"], gpus, r["model"], r.get("test_name", "Default"),
+                              f"{r['ttft_ms']:.0f}", f"{r['tps']:.1f}" if r.get("status") == "Success" else f"[red]{r.get('status')}[/red]")
+        self.console.print("\n")
+        self.console.print(table)
+
+    def save_fleet_report(self, hosts: List[Dict]):
+        def render(f: TextIO):
+            f.write("## Hosts\n\n")
+            f.write("| Agent | Hardware ID | CPU | GPU | Backend |\n")
+            f.write("| :--- | :--- | :--- | :--- | :--- |\n")
+            for h in hosts:
+                if "error" in h:
+                    f.write(f"| {h['agent']} | - | - | - | Error: {h['error']} |\n")
+                    continue
+                gpus = ", ".join(g["name"] for g in h["system"].get("gpus", [])) or "CPU only"
+                f.write(f"| {h['agent']} | {h['fingerprint']} | {h['system'].get('cpu')} | {gpus} | {h['backend']['name']} |\n")
+            f.write("\n## Results\n\n")
+            f.write("| Hardware ID | Model | Test | TTFT (ms) | TPS | Tokens | Status |\n")
+            f.write("| :--- | :--- | :--- | ---: | ---: | ---: | :--- |\n")
+            for h in hosts:
+                for r in h.get("results", []):
+                    f.write(f"| {h['fingerprint']} | {r['model']} | {r.get('test_name', 'Default')} | {r['ttft_ms']:.2f} | {r['tps']:.2f} | {r.get('total_tokens', 0)} | {r['status']} |\n")
+        # The header carries the coordinator's ID; each host's is in the tables
+        self._write_report("fleet", "LMBench Fleet Report", {"coordinator": self.system_info.get("fingerprint"), "hosts": hosts}, render, id_label="Coordinator")
+
+    def display_eval_results(self, summaries: List[Dict], min_accuracy: float):
+        from .evaluation import fastest_good_enough, pareto_front
+        front = pareto_front(summaries); pick = fastest_good_enough(summaries, min_accuracy)
+        table = Table(title="LMBench Speed vs Quality", box=None)
+        table.add_column("Model", style="bold cyan")
+        table.add_column("Options", style="dim")
+        table.add_column("Accuracy", style="bold green", justify="right")
+        table.add_column("TPS", style="magenta", justify="right")
+        table.add_column("TTFT (ms)", justify="right")
+        table.add_column("Items", justify="right")
+        table.add_column("Pareto", justify="center")
+        for s in sorted(summaries, key=lambda s: s["tps"], reverse=True):
+            model = f"{s['model']} [bold yellow]◀ pick[/bold yellow]" if s is pick else s["model"]
+            items = f"{s['correct']}/{s['scored']}" + (f" [dim]({s['cached']} cached)[/dim]" if s["cached"] else "") + (f" [red]{s['errors']} err[/red]" if s["errors"] else "")
+            table.add_row(model, json.dumps(s["options"]) if s["options"] else "default", f"{s['accuracy'] * 100:.1f}%",
+                          f"{s['tps']:.1f}", f"{s['ttft_ms']:.0f}", items, "★" if s in front else "")
+        self.console.print("\n")
+        self.console.print(table)
+        if pick: self.console.print(f"\n[bold green]Fastest model with ≥{min_accuracy * 100:.0f}% accuracy:[/bold green] {pick['model']} ({pick['tps']:.1f} TPS)")
+        else: self.console.print(f"\n[yellow]No model reached {min_accuracy * 100:.0f}% accuracy.[/yellow]")
+
+    def save_eval_report(self, summaries: List[Dict], backend_name: str, min_accuracy: float):
+        from .evaluation import fastest_good_enough, pareto_front
+        front = pareto_front(summaries); pick = fastest_good_enough(summaries, min_accuracy)
+        data = {
+            "backend": backend_name,
+            "min_accuracy": min_accuracy,
+            "pick": {"model": pick["model"], "options": pick["options"]} if pick else None,
+            "runs": [{**s, "pareto": s in front} for s in summaries]
+        }
+        def render(f: TextIO):
+            f.write("| Model | Options | Accuracy | TPS | TTFT (ms) | Correct | Pareto |\n")
+            f.write("| :--- | :--- | ---: | ---: | ---: | ---: | :---: |\n")
+            for s in sorted(summaries, key=lambda s: s["tps"], reverse=True):
+                f.write(f"| {s['model']} | {json.dumps(s['options']) if s['options'] else 'default'} | {s['accuracy'] * 100:.1f}% | {s['tps']:.2f} | {s['ttft_ms']:.0f} | {s['correct']}/{s['scored']} | {'★' if s in front else ''} |\n")
+            f.write(f"\n**Fastest with ≥{min_accuracy * 100:.0f}% accuracy:** {pick['model'] if pick else 'none'}\n")
+        # Flat speed/quality points for plotting
+        def render_csv(f: TextIO):
+            f.write("model,options,accuracy,tps,ttft_ms,aggregate_tps,items,pareto\n")
+            for s in summaries:
+                options = json.dumps(s["options"]).replace('"', '""') if s["options"] else "default"
+                f.write(f"{s['model']},\"{options}\",{s['accuracy']:.4f},{s['tps']:.2f},{s['ttft_ms']:.1f},{s['aggregate_tps']:.2f},{s['items']},{int(s in front)}\n")
+        self._write_report(f"eval_{backend_name.lower().replace(' ', '_')}", f"LMBench Evaluation - {backend_name}", data, render, render_csv)
+
+    def display_quant_results(self, base: str, rows: List[Dict], budget_gb: float):
+        from .quantization import QUICK_EVAL, frontier, recommend
+        front = frontier(rows); pick = recommend(rows, budget_gb, 1 / len(QUICK_EVAL))
+        table = Table(title=f"Quantization Ladder - {base}", box=None)
+        table.add_column("Tag", style="bold cyan")
+        table.add_column("Quant")
+        table.add_column("Bits", justify="right")
+        table.add_column("Memory (GB)", justify="right")
+        table.add_column("TPS", style="magenta", justify="right")
+        table.add_column("TTFT (ms)", justify="right")
+        table.add_column("Load (ms)", justify="right")
+        table.add_column("Accuracy", style="bold green", justify="right")
+        table.add_column("Pareto", justify="center")
+        for r in rows:
+            model = f"{r['model']} [bold yellow]◀ pick[/bold yellow]" if r is pick else r["model"]
+            if r["status"] != "Success":
+                table.add_row(model, r["quant"], "", "", "", "", "", f"[red]{r['status']}[/red]", ""); continue
+            mem = "?" if r["mem_gb"] is None else f"{r['mem_gb']:.1f}" if r["mem_measured"] else f"~{r['mem_gb']:.1f}"
+            if r["offloaded"]: mem += " [red](offload)[/red]"
+            table.add_row(model, r["quant"], f"{r['bits']:.1f}" if r["bits"] else "?", mem, f"{r['tps']:.1f}", f"{r['ttft_ms']:.0f}",
+                          f"{r['load_ms']:.0f}", f"{r['accuracy'] * 100:.0f}% ({r['correct']}/{r['scored']})", "★" if r in front else "")
+        self.console.print("\n")
+        self.console.print(table)
+        if any(r["mem_gb"] is not None and not r["mem_measured"] for r in rows):
+            self.console.print("[dim]~ memory estimated from the tag (parameters x bits per weight); the backend did not report it.[/dim]")
+        if pick: self.console.print(f"\n[bold green]Recommended for {budget_gb:.1f}GB:[/bold green] {pick['model']} ({pick['accuracy'] * 100:.0f}% accuracy, {pick['tps']:.1f} TPS)")
+        else: self.console.print(f"\n[yellow]No variant fits {budget_gb:.1f}GB without offloading.[/yellow]")
+
+    def save_quant_report(self, base: str, rows: List[Dict], budget_gb: float, backend_name: str):
+        from .quantization import QUICK_EVAL, frontier, recommend
+        front = frontier(rows); pick = recommend(rows, budget_gb, 1 / len(QUICK_EVAL))
+        data = {
+            "backend": backend_name,
+            "base": base,
+            "budget_gb": budget_gb,
+            "pick": pick["model"] if pick else None,
+            "variants": [{**r, "pareto": r in front} for r in rows]
+        }
+        def render(f: TextIO):
+            f.write(f"**Backend:** {backend_name} | **Memory budget:** {budget_gb:.1f}GB\n\n")
+            f.write("| Tag | Quant | Memory (GB) | TPS | TTFT (ms) | Load (ms) | Accuracy | Pareto |\n")
+            f.write("| :--- | :--- | ---: | ---: | ---: | ---: | ---: | :---: |\n")
+            for r in rows:
+                if r["status"] != "Success":
+                    f.write(f"| {r['model']} | {r['quant']} | | | | | {r['status']} | |\n"); continue
+                mem = "?" if r["mem_gb"] is None else f"{r['mem_gb']:.2f}" if r["mem_measured"] else f"~{r['mem_gb']:.2f}"
+                f.write(f"| {r['model']} | {r['quant']} | {mem}{' (offload)' if r['offloaded'] else ''} | {r['tps']:.2f} | {r['ttft_ms']:.0f} | {r['load_ms']:.0f} | {r['accuracy'] * 100:.0f}% | {'★' if r in front else ''} |\n")
+            f.write(f"\n**Recommended:** {pick['model'] if pick else 'none fits the budget'}\n")
+        self._write_report(f"quant_{re.sub(r'[^a-z0-9.]+', '_', base.lower())}", f"LMBench Quantization Ladder - {base}", data, render)
+
+    def display_cpu_scaling(self, result: Dict):
+        for placement in result["placements"]:
+            table = Table(title=f"CPU Scaling - {result['model']} ({placement['name']})", box=None)
+            table.add_column("Threads", justify="right")
+            table.add_column("TPS", style="magenta", justify="right")
+            table.add_column("TPS / thread", justify="right")
+            table.add_column("Efficiency", style="bold green", justify="right")
+            table.add_column("TTFT (ms)", justify="right")
+            for p in placement["points"]:
+                if p["status"] != "Success":
+                    table.add_row(str(p["threads"]), f"[red]{p['status']}[/red]", "", "", ""); continue
+                threads = f"{p['threads']} [bold yellow]◀ knee[/bold yellow]" if p["threads"] == placement["knee"] else str(p["threads"])
+                table.add_row(threads, f"{p['tps']:.1f}", f"{p.get('tps_per_thread', 0.0):.2f}", f"{p.get('efficiency', 0.0) * 100:.0f}%", f"{p['ttft_ms']:.0f}")
+            self.console.print("\n")
+            self.console.print(table)
+        best = result["best"]
+        if not best:
+            self.console.print("\n[yellow]No successful runs; nothing to recommend.[/yellow]"); return
+        if len(result["placements"]) > 1:
+            self.console.print("\n" + " | ".join(f"{p['name']}: peak {p['peak_tps']:.1f} TPS" for p in result["placements"]))
+        self.console.print(f"\n[bold green]Best setting:[/bold green] num_thread={best['num_thread']} ({best['placement']}), "
+                           f"{best['tps']:.1f} TPS of {best['peak_tps']:.1f} peak on {result['physical_cores']} physical cores")
+
+    def save_cpu_scaling_report(self, result: Dict):
+        def render(f: TextIO):
+            f.write(f"**Physical cores:** {result['physical_cores']} | **NUMA nodes:** {result['numa_nodes']}\n\n")
+            for placement in result["placements"]:
+                f.write(f"## {placement['name']}\n\n")
+                f.write("| Threads | TPS | TPS / thread | Efficiency | TTFT (ms) |\n")
+                f.write("| ---: | ---: | ---: | ---: | ---: |\n")
+                for p in placement["points"]:
+                    if p["status"] != "Success":
+                        f.write(f"| {p['threads']} | {p['status']} | | | |\n"); continue
+                    knee = " (knee)" if p["threads"] == placement["knee"] else ""
+                    f.write(f"| {p['threads']}{knee} | {p['tps']:.2f} | {p.get('tps_per_thread', 0.0):.2f} | {p.get('efficiency', 0.0) * 100:.0f}% | {p['ttft_ms']:.0f} |\n")
+                f.write("\n")
+            best = result["best"]
+            f.write(f"**Best setting:** num_thread={best['num_thread']} ({best['placement']})\n" if best else "**Best setting:** none\n")
+        self._write_report(f"cpu_scaling_{re.sub(r'[^a-z0-9.]+', '_', result['model'].lower())}", f"LMBench CPU Scaling - {result['model']}", result, render)
+
+    # Soak series in display order: (key, label, format)
+    _SOAK_SERIES = [("tps", "TPS", "{:.1f}"), ("ttft_ms", "TTFT (ms)", "{:.0f}"), ("rss_gb", "Backend RSS (GB)", "{:.2f}"),
+                    ("vram_gb", "VRAM (GB)", "{:.2f}"), ("temp_c", "GPU temp (°C)", "{:.0f}"), ("gpu_clock_mhz", "GPU clock (MHz)", "{:.0f}"),
+                    ("power_w", "Power (W)", "{:.0f}")]
+
+    def display_soak_results(self, result: Dict):
+        table = Table(title=f"Soak - {result['backend']} / {result['model']} ({result['duration_s'] / 3600:.2f}h, {result['requests']} requests)", box=None)
+        table.add_column("Metric", style="bold cyan")
+        table.add_column("Start", justify="right")
+        table.add_column("End", justify="right")
+        table.add_column("Change", style="magenta", justify="right")
+        table.add_column("Per hour", justify="right")
+        table.add_column("Trend p", justify="right")
+        for key, label, fmt in self._SOAK_SERIES:
+            t = result["trends"].get(key)
+            if not t: continue
+            p = f"[bold]{t['p']:.3f}[/bold]" if t["significant"] else f"[dim]{t['p']:.3f}[/dim]"
+            table.add_row(label, fmt.format(t["start"]), fmt.format(t["end"]), f"{t['change_pct']:+.1f}%", f"{t['slope_per_h']:+.3g}", p)
+        self.console.print("\n")
+        self.console.print(table)
+        if result["errors"]: self.console.print(f"[red]{result['errors']} failed requests[/red]")
+        if result["findings"]:
+            for finding in result["findings"]: self.console.print(f"[bold yellow]⚠ {finding}[/bold yellow]")
+        else:
+            self.console.print("[bold green]✔ No drift, throttling or memory growth detected.[/bold green]")
+
+    def save_soak_report(self, result: Dict):
+        def render(f: TextIO):
+            f.write(f"**Duration:** {result['duration_s'] / 3600:.2f}h | **Requests:** {result['requests']} | **Errors:** {result['errors']}\n\n")
+            f.write("| Metric | Start | End | Change | Per hour | Trend p |\n")
+            f.write("| :--- | ---: | ---: | ---: | ---: | ---: |\n")
+            for key, label, fmt in self._SOAK_SERIES:
+                t = result["trends"].get(key)
+                if t: f.write(f"| {label} | {fmt.format(t['start'])} | {fmt.format(t['end'])} | {t['change_pct']:+.1f}% | {t['slope_per_h']:+.3g} | {t['p']:.3f} |\n")
+            f.write("\n## Findings\n\n")
+            for finding in result["findings"] or ["No drift, throttling or memory growth detected."]: f.write(f"- {finding}\n")
+        # Long format (one row per bucket and metric) since each series has its own bucket width
+        def render_csv(f: TextIO):
+            f.write("metric,t_s,n,mean,min,max\n")
+            for key, points in result["series"].items():
+                for p in points: f.write(f"{key},{p['t']:.1f},{p['n']},{p['mean']:.4f},{p['min']:.4f},{p['max']:.4f}\n")
+        self._write_report(f"soak_{re.sub(r'[^a-z0-9.]+', '_', result['model'].lower())}", f"LMBench Soak - {result['backend']} / {result['model']}", result, render, render_csv)
+
+    @staticmethod
+    def _fits(value) -> str:
+        return "?" if value is None else "✔" if value else "✘"
+
+    def display_coresidency_results(self, result: Dict, vram_gb: float):
+        table = Table(title=f"Co-residency - {result['backend']}", box=None)
+        table.add_column("Models", style="bold cyan")
+        table.add_column("Size (GB)", justify="right")
+        table.add_column("Fits", justify="center")
+        table.add_column("Evictions", justify="right")
+        table.add_column("Reloads", justify="right")
+        table.add_column("Interleaved Δ TPS", style="magenta", justify="right")
+        table.add_column("Concurrent Δ TPS", justify="right")
+        table.add_column("Concurrency speed-up", style="bold green", justify="right")
+        for g in result["groups"]:
+            size = "?" if g["size_gb"] is None else f"{g['size_gb']:.1f}" + (" [red]> VRAM[/red]" if vram_gb and g["size_gb"] > vram_gb else "")
+            table.add_row(" + ".join(g["models"]), size, self._fits(g["fits"]), str(g["evictions"]), str(g["reloads"]),
+                          f"{-g['interleaved_drop_pct']:+.0f}%", f"{-g['concurrent_drop_pct']:+.0f}%", f"{g['concurrent_speedup']:.2f}x")
+        self.console.print("\n")
+        self.console.print(table)
+        fitting = [" + ".join(g["models"]) for g in result["groups"] if g["fits"]]
+        if fitting: self.console.print(f"\n[bold green]Fit together without swapping:[/bold green] {'; '.join(fitting)}")
+        elif any(g["fits"] is None for g in result["groups"]):
+            self.console.print("\n[yellow]The backend does not report loaded models; fit is judged by reloads only.[/yellow]")
+        else: self.console.print("\n[yellow]No combination stayed resident; raise OLLAMA_MAX_LOADED_MODELS or use smaller models.[/yellow]")
+
+    def save_coresidency_report(self, result: Dict, vram_gb: float):
+        def render(f: TextIO):
+            f.write("## Solo\n\n| Model | TPS | TTFT (ms) | Size (GB) |\n| :--- | ---: | ---: | ---: |\n")
+            for s in result["solo"]:
+                size = "?" if s["size_gb"] is None else f"{s['size_gb']:.2f}"
+                f.write(f"| {s['model']} | {s['tps']:.2f} | {s['ttft_ms']:.0f} | {size} |\n")
+            f.write("\n## Groups\n\n| Models | Size (GB) | Fits | Evictions | Reloads | Interleaved Δ TPS | Concurrent Δ TPS | Concurrency speed-up |\n")
+            f.write("| :--- | ---: | :---: | ---: | ---: | ---: | ---: | ---: |\n")
+            for g in result["groups"]:
+                size = "?" if g["size_gb"] is None else f"{g['size_gb']:.2f}"
+                f.write(f"| {' + '.join(g['models'])} | {size} | {self._fits(g['fits'])} | {g['evictions']} | {g['reloads']} | {-g['interleaved_drop_pct']:+.1f}% | {-g['concurrent_drop_pct']:+.1f}% | {g['concurrent_speedup']:.2f}x |\n")
+        self._write_report(f"coresidency_{result['backend'].lower().replace(' ', '_')}", f"LMBench Co-residency - {result['backend']}", {"vram_gb": vram_gb, **result}, render)
+
+    def display_conversation_results(self, runs: List[Dict]):
+        for run in runs:
+            table = Table(title=f"{run['backend']} / {run['model']}", box=None)
+            table.add_column("Turn", justify="right")
+            table.add_column("History (chars)", justify="right")
+            table.add_column("TTFT warm (ms)", style="magenta", justify="right")
+            table.add_column("TTFT cold (ms)", justify="right")
+            table.add_column("Saved", style="bold green", justify="right")
+            for t in run["turns"]:
+                table.add_row(str(t["turn"]), str(t["history_chars"]), f"{t['warm_ttft_ms']:.0f}", f"{t['cold_ttft_ms']:.0f}", f"{t['saved_pct']:.0f}%")
+            self.console.print("\n")
+            self.console.print(table)
+        summary = Table(title="Prefix Reuse", box=None)
+        summary.add_column("Backend", style="bold cyan")
+        summary.add_column("Model", style="bold cyan")
+        summary.add_column("Prefill avoided", style="bold green", justify="right")
+        summary.add_column("Warm ms/1k chars", style="magenta", justify="right")
+        summary.add_column("Cold ms/1k chars", justify="right")
+        for run in sorted(runs, key=lambda r: r["reuse_pct"], reverse=True):
+            summary.add_row(run["backend"], run["model"], f"{run['reuse_pct']:.0f}%", f"{run['warm_ms_per_kchar']:.1f}", f"{run['cold_ms_per_kchar']:.1f}")
+        self.console.print("\n")
+        self.console.print(summary)
+
+    def save_conversation_report(self, runs: List[Dict]):
+        def render(f: TextIO):
+            f.write("## Prefix Reuse\n\n")
+            f.write("| Backend | Model | Prefill avoided | Warm ms/1k chars | Cold ms/1k chars |\n")
+            f.write("| :--- | :--- | ---: | ---: | ---: |\n")
+            for run in runs:
+                f.write(f"| {run['backend']} | {run['model']} | {run['reuse_pct']:.0f}% | {run['warm_ms_per_kchar']:.1f} | {run['cold_ms_per_kchar']:.1f} |\n")
+            for run in runs:
+                f.write(f"\n## {run['backend']} / {run['model']}\n\n")
+                f.write("| Turn | History (chars) | TTFT warm (ms) | TTFT cold (ms) | Saved |\n")
+                f.write("| ---: | ---: | ---: | ---: | ---: |\n")
+                for t in run["turns"]:
+                    f.write(f"| {t['turn']} | {t['history_chars']} | {t['warm_ttft_ms']:.1f} | {t['cold_ttft_ms']:.1f} | {t['saved_pct']:.0f}% |\n")
+        self._write_report("conversation", "LMBench Conversation Report", {"runs": runs}, render)
@@ -0,0 +1,205 @@
+import asyncio
+import math
+import re
+import statistics
+import time
+from typing import Dict, List, Optional, Tuple
+import psutil
+from rich.console import Console
+from rich.live import Live
+from ..backends.base import BaseBackend
+from ..system import topology
+from .engine import BenchmarkSuite
+
+# Findings need a significant Mann-Kendall trend (two-sided p below this) and a Theil-Sen change above the limits below
+SIGNIFICANCE = 0.05
+TPS_DRIFT_PCT = -5.0
+TTFT_DRIFT_PCT = 10.0
+MEMORY_GROWTH_PCT = 5.0
+
+def _clock(seconds: float) -> str:
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+def parse_duration(text: str) -> float:
+    """'8h', '90m', '1h30m', '45s' or plain seconds -> seconds."""
+    if re.fullmatch(r"\d+(\.\d+)?", text.strip()): return float(text)
+    parts = re.findall(r"(\d+(?:\.\d+)?)\s*([hms])", text.lower())
+    if not parts or "".join(n + u for n, u in parts) != re.sub(r"\s", "", text.lower()):
+        raise ValueError(f"invalid duration '{text}' (use e.g. 8h, 90m, 1h30m)")
+    return sum(float(n) * {"h": 3600, "m": 60, "s": 1}[u] for n, u in parts)
+
+class Series:
+    """
+    Fixed-memory time series. Values fall into equal-width time buckets (count, sum, min, max); once there are more
+    than `max_points` buckets, neighbours merge pairwise and the width doubles, so an 8h run costs the same as 8m.
+    """
+    __slots__ = ("width", "max_points", "buckets")
+
+    def __init__(self, width_s: float = 5.0, max_points: int = 512):
+        self.width = width_s
+        self.max_points = max_points
+        self.buckets: List[List[float]] = []  # [index, n, sum, min, max]
+
+    def add(self, t: float, value: float):
+        i = int(t // self.width)
+        last = self.buckets[-1] if self.buckets else None
+        if last and last[0] == i:
+            last[1] += 1; last[2] += value; last[3] = min(last[3], value); last[4] = max(last[4], value)
+            return
+        self.buckets.append([i, 1, value, value, value])
+        if len(self.buckets) > self.max_points: self._halve()
+
+    def _halve(self):
+        self.width *= 2; merged: List[List[float]] = []
+        for i, n, total, lo, hi in self.buckets:
+            if merged and merged[-1][0] == i // 2:
+                m = merged[-1]; m[1] += n; m[2] += total; m[3] = min(m[3], lo); m[4] = max(m[4], hi)
+            else:
+                merged.append([i // 2, n, total, lo, hi])
+        self.buckets = merged
+
+    def points(self) -> List[Dict]:
+        return [{"t": i * self.width, "n": n, "mean": total / n, "min": lo, "max": hi} for i, n, total, lo, hi in self.buckets]
+
+def mann_kendall(values: List[float]) -> Tuple[float, float]:
+    """Mann-Kendall trend test: (z, two-sided p). Ties are not corrected for; bucket means rarely tie."""
+    n = len(values)
+    if n < 4: return 0.0, 1.0
+    s = sum((values[j] > values[i]) - (values[j] < values[i]) for i in range(n - 1) for j in range(i + 1, n))
+    sd = math.sqrt(n * (n - 1) * (2 * n + 5) / 18)
+    z = (s - 1) / sd if s > 0 else (s + 1) / sd if s < 0 else 0.0
+    return z, math.erfc(abs(z) / math.sqrt(2))
+
+def theil_sen(ts: List[float], values: List[float]) -> Tuple[float, float]:
+    """Median pairwise slope and the matching intercept; robust to the odd outlier bucket."""
+    slopes = [(values[j] - values[i]) / (ts[j] - ts[i]) for i in range(len(ts) - 1) for j in range(i + 1, len(ts)) if ts[j] != ts[i]]
+    if not slopes: return 0.0, statistics.median(values) if values else 0.0
+    slope = statistics.median(slopes)
+    return slope, statistics.median(v - slope * t for t, v in zip(ts, values))
+
+def trend(points: List[Dict]) -> Optional[Dict]:
+    """Trend of bucket means: slope per hour, significance and the fitted change over the run in percent."""
+    if len(points) < 4: return None
+    ts, ys = [p["t"] for p in points], [p["mean"] for p in points]
+    z, p = mann_kendall(ys); slope, intercept = theil_sen(ts, ys)
+    start = intercept + slope * ts[0]; end = intercept + slope * ts[-1]
+    return {"slope_per_h": slope * 3600, "z": z, "p": p, "start": start, "end": end,
+            "change_pct": (end - start) / abs(start) * 100 if start else 0.0, "significant": p < SIGNIFICANCE}
+
+class SoakTest:
+    """
+    Keeps one model under a steady sequential workload for `duration_s`. Per-request TPS and TTFT, and every
+    `interval_s` the GPU (temperature, clock, power, VRAM, throttle reasons) and the backend's resident memory,
+    go into fixed-memory series that are tested for trends at the end.
+    """
+    def __init__(self, backend: BaseBackend, duration_s: float, interval_s: float = 5.0, tokens: int = 256, max_points: int = 512):
+        self.backend = backend
+        self.duration_s = duration_s
+        self.interval_s = interval_s
+        self.options = {"num_predict": tokens}
+        self.max_points = max_points
+        self.process_names = topology.BACKEND_PROCESS_NAMES.get(backend.name) if backend.is_local else None
+        self.series: Dict[str, Series] = {}
+        self.console = Console()
+
+    def _record(self, name: str, t: float, value: Optional[float]):
+        if value is None: return
+        if name not in self.series: self.series[name] = Series(self.interval_s, self.max_points)
+        self.series[name].add(t, value)
+
+    def _backend_rss_gb(self) -> Optional[float]:
+        if not self.process_names: return None
+        total = 0
+        for p in topology.backend_processes(self.process_names):
+            try: total += p.memory_info().rss
+            except psutil.Error: continue
+        return total / (1024**3) if total else None
+
+    async def _sample(self, start: float, state: Dict):
+        from ..system.probe import Telemetry
+        telemetry = Telemetry(); telemetry.start()
+        while True:
+            telemetry.poll(); t = time.perf_counter() - start
+            rss = await asyncio.to_thread(self._backend_rss_gb)
+            self._record("rss_gb", t, rss)
+            if telemetry.total_vram_gb:
+                self._record("vram_gb", t, telemetry.current_vram_gb); self._record("temp_c", t, telemetry.temp)
+                self._record("gpu_clock_mhz", t, telemetry.gpu_clock); self._record("power_w", t, telemetry.power)
+                if telemetry.thermal_throttle and state["throttle_onset_s"] is None: state["throttle_onset_s"] = t
+            state.update(temp=telemetry.temp, rss_gb=rss)
+            await asyncio.sleep(self.interval_s)
+
+    def _status(self, state: Dict) -> str:
+        elapsed = time.perf_counter() - state["start"]
+        rss = f"{state['rss_gb']:.2f}GB" if state.get("rss_gb") else "n/a"
+        return (f"[bold white]Soak[/bold white] {self.backend.name} / {state['model']}  "
+                f"{_clock(elapsed)} / {_clock(self.duration_s)}  requests {state['requests']} ({state['errors']} err)  "
+                f"TPS {state['tps']:.1f}  TTFT {state['ttft_ms']:.0f}ms  GPU {state.get('temp', 0)}°C  backend RSS {rss}")
+
+    async def run(self, model: str) -> Dict:
+        prompt = BenchmarkSuite.get_burst_test()["prompt"]
+        await self.backend.unload_all(); await self.backend.load_model(model, self.options)
+        start = time.perf_counter()
+        state = {"model": model, "start": start, "requests": 0, "errors": 0, "tps": 0.0, "ttft_ms": 0.0, "throttle_onset_s": None}
+        self._state = state
+        sampler = asyncio.create_task(self._sample(start, state))
+        try:
+            with Live(self._status(state), refresh_per_second=2, console=self.console) as live:
+                while time.perf_counter() - start < self.duration_s:
+                    t0 = time.perf_counter(); first = None; tokens = 0
+                    try:
+                        async for event in self.backend.stream_events(model, prompt, self.options):
+                            if event.text:
+                                if first is None: first = time.perf_counter()
+                                tokens += 1
+                            if event.done: break
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as e:
+                        state["errors"] += 1; live.console.print(f"[red]{e}[/red]"); await asyncio.sleep(self.interval_s); continue
+                    end = time.perf_counter(); state["requests"] += 1
+                    if first and tokens > 1:
+                        state["tps"] = (tokens - 1) / (end - first); state["ttft_ms"] = (first - t0) * 1000
+                        self._record("tps", end - start, state["tps"]); self._record("ttft_ms", end - start, state["ttft_ms"])
+                    live.update(self._status(state))
+        except asyncio.CancelledError:
+            self.console.print("[yellow]Interrupted; analyzing what was collected.[/yellow]")
+        finally:
+            sampler.cancel()
+        return self.analyze(model, time.perf_counter() - start, state)
+
+    def partial_result(self) -> Optional[Dict]:
+        """
+        Analysis of whatever was collected, for when KeyboardInterrupt escapes asyncio.run (Python 3.10, where
+        Ctrl+C does not become a cancellation of the running task) and run() never returns.
+        """
+        state = getattr(self, "_state", None)
+        if state is None: return None
+        return self.analyze(state["model"], time.perf_counter() - state["start"], state)
+
+    def analyze(self, model: str, elapsed_s: float, state: Dict) -> Dict:
+        series = {name: s.points() for name, s in self.series.items()}
+        trends = {name: trend(points) for name, points in series.items()}
+        findings = []
+        tps, ttft = trends.get("tps"), trends.get("ttft_ms")
+        if tps and tps["significant"] and tps["change_pct"] <= TPS_DRIFT_PCT:
+            findings.append(f"Throughput drift: TPS fell {-tps['change_pct']:.1f}% over the run ({tps['slope_per_h']:+.2f} TPS/h)")
+        if ttft and ttft["significant"] and ttft["change_pct"] >= TTFT_DRIFT_PCT:
+            findings.append(f"Latency drift: TTFT rose {ttft['change_pct']:.1f}% over the run")
+        for name, label in (("rss_gb", "Backend RSS"), ("vram_gb", "VRAM")):
+            m = trends.get(name)
+            if m and m["significant"] and m["change_pct"] >= MEMORY_GROWTH_PCT:
+                findings.append(f"Memory growth: {label} +{(m['end'] - m['start']) * 1024:.0f}MB ({m['change_pct']:.1f}%, {m['slope_per_h'] * 1024:+.0f}MB/h), possible leak")
+        # Clock onset: first bucket whose mean clock is 10% under the best earlier bucket
+        clock_drop_s, peak = None, 0.0
+        for p in series.get("gpu_clock_mhz", []):
+            if peak and p["mean"] < 0.9 * peak: clock_drop_s = p["t"]; break
+            peak = max(peak, p["mean"])
+        if state["throttle_onset_s"] is not None:
+            findings.append(f"Thermal throttling from {state['throttle_onset_s'] / 60:.1f} min (NVML throttle reasons)")
+        elif clock_drop_s is not None:
+            findings.append(f"GPU clock dropped >10% from {clock_drop_s / 60:.1f} min")
+        return {"backend": self.backend.name, "model": model, "duration_s": elapsed_s, "planned_s": self.duration_s,
+                "requests": state["requests"], "errors": state["errors"], "throttle_onset_s": state["throttle_onset_s"],
+                "clock_drop_s": clock_drop_s, "trends": trends, "findings": findings, "series": series}
@@ -0,0 +1,100 @@
+import json
+import os
+import re
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+# Counter tracks drawn from telemetry samples: (track name, sample field, unit)
+COUNTER_TRACKS = (("GPU Util", "gpu_util", "%"), ("GPU Power", "power", "W"), ("VRAM", "vram_gb", "GB"),
+                  ("GPU Temp", "temp", "C"), ("Host CPU", "cpu_pct", "%"))
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "-", value).strip("-")[:60] or "x"
+
+class RoundTrace:
+    """Timestamps (time.perf_counter seconds) collected from engine events for one benchmark round."""
+    __slots__ = ("eject", "load", "start", "first_token", "end", "tokens", "samples", "backend_load_s")
+
+    def __init__(self, start: float):
+        self.eject: Optional[Tuple[float, float]] = None
+        self.load: Optional[Tuple[float, float]] = None
+        self.start, self.first_token, self.end = start, None, None
+        self.tokens: List[float] = []
+        self.samples: List[Dict] = []
+        self.backend_load_s = 0.0  # load time reported inside the stream (Ollama load_duration)
+
+def build_trace(trace: RoundTrace, model: str, backend: str, test: str, options: Optional[Dict], round_no: int) -> Dict:
+    """Chrome trace-event JSON (opens in Perfetto / chrome://tracing)."""
+    origin = trace.eject[0] if trace.eject else trace.load[0] if trace.load else trace.start
+    us = lambda t: round((t - origin) * 1e6, 1)
+    pid = 1
+    events = [
+        {"ph": "M", "pid": pid, "name": "process_name", "args": {"name": f"{model} · {test} · round {round_no}"}},
+        {"ph": "M", "pid": pid, "tid": 1, "name": "thread_name", "args": {"name": "Phases"}},
+        {"ph": "M", "pid": pid, "tid": 2, "name": "thread_name", "args": {"name": "Tokens"}},
+    ]
+    def span(name: str, begin: float, end: float, args: Optional[Dict] = None):
+        if end > begin: events.append({"ph": "X", "pid": pid, "tid": 1, "name": name, "ts": us(begin), "dur": round((end - begin) * 1e6, 1), "args": args or {}})
+
+    if trace.eject: span("Eject", *trace.eject)
+    if trace.load: span("Model Load", *trace.load)
+    prefill_start = trace.start
+    if trace.backend_load_s:
+        span("Model Load (backend)", trace.start, trace.start + trace.backend_load_s)
+        prefill_start = trace.start + trace.backend_load_s
+    end = trace.end or (trace.tokens[-1] if trace.tokens else trace.start)
+    if trace.first_token:
+        span("Prefill", prefill_start, trace.first_token, {"ttft_ms": round((trace.first_token - trace.start) * 1000, 2)})
+        span("Decode", trace.first_token, end, {"tokens": len(trace.tokens)})
+    for i, t in enumerate(trace.tokens):
+        events.append({"ph": "i", "pid": pid, "tid": 2, "s": "t", "name": "token", "ts": us(t), "args": {"n": i + 1}})
+    for sample in trace.samples:
+        for name, field, unit in COUNTER_TRACKS:
+            events.append({"ph": "C", "pid": pid, "name": name, "ts": us(sample["t"]), "args": {unit: sample[field]}})
+    return {
+        "traceEvents": events,
+        "displayTimeUnit": "ms",
+        "metadata": {"model": model, "backend": backend, "test": test, "options": options or {}, "round": round_no,
+                     "tokens": len(trace.tokens), "created": datetime.now().isoformat()},
+    }
+
+def write_round_trace(directory: str, trace: RoundTrace, model: str, backend: str, test: str, options: Optional[Dict], round_no: int) -> str:
+    os.makedirs(directory, exist_ok=True)
+    option = "default" if not options else _slug(json.dumps(options, sort_keys=True))
+    name = f"{_slug(model)}_{_slug(test)}_{option}_r{round_no}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    path = os.path.join(directory, name)
+    with open(path, "w") as f:
+        json.dump(build_trace(trace, model, backend, test, options, round_no), f, separators=(",", ":"))
+    return path
+
+class TraceSink:
+    """EventBus sink writing one Perfetto trace per round; eject/load phases attach to the round that follows."""
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.paths: List[str] = []
+        self._pending: Dict[str, Tuple[float, float]] = {}
+        self._rounds: Dict[int, Tuple[RoundTrace, object]] = {}
+
+    def handle(self, event):
+        kind = event.kind
+        if kind == "token":
+            entry = self._rounds.get(event.round_id)
+            if entry: entry[0].tokens.append(event.t)
+        elif kind == "phase":
+            self._pending[event.name] = (event.start, event.end)
+        elif kind == "round_start":
+            trace = RoundTrace(event.t)
+            trace.eject, trace.load = self._pending.pop("eject", None), self._pending.pop("load", None)
+            self._rounds[event.round_id] = (trace, event)
+        elif kind == "first_token":
+            entry = self._rounds.get(event.round_id)
+            if entry: entry[0].first_token = event.t
+        elif kind == "telemetry_sample":
+            entry = self._rounds.get(event.round_id)
+            if entry: entry[0].samples.append(event.sample)
+        elif kind == "round_end":
+            entry = self._rounds.pop(event.round_id, None)
+            if entry:
+                trace, start = entry
+                trace.end, trace.backend_load_s = event.t, event.backend_load_s
+                self.paths.append(write_round_trace(self.directory, trace, start.model, start.backend, start.test, start.options, start.round))
@@ -0,0 +1,30 @@
+import base64
+import random
+import struct
+import zlib
+from functools import lru_cache
+
+VISION_PROMPT = "Describe this image in detail: shapes, colours and any patterns you notice."
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+def make_test_image(size: int, seed: int = 0, block: int = 8) -> bytes:
+    """
+    A size x size RGB PNG of random colour blocks, built with the standard library only.
+    Different seeds give different pixels, so backends cannot reuse a cached image embedding.
+    """
+    rng = random.Random(seed)
+    cols = -(-size // block)
+    raw = bytearray()
+    for _ in range(-(-size // block)):
+        cells = rng.randbytes(cols * 3)
+        row = b"".join(cells[i:i + 3] * block for i in range(0, len(cells), 3))[:size * 3]
+        raw += (b"\x00" + row) * block  # filter type 0 per scanline
+    raw = bytes(raw[:(size * 3 + 1) * size])
+    header = struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + _chunk(b"IHDR", header) + _chunk(b"IDAT", zlib.compress(raw, 6)) + _chunk(b"IEND", b"")
+
+@lru_cache(maxsize=64)
+def test_image_b64(size: int, seed: int = 0) -> str:
+    return base64.b64encode(make_test_image(size, seed)).decode()
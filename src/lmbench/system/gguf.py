@@ -0,0 +1,184 @@
+import json
+import mmap
+import os
+import re
+import struct
+from math import prod
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from .storage import lmstudio_models_dirs, ollama_models_dir
+
+INDEX_PATH = Path.home() / ".lmbench" / "gguf_index.json"
+GGUF_MAGIC = b"GGUF"
+MAX_ARRAY_ITEMS = 1024  # longer arrays (tokenizer vocab, merges) are skipped, only their length is kept
+_SPLIT = re.compile(r"(?i)-(\d{5})-of-(\d{5})\.gguf$")  # llama.cpp split files: model-00001-of-00003.gguf
+
+_U32, _U64 = struct.Struct("<I"), struct.Struct("<Q")
+# GGUF value types: id -> struct format (8 string, 9 array are variable-length)
+_SCALARS = {0: "<B", 1: "<b", 2: "<H", 3: "<h", 4: "<I", 5: "<i", 6: "<f", 7: "<?", 10: "<Q", 11: "<q", 12: "<d"}
+_SCALAR_STRUCTS = {t: struct.Struct(f) for t, f in _SCALARS.items()}
+
+# llama.cpp `general.file_type` (the quantization a model was converted with)
+FILE_TYPES = {
+    0: "F32", 1: "F16", 2: "Q4_0", 3: "Q4_1", 7: "Q8_0", 8: "Q5_0", 9: "Q5_1", 10: "Q2_K", 11: "Q3_K_S", 12: "Q3_K_M",
+    13: "Q3_K_L", 14: "Q4_K_S", 15: "Q4_K_M", 16: "Q5_K_S", 17: "Q5_K_M", 18: "Q6_K", 19: "IQ2_XXS", 20: "IQ2_XS",
+    21: "Q2_K_S", 22: "IQ3_XS", 23: "IQ3_XXS", 24: "IQ1_S", 25: "IQ4_NL", 26: "IQ3_S", 27: "IQ3_M", 28: "IQ2_S",
+    29: "IQ2_M", 30: "IQ4_XS", 31: "IQ1_M", 32: "BF16",
+}
+
+def _string(buf, off: int) -> Tuple[str, int]:
+    n = _U64.unpack_from(buf, off)[0]; off += 8
+    return bytes(buf[off:off + n]).decode("utf-8", errors="replace"), off + n
+
+def _value(buf, off: int, kind: int):
+    """Decode one metadata value at `off`; returns (value, next offset)."""
+    if kind in _SCALAR_STRUCTS:
+        s = _SCALAR_STRUCTS[kind]
+        return s.unpack_from(buf, off)[0], off + s.size
+    if kind == 8: return _string(buf, off)
+    if kind != 9: raise ValueError(f"unknown GGUF value type {kind}")
+    item, count = _U32.unpack_from(buf, off)[0], _U64.unpack_from(buf, off + 4)[0]; off += 12
+    if count > MAX_ARRAY_ITEMS:
+        # Walk past without decoding: fixed-size items are one jump, strings need their lengths
+        if item in _SCALAR_STRUCTS: return {"count": count}, off + count * _SCALAR_STRUCTS[item].size
+        if item != 8: raise ValueError(f"cannot skip GGUF array of type {item}")
+        unpack = _U64.unpack_from
+        for _ in range(count): off += 8 + unpack(buf, off)[0]
+        return {"count": count}, off
+    values = []
+    for _ in range(count):
+        v, off = _value(buf, off, item); values.append(v)
+    return values, off
+
+def read_header(path: str) -> Dict:
+    """
+    Parse a GGUF file's metadata and tensor index. The file is memory-mapped and only the header pages are touched,
+    so this costs the same for a 1 GB and a 70 GB model. Tensor sizes come from the gaps between data offsets.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < 24: raise ValueError("not a GGUF file")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            if buf[:4] != GGUF_MAGIC: raise ValueError("not a GGUF file")
+            version = _U32.unpack_from(buf, 4)[0]
+            if version < 2: raise ValueError(f"GGUF v{version} is not supported")
+            n_tensors, n_kv = _U64.unpack_from(buf, 8)[0], _U64.unpack_from(buf, 16)[0]
+            off, metadata = 24, {}
+            for _ in range(n_kv):
+                key, off = _string(buf, off)
+                metadata[key], off = _value(buf, off + 4, _U32.unpack_from(buf, off)[0])
+            tensors = []
+            for _ in range(n_tensors):
+                name, off = _string(buf, off)
+                dims = _U32.unpack_from(buf, off)[0]; off += 4
+                shape = list(struct.unpack_from(f"<{dims}Q", buf, off)); off += 8 * dims
+                kind, offset = _U32.unpack_from(buf, off)[0], _U64.unpack_from(buf, off + 4)[0]; off += 12
+                tensors.append({"name": name, "shape": shape, "type": kind, "offset": offset})
+    alignment = metadata.get("general.alignment", 32)
+    data_offset = off + (-off % alignment)
+    ends = sorted(t["offset"] for t in tensors)[1:] + [size - data_offset]
+    for t, end in zip(sorted(tensors, key=lambda t: t["offset"]), ends): t["bytes"] = end - t["offset"]
+    return {"version": version, "metadata": metadata, "tensors": tensors, "data_offset": data_offset, "file_size": size}
+
+def model_facts(header: Dict) -> Dict:
+    """The same normalized facts as the backends' `show_model`, from a parsed header."""
+    md = header["metadata"]; arch = md.get("general.architecture")
+    key = lambda k: md.get(f"{arch}.{k}")
+    scalar = lambda v: max(v) if isinstance(v, list) and v else v  # some archs give per-layer head counts
+    capabilities = ["embedding"] if key("pooling_type") is not None else ["completion"]
+    if key("vision.block_count") is not None: capabilities.append("vision")
+    return {"architecture": arch, "family": arch, "parameters": sum(prod(t["shape"]) for t in header["tensors"]),
+            "quantization": FILE_TYPES.get(md.get("general.file_type")), "layers": key("block_count"),
+            "context_length": key("context_length"), "embedding_length": key("embedding_length"),
+            "head_count": scalar(key("attention.head_count")), "head_count_kv": scalar(key("attention.head_count_kv")),
+            "capabilities": capabilities, "size": sum(t["bytes"] for t in header["tensors"])}
+
+class HeaderIndex:
+    """
+    Parsed facts per file path, reused while the file's size and mtime are unchanged. Headers are cheap to read but
+    walking a 100k-entry tokenizer vocabulary is not, so a repeat listing only stats the files.
+    """
+    def __init__(self, path: Path = INDEX_PATH, rescan: bool = False):
+        self.path = path
+        self.rescan = rescan  # ignore the stored stamps, save only what is parsed now (dropping deleted files)
+        self.seen = set()
+        try:
+            with open(path) as f: self.entries: Dict[str, Dict] = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+        self.changed = False
+
+    def inspect(self, path: str) -> Optional[Dict]:
+        try: st = os.stat(path)
+        except OSError: return None
+        stamp = [st.st_size, st.st_mtime_ns]
+        cached = self.entries.get(path)
+        if cached and cached["stamp"] == stamp and not self.rescan: return dict(cached["facts"])
+        facts = _inspect(path)
+        if facts is not None: self.entries[path] = {"stamp": stamp, "facts": facts}; self.seen.add(path); self.changed = True
+        return dict(facts) if facts else None
+
+    def save(self):
+        if self.rescan:
+            self.entries = {p: e for p, e in self.entries.items() if p in self.seen}; self.changed = True
+        if not self.changed: return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w") as f: json.dump(self.entries, f)
+
+def _inspect(path: str) -> Optional[Dict]:
+    """Facts for one model file; a split model's first file stands for all of its parts."""
+    try:
+        facts = model_facts(read_header(path))
+        split = _SPLIT.search(path)
+        for i in range(2, int(split.group(2)) + 1) if split else ():
+            part = model_facts(read_header(f"{path[:split.start()]}-{i:05d}-of-{split.group(2)}.gguf"))
+            facts["parameters"] += part["parameters"]; facts["size"] += part["size"]
+        return facts
+    except (OSError, ValueError, struct.error):
+        return None
+
+def ollama_inventory(models_dir: Optional[str] = None, index: Optional[HeaderIndex] = None) -> List[Dict]:
+    """Ollama models from their manifests (manifests/<host>/<namespace>/<name>/<tag>), named as `ollama list` shows them."""
+    models_dir = models_dir or ollama_models_dir(); inspect = index.inspect if index else _inspect
+    root = os.path.join(models_dir, "manifests"); found = []
+    for dirpath, _, files in os.walk(root):
+        for tag in files:
+            parts = os.path.relpath(os.path.join(dirpath, tag), root).split(os.sep)
+            if len(parts) != 4: continue
+            host, namespace, name, _ = parts
+            prefix = "" if host == "registry.ollama.ai" and namespace == "library" else f"{namespace}/" if host == "registry.ollama.ai" else f"{host}/{namespace}/"
+            try:
+                with open(os.path.join(dirpath, tag)) as f: layers = json.load(f).get("layers", [])
+            except (OSError, ValueError):
+                continue
+            types = {l.get("mediaType"): l.get("digest", "") for l in layers}
+            digest = types.get("application/vnd.ollama.image.model")
+            if not digest: continue
+            path = os.path.join(models_dir, "blobs", digest.replace(":", "-")); facts = inspect(path)
+            if facts is None: continue
+            if "application/vnd.ollama.image.projector" in types and "vision" not in facts["capabilities"]: facts["capabilities"] = facts["capabilities"] + ["vision"]
+            found.append({"name": f"{prefix}{name}:{tag}", "backend": "Ollama", "digest": digest, "path": path, **facts})
+    return sorted(found, key=lambda m: m["name"])
+
+def lmstudio_inventory(dirs: Optional[List[str]] = None, index: Optional[HeaderIndex] = None) -> List[Dict]:
+    """LM Studio models (<publisher>/<repo>/<file>.gguf), named by that relative path; mmproj files mark their folder as vision."""
+    found = []; inspect = index.inspect if index else _inspect
+    for root in lmstudio_models_dirs() if dirs is None else dirs:
+        for dirpath, _, files in os.walk(root):
+            ggufs = [f for f in files if f.lower().endswith(".gguf")]
+            vision = any(f.lower().startswith("mmproj") for f in ggufs)
+            for name in ggufs:
+                split = _SPLIT.search(name)
+                if name.lower().startswith("mmproj") or (split and int(split.group(1)) != 1): continue
+                path = os.path.join(dirpath, name); facts = inspect(path)
+                if facts is None: continue
+                if vision and "vision" not in facts["capabilities"]: facts["capabilities"] = facts["capabilities"] + ["vision"]
+                found.append({"name": os.path.relpath(path, root).replace(os.sep, "/"), "backend": "LM Studio", "digest": None, "path": path, **facts})
+    return sorted(found, key=lambda m: m["name"])
+
+def local_inventory(rescan: bool = False) -> List[Dict]:
+    """Every GGUF model on this machine, read from disk without a running backend; `rescan` re-reads every header."""
+    index = HeaderIndex(rescan=rescan)
+    found = ollama_inventory(index=index) + lmstudio_inventory(index=index)
+    index.save()
+    return found
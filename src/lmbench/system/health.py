@@ -1,6 +1,6 @@
 import psutil
 import asyncio
-from typing import List, Dict
+from typing import List, Dict, Optional
 from rich.console import Console
 from rich.panel import Panel
 from .probe import get_system_info
@@ -10,20 +10,19 @@ class SystemDoctor:
     def __init__(self):
         self.console = Console()
 
-    def diagnose(self) -> List[Dict]:
+    def diagnose(self, backends: Optional[List] = None) -> List[Dict]:
         issues = []
         info = get_system_info()
         
-        # 1. Check for Loaded Models across backends
-        backends = run_discovery()
+        # 1. Check for Loaded Models across backends (reuse the caller's discovery pass if given)
+        if backends is None: backends = run_discovery()
+        online = [b for b, running in backends if running]
+        async def gather_loaded():
+            return await asyncio.gather(*[b.get_loaded_models() for b in online])
         loaded_models = []
-        for b, running in backends:
-            if running:
-                # We run the async check in a sync loop for simplicity here
-                loaded = asyncio.run(b.get_loaded_models())
-                if loaded:
-                    for m in loaded:
-                        loaded_models.append({"backend": b.name, "model": m.get("name") or m.get("id")})
+        for b, loaded in zip(online, asyncio.run(gather_loaded()) if online else []):
+            for m in loaded:
+                loaded_models.append({"backend": b.name, "model": m.get("name") or m.get("id")})
 
         # 2. Check RAM Pressure
         ram_usage_pct = psutil.virtual_memory().percent
@@ -1,8 +1,14 @@
 import platform
 import psutil
-import cpuinfo
 import subprocess
 import shutil
+import atexit
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
 from rich.console import Console
 from rich.table import Table
 
@@ -12,10 +18,90 @@ try:
 except ImportError:
     HAS_PYNVML = False
 
+# nvmlClocksThrottleReasonHwSlowdown | SwThermalSlowdown | HwThermalSlowdown
+_THERMAL_REASONS = 0x08 | 0x20 | 0x40
+HARDWARE_CACHE_PATH = Path.home() / ".lmbench" / "hardware.json"
+_nvml_state: Optional[bool] = None
+_static_info: Optional[Dict] = None
+
+def _nvml_ready() -> bool:
+    """Initialise NVML once per process instead of on every query."""
+    global _nvml_state
+    if _nvml_state is None:
+        _nvml_state = False
+        if HAS_PYNVML:
+            try:
+                pynvml.nvmlInit(); _nvml_state = True
+                atexit.register(pynvml.nvmlShutdown)
+            except Exception:
+                pass
+    return _nvml_state
+
+def _decode(value) -> str:
+    return value if isinstance(value, str) else value.decode("utf-8")
+
+def _cpu_model() -> str:
+    """Cheap CPU model lookup (no cpuinfo). Returns '' when the platform gives nothing useful."""
+    system = platform.system()
+    try:
+        if system == "Linux":
+            with open("/proc/cpuinfo") as f:
+                for line in f:
+                    key, _, value = line.partition(":")
+                    if key.strip() in ("model name", "Hardware", "Model"): return value.strip()
+        elif system == "Darwin":
+            return subprocess.run(["sysctl", "-n", "machdep.cpu.brand_string"], capture_output=True, text=True).stdout.strip()
+        elif system == "Windows":
+            import winreg
+            key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"HARDWARE\DESCRIPTION\System\CentralProcessor\0")
+            return winreg.QueryValueEx(key, "ProcessorNameString")[0].strip()
+    except Exception:
+        pass
+    return ""
+
+def _nvml_gpus() -> List[Dict]:
+    gpus = []
+    if not _nvml_ready(): return gpus
+    try:
+        for i in range(pynvml.nvmlDeviceGetCount()):
+            handle = pynvml.nvmlDeviceGetHandleByIndex(i)
+            mem = pynvml.nvmlDeviceGetMemoryInfo(handle)
+            gpus.append({
+                "name": _decode(pynvml.nvmlDeviceGetName(handle)),
+                "vram_total_gb": round(mem.total / (1024**3), 2),
+                "vram_used_gb": round(mem.used / (1024**3), 2),
+                "vram_free_gb": round(mem.free / (1024**3), 2),
+                "type": "NVIDIA"
+            })
+    except Exception:
+        pass
+    return gpus
+
+def get_hardware_fingerprint(gpus: Optional[List[Dict]] = None) -> Dict:
+    """Stable identity of this machine: CPU model, core counts, RAM, NVML GPU models and driver version."""
+    gpus = _nvml_gpus() if gpus is None else gpus
+    driver = ""
+    if gpus and _nvml_ready():
+        try: driver = _decode(pynvml.nvmlSystemGetDriverVersion())
+        except Exception: pass
+    facts = {
+        "cpu_model": _cpu_model() or platform.processor(),
+        "arch": platform.machine(),
+        "cores_physical": psutil.cpu_count(logical=False),
+        "cores_logical": psutil.cpu_count(logical=True),
+        "ram_total_gb": round(psutil.virtual_memory().total / (1024**3)),
+        "gpus": [f"{g['name']} {g['vram_total_gb']}GB" for g in gpus],
+        "gpu_driver": driver,
+    }
+    facts["id"] = hashlib.sha256(json.dumps(facts, sort_keys=True).encode()).hexdigest()[:16]
+    return facts
+
 class Telemetry:
     def __init__(self):
         self.peak_power = 0.0
         self.max_temp = 0
+        self.power = 0.0
+        self.temp = 0
         self.current_vram_gb = 0.0
         self.total_vram_gb = 0.0
         self.cpu_pct = 0.0
@@ -25,6 +111,7 @@ class Telemetry:
         self.gpu_clock = 0
         self.mem_clock = 0
         self.fan_speed = 0
+        self.thermal_throttle = False
         self.active = False
 
     def start(self):
@@ -35,21 +122,25 @@ class Telemetry:
     def stop(self):
         self.active = False
 
+    def snapshot(self) -> Dict:
+        """Current readings with a time.perf_counter timestamp."""
+        return {"t": time.perf_counter(), "gpu_util": self.gpu_util, "power": self.power, "vram_gb": round(self.current_vram_gb, 3),
+                "temp": self.temp, "gpu_clock": self.gpu_clock, "thermal_throttle": self.thermal_throttle, "cpu_pct": self.cpu_pct, "ram_pct": self.ram_pct}
+
     def poll(self):
         self.cpu_pct = psutil.cpu_percent()
         self.ram_pct = psutil.virtual_memory().percent
         
-        if not HAS_PYNVML:
+        if not _nvml_ready():
             return
         
         try:
-            pynvml.nvmlInit()
             handle = pynvml.nvmlDeviceGetHandleByIndex(0)
             
             # Power & Temp
-            power = pynvml.nvmlDeviceGetPowerUsage(handle) / 1000.0
+            power = self.power = pynvml.nvmlDeviceGetPowerUsage(handle) / 1000.0
             if power > self.peak_power: self.peak_power = power
-            temp = pynvml.nvmlDeviceGetTemperature(handle, pynvml.NVML_TEMPERATURE_GPU)
+            temp = self.temp = pynvml.nvmlDeviceGetTemperature(handle, pynvml.NVML_TEMPERATURE_GPU)
             if temp > self.max_temp: self.max_temp = temp
             
             # VRAM
@@ -70,42 +161,25 @@ class Telemetry:
             # Fan
             try: self.fan_speed = pynvml.nvmlDeviceGetFanSpeed(handle)
             except: self.fan_speed = 0
-                
-            pynvml.nvmlShutdown()
+
+            # Clocks held down by temperature (software or hardware slowdown)
+            try: self.thermal_throttle = bool(pynvml.nvmlDeviceGetCurrentClocksThrottleReasons(handle) & _THERMAL_REASONS)
+            except: self.thermal_throttle = False
         except Exception:
             pass
 
-def get_gpu_info():
+def get_gpu_info(cpu_brand: Optional[str] = None):
     """
     Detect GPU and VRAM information across platforms.
     """
-    gpus = []
-
     # 1. Try NVIDIA (Windows/Linux)
-    if HAS_PYNVML:
-        try:
-            pynvml.nvmlInit()
-            device_count = pynvml.nvmlDeviceGetCount()
-            for i in range(device_count):
-                handle = pynvml.nvmlDeviceGetHandleByIndex(i)
-                name = pynvml.nvmlDeviceGetName(handle)
-                mem = pynvml.nvmlDeviceGetMemoryInfo(handle)
-                gpus.append({
-                    "name": name if isinstance(name, str) else name.decode('utf-8'),
-                    "vram_total_gb": round(mem.total / (1024**3), 2),
-                    "vram_used_gb": round(mem.used / (1024**3), 2),
-                    "vram_free_gb": round(mem.free / (1024**3), 2),
-                    "type": "NVIDIA"
-                })
-            pynvml.nvmlShutdown()
-        except Exception:
-            pass
+    gpus = _nvml_gpus()
 
     # 2. Try Apple Silicon (macOS)
     if not gpus and platform.system() == "Darwin":
         try:
             # Check if it's Apple Silicon
-            cpu_brand = cpuinfo.get_cpu_info().get('brand_raw', '')
+            if cpu_brand is None: cpu_brand = _cpu_model()
             if "Apple" in cpu_brand:
                 # On Apple Silicon, VRAM is Unified Memory. 
                 # We can't easily get the "GPU portion" without powermetrics (sudo), 
@@ -137,16 +211,58 @@ def get_gpu_info():
 
     return gpus
 
-def get_system_info():
-    info = {
-        "os": f"{platform.system()} {platform.release()}",
+def _load_static_info(fingerprint: Dict) -> Optional[Dict]:
+    try:
+        return json.loads(HARDWARE_CACHE_PATH.read_text()).get(fingerprint["id"])
+    except Exception:
+        return None
+
+def _save_static_info(fingerprint: Dict, static: Dict):
+    try:
+        cache = json.loads(HARDWARE_CACHE_PATH.read_text()) if HARDWARE_CACHE_PATH.exists() else {}
+    except Exception:
+        cache = {}
+    cache[fingerprint["id"]] = static
+    try:
+        HARDWARE_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        HARDWARE_CACHE_PATH.write_text(json.dumps(cache, indent=2))
+    except OSError:
+        pass
+
+def _probe_static_info(fingerprint: Dict) -> Dict:
+    """The slow part: cpuinfo and platform GPU fallbacks. Only runs for unseen hardware."""
+    import cpuinfo
+    cpu = fingerprint["cpu_model"] or cpuinfo.get_cpu_info().get('brand_raw', 'Unknown CPU')
+    gpus = get_gpu_info(cpu_brand=cpu)
+    return {
         "arch": platform.machine(),
-        "python": platform.python_version(),
-        "cpu": cpuinfo.get_cpu_info().get('brand_raw', 'Unknown CPU'),
+        "cpu": cpu,
         "ram_total_gb": round(psutil.virtual_memory().total / (1024**3), 2),
-        "ram_available_gb": round(psutil.virtual_memory().available / (1024**3), 2),
-        "gpus": get_gpu_info()
+        "gpus": [{k: v for k, v in g.items() if k not in ("vram_used_gb", "vram_free_gb")} for g in gpus],
+        "fingerprint": fingerprint,
     }
+
+def get_system_info(refresh: bool = False):
+    """
+    System profile. Static facts are cached on disk keyed by the hardware fingerprint;
+    only free RAM/VRAM are sampled on every call.
+    """
+    global _static_info
+    nvml_gpus = _nvml_gpus()
+    if _static_info is None or refresh:
+        fingerprint = get_hardware_fingerprint(nvml_gpus)
+        static = None if refresh else _load_static_info(fingerprint)
+        if static is None:
+            static = _probe_static_info(fingerprint)
+            _save_static_info(fingerprint, static)
+        _static_info = static
+    live = iter(nvml_gpus)
+    info = {"os": f"{platform.system()} {platform.release()}", "python": platform.python_version()}
+    info.update({k: v for k, v in _static_info.items() if k not in ("gpus", "fingerprint")})
+    info["ram_available_gb"] = round(psutil.virtual_memory().available / (1024**3), 2)
+    info["gpus"] = [{**g, **next(live, {})} if g.get("type") == "NVIDIA" else dict(g) for g in _static_info["gpus"]]
+    info["fingerprint"] = _static_info["fingerprint"]["id"]
+    info["hardware"] = _static_info["fingerprint"]
     return info
 
 def print_system_info():
@@ -167,6 +283,7 @@ def print_system_info():
         table.add_row(f"GPU {i+1}", f"{gpu['name']} ({vram})")
         
     table.add_row("Python", info["python"])
+    table.add_row("Hardware ID", info["fingerprint"])
     
     console.print(table)
     return info
\ No newline at end of file
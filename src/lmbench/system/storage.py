@@ -56,3 +56,23 @@ class StorageManager:
         self.console.print(table)
         self.console.print(f"Recommended download location: [bold green]{best['mountpoint']}[/bold green]\n")
         return best
+
+    @staticmethod
+    def free_gb(path: str) -> float:
+        """Free space on the filesystem holding `path` (or its nearest existing parent)."""
+        while not os.path.exists(path) and os.path.dirname(path) != path:
+            path = os.path.dirname(path)
+        return psutil.disk_usage(path).free / (1024**3)
+
+def ollama_models_dir() -> str:
+    """Where a local Ollama keeps its blobs: $OLLAMA_MODELS, the user's ~/.ollama, or the Linux service account's."""
+    if os.environ.get("OLLAMA_MODELS"): return os.environ["OLLAMA_MODELS"]
+    home = os.path.join(os.path.expanduser("~"), ".ollama", "models")
+    service = "/usr/share/ollama/.ollama/models"
+    return service if platform.system() == "Linux" and not os.path.exists(home) and os.path.exists(service) else home
+
+def lmstudio_models_dirs() -> List[str]:
+    """LM Studio's model folders that exist: the current ~/.lmstudio/models and the older ~/.cache/lm-studio/models."""
+    home = os.path.expanduser("~")
+    dirs = [os.path.join(home, ".lmstudio", "models"), os.path.join(home, ".cache", "lm-studio", "models")]
+    return [d for d in dirs if os.path.isdir(d)]
@@ -0,0 +1,74 @@
+import glob
+import os
+import re
+import psutil
+from typing import Dict, List, Optional
+
+def _parse_cpulist(text: str) -> List[int]:
+    """'0-3,8-11' -> [0, 1, 2, 3, 8, 9, 10, 11]"""
+    cpus = []
+    for part in text.strip().split(","):
+        if not part: continue
+        lo, _, hi = part.partition("-")
+        cpus.extend(range(int(lo), int(hi or lo) + 1))
+    return cpus
+
+def numa_nodes() -> Dict[int, List[int]]:
+    """Logical CPUs per NUMA node from /sys (Linux); a single node holding every CPU elsewhere."""
+    nodes = {}
+    for path in glob.glob("/sys/devices/system/node/node[0-9]*/cpulist"):
+        try:
+            with open(path) as f: cpus = _parse_cpulist(f.read())
+        except (OSError, ValueError):
+            continue
+        if cpus: nodes[int(re.search(r"node(\d+)", path).group(1))] = cpus
+    return dict(sorted(nodes.items())) or {0: list(range(os.cpu_count() or 1))}
+
+def physical_cores() -> int:
+    return psutil.cpu_count(logical=False) or os.cpu_count() or 1
+
+def node_physical_cores(cpus: List[int]) -> int:
+    """Physical cores behind a set of logical CPUs, assuming SMT is uniform across the machine."""
+    smt = max(1, (psutil.cpu_count() or 1) // physical_cores())
+    return max(1, len(cpus) // smt)
+
+def can_pin() -> bool:
+    return hasattr(psutil.Process, "cpu_affinity")
+
+# Substrings of the process names each backend runs under (server and model runners)
+BACKEND_PROCESS_NAMES = {"Ollama": ("ollama",), "LM Studio": ("lm studio", "lm-studio", "lmstudio", "llmworker")}
+
+def backend_processes(names=("ollama",)) -> List[psutil.Process]:
+    """Local backend server processes and their model runners."""
+    procs = []
+    for p in psutil.process_iter(["name"]):
+        if any(n in (p.info["name"] or "").lower() for n in names): procs.append(p)
+    return procs
+
+class CpuPinning:
+    """
+    Restricts backend processes to a CPU set for the duration of a `with` block, restoring the old affinity after.
+    Runners started inside the block inherit the server's affinity. Memory placement follows first touch.
+    """
+    def __init__(self, processes: List[psutil.Process], cpus: Optional[List[int]]):
+        self.processes = processes
+        self.cpus = cpus
+        self._saved: Dict[int, List[int]] = {}
+
+    def __enter__(self):
+        if self.cpus is None: return self
+        for p in self.processes:
+            try:
+                self._saved[p.pid] = p.cpu_affinity(); p.cpu_affinity(self.cpus)
+            except (psutil.Error, OSError):
+                continue
+        return self
+
+    def __exit__(self, *exc):
+        for p in self.processes:
+            if p.pid not in self._saved: continue
+            try:
+                p.cpu_affinity(self._saved[p.pid])
+            except (psutil.Error, OSError):
+                continue
+        self._saved.clear()